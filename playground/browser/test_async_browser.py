@@ -0,0 +1,45 @@
+import os
+import sys
+import asyncio
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.autoagents_cua.browser import AsyncBrowser
+from src.autoagents_cua.utils import logger
+
+
+async def fetch(browser, url):
+    """在独立标签页中打开页面并提取元素，完成后关闭标签页"""
+    tab = await browser.new_tab()
+    try:
+        await tab.navigate(url, call_timeout=30)
+        elements = await tab.extract(highlight=False)
+        return url, len(elements or [])
+    except TimeoutError:
+        return url, None
+    finally:
+        await tab.close()
+
+
+async def main():
+    """
+    AsyncBrowser 使用示例
+
+    一个事件循环驱动同一个浏览器中的多个标签页：同一标签页上的调用串行，不同标签页并行
+    """
+    urls = [
+        'https://example.com',
+        'https://www.python.org',
+        'https://httpbin.org/html',
+        'https://www.wikipedia.org',
+    ]
+
+    async with AsyncBrowser(headless=True, max_workers=4) as browser:
+        for url, count in await asyncio.gather(*(fetch(browser, url) for url in urls)):
+            if count is None:
+                logger.warning(f"超时: {url}")
+            else:
+                logger.info(f"{url}: {count} 个可交互元素")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,44 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.autoagents_cua.browser import BrowserPool
+from src.autoagents_cua.utils import logger
+
+
+def visit(pool, url):
+    """借出一个浏览器访问页面，with 结束后自动归还并重置"""
+    with pool.lease(timeout=30) as operator:
+        operator.navigate(url)
+        return operator.page.title
+
+
+def main():
+    """
+    BrowserPool 使用示例
+
+    预先启动 2 个无头浏览器，4 个任务并发借用；归还时清除 Cookie 和站点存储，
+    第二轮任务直接使用已就绪的实例，不再等待浏览器冷启动
+    """
+    urls = [
+        'https://example.com',
+        'https://www.python.org',
+        'https://httpbin.org/html',
+        'https://www.wikipedia.org',
+    ]
+
+    with BrowserPool(size=2, headless=True, max_uses=20, max_memory_mb=1500) as pool:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for title in executor.map(lambda url: visit(pool, url), urls):
+                logger.info(f"页面标题: {title}")
+
+        metrics = pool.metrics()
+        logger.info(f"借出 {metrics['leases']} 次，命中就绪实例 {metrics['warm_hits']} 次，"
+                    f"冷启动 {metrics['cold_starts']} 次，等待 {metrics['waits']} 次")
+        logger.info(f"平均借出等待 {metrics['lease_wait_ms']['mean']} ms，"
+                    f"平均启动耗时 {metrics['launch_ms']['mean']} ms，平均重置耗时 {metrics['reset_ms']['mean']} ms")
+
+
+if __name__ == '__main__':
+    main()
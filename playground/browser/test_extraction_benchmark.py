@@ -0,0 +1,92 @@
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from time import perf_counter
+from DrissionPage import ChromiumPage, ChromiumOptions
+from src.autoagents_cua.browser import PageExtractor
+from src.autoagents_cua.utils import logger
+
+
+# 对比的提取引擎
+ENGINES = ['dom', 'snapshot', 'ax']
+
+# 每个引擎重复次数（取中位数）
+ROUNDS = 5
+
+# 真实页面（可按需增删）
+URLS = [
+    'https://en.wikipedia.org/wiki/Python_(programming_language)',
+    'https://github.com/trending',
+]
+
+
+def build_synthetic_page(page, rows=2000):
+    """
+    生成大型合成页面：每行包含链接、按钮、输入框、ARIA 控件和隐藏元素
+
+    Args:
+        page: ChromiumPage 对象
+        rows: 行数（每行 6 个节点，其中 4 个可交互）
+    """
+    page.get('about:blank')
+    page.run_js('''
+        const rows = arguments[0];
+        const html = [];
+        for (let i = 0; i < rows; i++) {
+            html.push(
+                `<div class="row"><a href="/item/${i}">Item ${i}</a>` +
+                `<button>Buy ${i}</button><input name="q${i}" placeholder="Search ${i}">` +
+                `<div role="button" aria-label="Like ${i}">♥</div>` +
+                `<span style="display:none"><button>Hidden ${i}</button></span></div>`
+            );
+        }
+        document.body.innerHTML = html.join('');
+    ''', rows)
+
+
+def bench(extractor, engine):
+    """
+    测量单个引擎的提取耗时
+
+    Returns:
+        (中位数耗时秒, 元素数量)
+    """
+    timings = []
+    count = 0
+    for _ in range(ROUNDS):
+        start = perf_counter()
+        elements = extractor.extract_elements(highlight=False, engine=engine)
+        timings.append(perf_counter() - start)
+        count = len(elements)
+    timings.sort()
+    return timings[len(timings) // 2], count
+
+
+def run(page, extractor, label):
+    logger.info(f"===== {label} =====")
+    for engine in ENGINES:
+        try:
+            elapsed, count = bench(extractor, engine)
+            logger.info(f"  {engine:<9} {elapsed * 1000:8.1f} ms  {count:6d} 个元素")
+        except Exception as e:
+            logger.error(f"  {engine:<9} 失败: {e}")
+
+
+if __name__ == "__main__":
+    options = ChromiumOptions()
+    options.auto_port()
+    page = ChromiumPage(addr_or_opts=options)
+    extractor = PageExtractor(page)
+
+    try:
+        for rows in (500, 2000):
+            build_synthetic_page(page, rows)
+            run(page, extractor, f"合成页面 {rows} 行 ({rows * 6} 个节点)")
+
+        for url in URLS:
+            page.get(url)
+            page.wait.doc_loaded()
+            run(page, extractor, url)
+    finally:
+        page.quit()
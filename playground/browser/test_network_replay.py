@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.autoagents_cua.browser import WebOperator, PageExtractor
+from src.autoagents_cua.utils import logger
+
+
+ARCHIVE = os.path.join(os.path.dirname(__file__), '../outputs/archives/python_org')
+URL = 'https://www.python.org'
+
+
+def load(mode):
+    """录制或回放一次页面加载，返回耗时和提取到的元素数"""
+    operator = WebOperator(headless=True, settle_learner=False)
+    try:
+        if mode == 'record':
+            operator.record_network(ARCHIVE)
+        else:
+            operator.replay_network(ARCHIVE)
+        start = time.perf_counter()
+        operator.navigate(URL)
+        elements = PageExtractor(operator.page).extract_elements(highlight=False)
+        return time.perf_counter() - start, len(elements or [])
+    finally:
+        operator.close()
+
+
+def main():
+    """
+    网络录制 / 回放示例
+
+    第一次运行录制 python.org 的全部响应，之后不访问网络、按存档回放同一个页面，
+    提取结果可重复，耗时不受网络波动影响
+    """
+    elapsed, count = load('record')
+    logger.info(f"录制: {elapsed:.2f}s，{count} 个元素")
+    for i in range(2):
+        elapsed, count = load('replay')
+        logger.info(f"回放 #{i + 1}: {elapsed:.2f}s，{count} 个元素")
+
+
+if __name__ == '__main__':
+    main()
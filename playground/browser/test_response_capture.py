@@ -0,0 +1,35 @@
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.autoagents_cua.browser import WebOperator
+from src.autoagents_cua.utils import logger
+
+
+def main():
+    """
+    ResponseCapture 使用示例
+
+    httpbin.org 首页通过 XHR 加载接口描述 spec.json，直接捕获这个 JSON 响应，
+    不需要等待页面渲染，也不需要从 DOM 中提取接口列表
+    """
+    operator = WebOperator(headless=True)
+    try:
+        with operator.capture_responses('*/spec.json') as capture:
+            operator.navigate('https://httpbin.org/', until='domcontentloaded')
+            response = capture.wait_for(timeout=15)
+
+        if response is None or response['data'] is None:
+            logger.warning("没有捕获到 spec.json")
+            return
+
+        paths = response['data'].get('paths', {})
+        logger.info(f"捕获 {response['url']}（{response['status']}，耗时 {response['elapsed']}s），共 {len(paths)} 个接口")
+        for path in list(paths)[:10]:
+            logger.info(f"  {path}")
+    finally:
+        operator.close()
+
+
+if __name__ == '__main__':
+    main()
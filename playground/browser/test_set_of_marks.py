@@ -0,0 +1,37 @@
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from time import perf_counter
+from DrissionPage import ChromiumPage, ChromiumOptions
+from src.autoagents_cua.browser import PageExtractor, SetOfMarks
+from src.autoagents_cua.utils import logger
+
+
+if __name__ == "__main__":
+    options = ChromiumOptions()
+    options.auto_port()
+    page = ChromiumPage(addr_or_opts=options)
+
+    page.get('https://en.wikipedia.org/')
+    page.wait.doc_loaded()
+
+    extractor = PageExtractor(page)
+    extractor.extract_elements(highlight=False)
+
+    # 对比不同输出格式的体积和耗时（全部在内存中完成）
+    for image_format in ('jpeg', 'webp', 'png'):
+        marker = SetOfMarks(image_format=image_format)
+        start = perf_counter()
+        image = extractor.marked_screenshot(marker)
+        elapsed = perf_counter() - start
+        if image:
+            logger.info(f"{image_format:<5} {len(image) / 1024:8.1f} KB  {elapsed * 1000:6.0f} ms")
+
+    # 仅用于查看效果：写出一张标注截图
+    output_dir = os.path.join(os.path.dirname(__file__), '..', 'outputs', 'imgs')
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, 'set_of_marks.jpg'), 'wb') as f:
+        f.write(extractor.marked_screenshot())
+
+    page.quit()
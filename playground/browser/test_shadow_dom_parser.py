@@ -34,19 +34,31 @@ def main():
     try:
         agent.load_page()
         
-        # 如果需要处理 Shadow DOM，可以使用 agent.shadow_parser
-        # 例如：
-        agent.shadow_parser.input_text(
-            host_selector='css:faceplate-text-input#login-username',
-            element_selector='css:input[name="username"]',
-            text="agentspro0bot"
-        )
+        # PageExtractor 一次遍历即可进入开放的 Shadow DOM，元素自带 host 路径，
+        # 直接把 element 句柄交给 web_operator 操作即可
+        agent.page_extractor.extract_elements(highlight=False)
+        inputs = {
+            info['attrs'].get('name'): info
+            for info in agent.page_extractor.get_elements_by_tag('input')
+        }
         
-        agent.shadow_parser.input_text(
-            host_selector='css:faceplate-text-input#login-password',
-            element_selector='css:input[name="password"]',
-            text="ubi2future"
-        )
+        if 'username' in inputs and 'password' in inputs:
+            logger.info(f"用户名输入框 host 路径: {inputs['username']['host_path']}")
+            agent.web_operator.input_text(inputs['username']['element'], "agentspro0bot")
+            agent.web_operator.input_text(inputs['password']['element'], "ubi2future")
+        else:
+            # 也可以使用 agent.shadow_parser 逐层定位 Shadow DOM 元素
+            agent.shadow_parser.input_text(
+                host_selector='css:faceplate-text-input#login-username',
+                element_selector='css:input[name="username"]',
+                text="agentspro0bot"
+            )
+            
+            agent.shadow_parser.input_text(
+                host_selector='css:faceplate-text-input#login-password',
+                element_selector='css:input[name="password"]',
+                text="ubi2future"
+            )
         
         # 使用 web_operator 点击登录按钮（XPath 定位）
         agent.web_operator.click_element(
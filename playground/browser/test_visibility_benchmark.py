@@ -0,0 +1,102 @@
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from DrissionPage import ChromiumPage, ChromiumOptions
+from src.autoagents_cua.browser import PageExtractor
+from src.autoagents_cua.utils import logger
+
+
+# 合成页面节点数
+NODE_COUNTS = [2000, 10000]
+
+# 每种方式重复次数（取中位数）
+ROUNDS = 7
+
+# 旧版提取逻辑：逐个元素交替调用 getComputedStyle / getBoundingClientRect 并立即写入标记，
+# 每次写入都会使下一次读取重新计算样式和布局
+LEGACY_EXTRACT_JS = '''
+    const start = performance.now();
+    const selectors = 'a[href],button,input:not([type="hidden"]),select,textarea,[role="button"],[onclick],[tabindex]';
+    const result = [];
+    let index = 1;
+    document.querySelectorAll(selectors).forEach(el => {
+        const style = window.getComputedStyle(el);
+        const rect = el.getBoundingClientRect();
+        if (style.display !== 'none' && style.visibility !== 'hidden' && rect.width > 0 && rect.height > 0) {
+            el.setAttribute('data-legacy-index', index);
+            result.push({index: index++, tag: el.tagName.toLowerCase(), rect: [rect.left, rect.top, rect.width, rect.height]});
+        }
+    });
+    document.querySelectorAll('[data-legacy-index]').forEach(el => el.removeAttribute('data-legacy-index'));
+    return [performance.now() - start, result.length];
+'''
+
+# 运行时提取（页面内计时，排除 CDP 往返）
+RUNTIME_EXTRACT_JS = '''
+    const start = performance.now();
+    const result = window.__cua.extract(arguments[0]);
+    return [performance.now() - start, result.added.length];
+'''
+
+
+def build_synthetic_page(page, nodes):
+    """
+    生成合成页面：约 1/3 为可交互元素，其中部分被隐藏，页面高度远超视口
+
+    Args:
+        page: ChromiumPage 对象
+        nodes: 目标节点数
+    """
+    page.get('about:blank')
+    page.run_js('''
+        const rows = Math.floor(arguments[0] / 6);
+        const html = [];
+        for (let i = 0; i < rows; i++) {
+            const hidden = i % 5 === 0 ? ' style="visibility:hidden"' : '';
+            html.push(
+                `<div class="row" style="padding:4px"><span>#${i}</span>` +
+                `<a href="/item/${i}">Item ${i}</a><button${hidden}>Buy</button>` +
+                `<input name="q${i}"><div style="display:${i % 7 ? 'inline' : 'none'}">` +
+                `<button>More</button></div></div>`
+            );
+        }
+        document.body.innerHTML = html.join('');
+    ''', nodes)
+
+
+def median(page, script, *args):
+    timings = []
+    count = 0
+    for _ in range(ROUNDS):
+        elapsed, count = page.run_js(script, *args)
+        timings.append(elapsed)
+    timings.sort()
+    return timings[len(timings) // 2], count
+
+
+if __name__ == "__main__":
+    options = ChromiumOptions()
+    options.auto_port()
+    page = ChromiumPage(addr_or_opts=options)
+    extractor = PageExtractor(page)
+
+    try:
+        for nodes in NODE_COUNTS:
+            build_synthetic_page(page, nodes)
+            # 确保运行时已注入当前文档
+            extractor.extract_elements(highlight=False)
+
+            logger.info(f"===== 合成页面 {nodes} 个节点 =====")
+            cases = [
+                ('旧版逐个读写', LEGACY_EXTRACT_JS, ()),
+                ('批量读取', RUNTIME_EXTRACT_JS, ({},)),
+                ('批量读取+仅视口', RUNTIME_EXTRACT_JS, ({'viewportOnly': True},)),
+            ]
+            baseline = None
+            for label, script, args in cases:
+                elapsed, count = median(page, script, *args)
+                baseline = baseline or elapsed
+                logger.info(f"  {label:<12} {elapsed:8.1f} ms  {count:6d} 个元素  ({baseline / max(elapsed, 0.01):.1f}x)")
+    finally:
+        page.quit()
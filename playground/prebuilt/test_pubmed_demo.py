@@ -19,7 +19,8 @@ class PubMedCrawler:
         Args:
             headless: 是否使用无头模式
         """
-        self.operator = WebOperator(headless=headless)
+        # 爬虫只需要文本：不加载图片、字体、视频和第三方追踪器；文章在多个后台标签页中并发爬取
+        self.operator = WebOperator(headless=headless, resource_policy=['no-media', 'no-trackers'], multi_tab=True)
         self.extractor = PageExtractor(self.operator.page)
         self.results = []
     
@@ -177,12 +178,13 @@ class PubMedCrawler:
             traceback.print_exc()
             return False
     
-    def extract_article_info(self, article_index):
+    def extract_article_info(self, article_index, operator=None):
         """
         提取文章信息（标题、作者、摘要）
         
         Args:
             article_index: 文章序号（用于日志）
+            operator: 文章所在标签页的 WebOperator，默认为主标签页
             
         Returns:
             dict: 文章信息字典
@@ -192,7 +194,11 @@ class PubMedCrawler:
             logger.info(f"提取文章 #{article_index} 的信息")
             logger.info("=" * 60)
             
-            sleep(2)  # 等待页面完全加载
+            operator = operator or self.operator
+            extractor = self.extractor if operator is self.operator else PageExtractor(operator.page)
+            
+            if operator is self.operator:
+                sleep(2)  # 点击进入的文章页，等待页面完全加载
             
             article_info = {
                 'index': article_index,
@@ -212,7 +218,7 @@ class PubMedCrawler:
             ]
             
             for selector in title_selectors:
-                title = self.operator.get_element_text(selector)
+                title = operator.get_element_text(selector)
                 if title and len(title) > 10:  # 标题通常较长
                     article_info['title'] = title.strip()
                     logger.success(f"✅ 标题: {article_info['title'][:100]}...")
@@ -232,7 +238,7 @@ class PubMedCrawler:
             ]
             
             for selector in author_selectors:
-                authors = self.operator.get_element_text(selector)
+                authors = operator.get_element_text(selector)
                 if authors and len(authors) > 3:
                     article_info['authors'] = authors.strip()
                     logger.success(f"✅ 作者: {article_info['authors'][:150]}...")
@@ -252,7 +258,7 @@ class PubMedCrawler:
             ]
             
             for selector in abstract_selectors:
-                abstract = self.operator.get_element_text(selector)
+                abstract = operator.get_element_text(selector)
                 if abstract and len(abstract) > 50:  # 摘要通常较长
                     article_info['abstract'] = abstract.strip()
                     logger.success(f"✅ 摘要: {article_info['abstract'][:200]}...")
@@ -262,7 +268,7 @@ class PubMedCrawler:
                 logger.warning("⚠️  未找到摘要")
             
             # 保存文章页面元素
-            self.extractor.extract_elements(
+            extractor.extract_elements(
                 highlight=True, 
                 save_to_file=f"pubmed_article_{article_index}.txt"
             )
@@ -487,6 +493,40 @@ class PubMedCrawler:
         except Exception as e:
             logger.error(f"保存结果失败: {e}")
     
+    def crawl_search_results_parallel(self, max_results=2, max_tabs=4):
+        """
+        并发爬取搜索结果：收集文章链接后，在同一个浏览器的多个标签页中同时打开详情页
+        
+        Args:
+            max_results: 最多爬取几篇文章
+            max_tabs: 最多同时打开的标签页数
+            
+        Returns:
+            list: 文章信息列表
+        """
+        links = []
+        for link in self.operator.page.eles('css:a[href*="/articles/PMC"]', timeout=5):
+            url = (link.link or '').split('#')[0]
+            if url and url not in links:
+                links.append(url)
+            if len(links) >= max_results:
+                break
+        if not links:
+            logger.warning("⚠️  未找到文章链接，改用逐个点击的方式")
+            return self.crawl_search_results(max_results)
+        
+        logger.info(f"\n在 {min(max_tabs, len(links))} 个标签页中并发爬取 {len(links)} 篇文章...")
+        
+        def fetch(operator, task):
+            index, url = task
+            if not operator.navigate(url):
+                return None
+            return self.extract_article_info(index, operator)
+        
+        results = self.operator.run_in_tabs(fetch, list(enumerate(links, 1)), max_tabs=max_tabs)
+        self.results.extend(info for info in results if isinstance(info, dict))
+        return self.results
+    
     def close(self):
         """关闭浏览器"""
         self.operator.close()
@@ -510,8 +550,8 @@ def main():
             logger.error("❌ 搜索失败，任务终止")
             return
         
-        # 2. 爬取前两个搜索结果
-        results = crawler.crawl_search_results(max_results=2)
+        # 2. 在多个标签页中并发爬取前两个搜索结果
+        results = crawler.crawl_search_results_parallel(max_results=2)
         
         # 3. 显示结果
         logger.info("\n" + "=" * 80)
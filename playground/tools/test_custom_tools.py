@@ -49,7 +49,7 @@ def example1_basic_tools_only():
     agent = BrowserAgent(browser=browser, llm=llm, tools=BASIC_WEB_TOOLS)
     
     logger.info(f"✅ Agent 创建成功，工具数量: {len(BASIC_WEB_TOOLS)}")
-    logger.info(f"可用工具: open_website, extract_page_elements, click_element, input_text_to_element, get_current_url")
+    logger.info(f"可用工具: open_website, extract_page_elements, more_page_elements, click_element, input_text_to_element, fill_form, get_current_url")
     
     return agent
 
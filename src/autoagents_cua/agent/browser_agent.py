@@ -64,6 +64,7 @@ class BrowserAgent:
         browser: Browser,
         llm: ChatClient,
         tools: Optional[List[Callable]] = None,
+        attach_screenshot: bool = False,
     ):
         """
         初始化 Browser Agent
@@ -72,6 +73,8 @@ class BrowserAgent:
             browser: Browser 实例（必需）
             llm: ChatClient 实例（必需）
             tools: 工具函数列表，默认使用 ALL_WEB_TOOLS
+            attach_screenshot: 是否在每条指令中附带当前视口的标注截图
+                （附带前重新提取页面元素，在内存中绘制编号框，需要支持图片输入的模型）
         
         示例:
             # 方式1：使用所有工具
@@ -122,9 +125,27 @@ class BrowserAgent:
         
         # 初始化截图追踪
         self.recent_screenshot = None
+        self.attach_screenshot = attach_screenshot
+        
+        # 当前指令（extract_page_elements 用于元素相关度排序）
+        self.current_instruction = None
         
         logger.success(f"✅ Browser Agent 初始化完成 - 工具数量: {len(self.bound_tools)}")
     
+    def _marked_screenshot(self):
+        """
+        重新提取当前页面后截取标注截图
+        
+        上一次提取之后页面可能已经跳转、滚动或变化，直接使用旧的元素位置会把编号画错位置，
+        因此先全量提取一次（同时重置增量状态，之后的 extract_page_elements 返回与截图一致的完整列表）
+        
+        Returns:
+            图片字节，没有可交互元素或截图失败时返回 None
+        """
+        if not self.extractor.extract_elements(highlight=False, incremental=False):
+            return None
+        return self.extractor.marked_screenshot()
+    
     def invoke(self, instruction: str, thread_id: str = "default", return_tokens=False):
         """
         执行自然语言指令
@@ -157,6 +178,7 @@ class BrowserAgent:
         
         # 存储time_tracker引用供工具函数使用
         self.current_time_tracker = time_tracker
+        self.current_instruction = instruction
         
         try:
             # 配置LangGraph
@@ -164,14 +186,26 @@ class BrowserAgent:
                 "configurable": {"thread_id": thread_id}
             }
             
-            # 记录LLM调用时间
-            time_tracker.start("llm_invoke")
-            
             # 构建用户消息，包含截图信息
             user_message_content = instruction + screenshot_info
             if screenshot_info:
                 logger.info(f"📷 当前对话包含截图: {self.recent_screenshot}")
             
+            # 附带标注截图（编号与 extract_page_elements 的索引一致）
+            if self.attach_screenshot:
+                time_tracker.start("page_extraction")
+                image = self._marked_screenshot()
+                time_tracker.end("page_extraction")
+                if image:
+                    user_message_content = [
+                        {"type": "text", "text": user_message_content},
+                        self.extractor.set_of_marks.to_message_content(image),
+                    ]
+                    logger.info(f"📷 已附带标注截图 ({len(image) / 1024:.1f} KB)")
+            
+            # 记录LLM调用时间
+            time_tracker.start("llm_invoke")
+            
             try:
                 result = self.agent.invoke(
                     {"messages": [{"role": "user", "content": user_message_content}]},
@@ -1,17 +1,61 @@
 from .browser_core import Browser
+from .async_browser import AsyncBrowser, AsyncWebOperator
 from .browser_fingerprint import BrowserFingerprint, FingerprintManager, FingerprintPool
 from .web_operator import WebOperator
+from .browser_pool import BrowserPool, BrowserLease
+from .profile_template import ProfileTemplate, ClonedProfile
+from .cdp_session import CDPSession
+from .cdp_profiler import CDPProfiler
+from .page_readiness import PageReadiness
+from .settle_learner import SettleLearner
+from .storage_state import StorageStateStore
+from .resource_policy import ResourcePolicy
+from .request_interceptor import RequestInterceptor
+from .screenshot import ScreenshotCapture
+from .response_capture import ResponseCapture
+from .network_archive import NetworkArchive, NetworkRecorder
 from .page_extractor import PageExtractor
+from .element_handle import ElementHandle
+from .element_table import ElementRecord, ElementTable
+from .element_serializer import ElementSerializer
+from .set_of_marks import SetOfMarks
+from .extraction_engines import ExtractionEngine, DOMEngine, DOMSnapshotEngine, AXTreeEngine
 from .shadow_dom_parser import ShadowDOMParser
 from .captcha_solver import CaptchaAgent, GoogleRecaptchaSolver
 
 __all__ = [
     'Browser',
+    'AsyncBrowser',
+    'AsyncWebOperator',
     'BrowserFingerprint',
     'FingerprintManager',
     'FingerprintPool',
     'WebOperator',
+    'BrowserPool',
+    'BrowserLease',
+    'ProfileTemplate',
+    'ClonedProfile',
+    'CDPSession',
+    'CDPProfiler',
+    'PageReadiness',
+    'SettleLearner',
+    'StorageStateStore',
+    'ResourcePolicy',
+    'RequestInterceptor',
+    'ScreenshotCapture',
+    'ResponseCapture',
+    'NetworkArchive',
+    'NetworkRecorder',
     'PageExtractor',
+    'ElementHandle',
+    'ElementRecord',
+    'ElementTable',
+    'ElementSerializer',
+    'SetOfMarks',
+    'ExtractionEngine',
+    'DOMEngine',
+    'DOMSnapshotEngine',
+    'AXTreeEngine',
     'ShadowDOMParser',
     'CaptchaAgent',
     'GoogleRecaptchaSolver',
@@ -0,0 +1,331 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from ..utils.logging import logger
+from .browser_core import Browser
+from .page_extractor import PageExtractor
+
+
+
+class AsyncWebOperator:
+    """
+    WebOperator 的 asyncio 封装 - 阻塞调用在线程池中执行，同一个标签页上的调用按顺序串行
+
+    - 每个 AsyncWebOperator 对应一个标签页，调用通过 asyncio.Lock 串行（DrissionPage 的页面对象不能并发操作）
+    - 不同标签页的调用在所属 AsyncBrowser 的线程池中并行
+    - call_timeout 超时或任务被取消时，向页面发送 Page.stopLoading 让阻塞调用尽快返回；
+      线程中的调用无法被强行中断，标签页在它真正结束后才会接受下一个调用
+
+    使用示例:
+        async with AsyncBrowser(headless=True) as browser:
+            tab = await browser.new_tab()
+            await tab.navigate('https://example.com', call_timeout=30)
+            elements = await tab.extract(highlight=False)
+    """
+
+    def __init__(self, operator, executor=None, extractor=None, call_timeout=None):
+        """
+        初始化
+
+        Args:
+            operator: WebOperator 实例（或 open_tab() 返回的标签页）
+            executor: 执行阻塞调用的线程池，None 时创建单线程的线程池（随 close() 关闭）
+            extractor: 可选，该标签页的 PageExtractor；None 时在第一次 extract() 时创建
+            call_timeout: 默认的调用超时时间（秒），None 不限制
+        """
+        self.operator = operator
+        self.extractor = extractor
+        self.call_timeout = call_timeout
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix='cua-async')
+        self._lock = asyncio.Lock()
+
+    @property
+    def page(self):
+        """获取 page 对象"""
+        return self.operator.page
+
+    async def call(self, func, *args, call_timeout=None, **kwargs):
+        """
+        在线程池中执行任意阻塞调用（与该标签页的其他调用串行）
+
+        Args:
+            func: 阻塞函数，如 tab.operator.select_option
+            *args: 位置参数
+            call_timeout: 超时时间（秒），None 使用默认值
+            **kwargs: 关键字参数
+
+        Returns:
+            func 的返回值；超时抛出 TimeoutError，取消时抛出 CancelledError
+        """
+        await self._lock.acquire()
+        try:
+            future = asyncio.get_running_loop().run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs))
+        except BaseException:
+            self._lock.release()
+            raise
+        # 锁在线程中的调用真正结束时释放，而不是在等待方超时 / 取消时释放
+        future.add_done_callback(lambda _: self._lock.release())
+        timeout = self.call_timeout if call_timeout is None else call_timeout
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except (asyncio.CancelledError, TimeoutError):
+            self._interrupt()
+            raise
+
+    def _interrupt(self):
+        """停止页面加载，让正在等待页面就绪的阻塞调用尽快返回"""
+        try:
+            # 不等待响应，避免阻塞事件循环
+            self.operator.page.run_cdp('Page.stopLoading', _timeout=0)
+        except Exception as e:
+            logger.debug(f"停止页面加载失败: {e}")
+
+    # ========== 页面操作 ==========
+
+    async def navigate(self, url, wait_time=None, call_timeout=None, **kwargs):
+        """
+        导航到指定 URL
+
+        Args:
+            url: 目标 URL
+            wait_time: 导航后的固定等待时间（秒），None 表示等待页面就绪
+            call_timeout: 超时时间（秒）
+            **kwargs: WebOperator.navigate 的其他参数（until、timeout）
+
+        Returns:
+            是否成功
+        """
+        return await self.call(self.operator.navigate, url, wait_time, call_timeout=call_timeout, **kwargs)
+
+    async def click(self, selector, call_timeout=None, **kwargs):
+        """
+        点击元素
+
+        Args:
+            selector: 元素选择器
+            call_timeout: 超时时间（秒）
+            **kwargs: WebOperator.click_element 的其他参数
+
+        Returns:
+            是否成功
+        """
+        return await self.call(self.operator.click_element, selector, call_timeout=call_timeout, **kwargs)
+
+    async def input(self, selector, text, call_timeout=None, **kwargs):
+        """
+        输入文本
+
+        Args:
+            selector: 元素选择器
+            text: 要输入的文本
+            call_timeout: 超时时间（秒）
+            **kwargs: WebOperator.input_text 的其他参数
+
+        Returns:
+            是否成功
+        """
+        return await self.call(self.operator.input_text, selector, text, call_timeout=call_timeout, **kwargs)
+
+    async def extract(self, call_timeout=None, **kwargs):
+        """
+        提取页面可交互元素
+
+        Args:
+            call_timeout: 超时时间（秒）
+            **kwargs: PageExtractor.extract_elements 的参数
+
+        Returns:
+            元素列表
+        """
+        return await self.call(self._extract, call_timeout=call_timeout, **kwargs)
+
+    def _extract(self, **kwargs):
+        if self.extractor is None:
+            self.extractor = PageExtractor(self.operator.page)
+        return self.extractor.extract_elements(**kwargs)
+
+    async def screenshot(self, selector=None, call_timeout=None, **kwargs):
+        """
+        内存截图
+
+        Args:
+            selector: 可选，只截取该元素
+            call_timeout: 超时时间（秒）
+            **kwargs: WebOperator.capture_screenshot 的其他参数
+
+        Returns:
+            截图数据（见 WebOperator.capture_screenshot），失败时返回 None
+        """
+        return await self.call(self.operator.capture_screenshot, selector, call_timeout=call_timeout, **kwargs)
+
+    async def get_current_url(self, call_timeout=None):
+        """获取当前页面 URL"""
+        return await self.call(self.operator.get_current_url, call_timeout=call_timeout)
+
+    async def run_js(self, script, *args, call_timeout=None):
+        """
+        执行 JavaScript
+
+        Args:
+            script: 脚本
+            *args: 传入脚本的参数
+            call_timeout: 超时时间（秒）
+
+        Returns:
+            脚本返回值
+        """
+        return await self.call(self.operator.page.run_js, script, *args, call_timeout=call_timeout)
+
+    async def close(self):
+        """关闭标签页（或浏览器），等待正在执行的调用结束"""
+        await self.call(self.operator.close)
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def __repr__(self):
+        return f"AsyncWebOperator(operator={self.operator})"
+
+
+class AsyncBrowser:
+    """
+    Browser 的 asyncio 封装 - 一个浏览器进程，多个标签页，在一个事件循环中并发驱动
+
+    每个浏览器使用一个有界线程池（max_workers 个线程）执行阻塞调用：同一个标签页上的调用串行，
+    不同标签页并行，同时执行的调用数不超过 max_workers，其余调用排队等待。
+
+    使用示例:
+        async with AsyncBrowser(headless=True, max_workers=8) as browser:
+            async def fetch(url):
+                tab = await browser.new_tab()
+                try:
+                    await tab.navigate(url, call_timeout=30)
+                    return await tab.extract(highlight=False)
+                finally:
+                    await tab.close()
+
+            results = await asyncio.gather(*(fetch(url) for url in urls))
+    """
+
+    def __init__(self, max_workers=8, call_timeout=None, **browser_kwargs):
+        """
+        初始化（浏览器在 start() 或 async with 时启动）
+
+        Args:
+            max_workers: 线程池大小，即同时执行的阻塞调用数上限
+            call_timeout: 每个调用的默认超时时间（秒），None 不限制
+            **browser_kwargs: 创建 Browser 的参数（headless、fingerprint_config、resource_policy 等）；
+                multi_tab 默认为 True（标签页在后台并发加载）
+        """
+        self.max_workers = max_workers
+        self.call_timeout = call_timeout
+        self.browser_kwargs = {'multi_tab': True, **browser_kwargs}
+        self.browser = None
+        self.operator = None
+        self._tabs = []
+        self._start_lock = asyncio.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='cua-async')
+
+    async def start(self):
+        """
+        启动浏览器
+
+        Returns:
+            self
+        """
+        async with self._start_lock:
+            if self.browser is None:
+                loop = asyncio.get_running_loop()
+                browser = await loop.run_in_executor(
+                    self._executor, functools.partial(Browser, **self.browser_kwargs))
+                self.operator = AsyncWebOperator(browser.operator, self._executor, browser.extractor,
+                                                 self.call_timeout)
+                self.browser = browser
+        return self
+
+    @property
+    def tabs(self):
+        """new_tab() 打开且尚未关闭的标签页"""
+        if self.browser is None:
+            return []
+        return [tab for tab in self._tabs if tab.operator in self.browser.operator.tabs]
+
+    async def new_tab(self, url=None, wait_time=None, call_timeout=None):
+        """
+        打开新标签页
+
+        Args:
+            url: 可选，打开后导航到该地址
+            wait_time: 导航后的固定等待时间（秒），None 表示等待页面就绪
+            call_timeout: 超时时间（秒）
+
+        Returns:
+            标签页的 AsyncWebOperator；打开失败时抛出 RuntimeError
+        """
+        await self.start()
+        loop = asyncio.get_running_loop()
+        operator = await loop.run_in_executor(self._executor, self.browser.operator.open_tab)
+        if operator is None:
+            raise RuntimeError("无法打开标签页")
+        tab = AsyncWebOperator(operator, self._executor, call_timeout=self.call_timeout)
+        self._tabs.append(tab)
+        if url:
+            await tab.navigate(url, wait_time, call_timeout=call_timeout)
+        return tab
+
+    # ========== 主标签页的快捷方法 ==========
+
+    async def navigate(self, url, wait_time=None, call_timeout=None, **kwargs):
+        """在主标签页导航（见 AsyncWebOperator.navigate）"""
+        await self.start()
+        return await self.operator.navigate(url, wait_time, call_timeout=call_timeout, **kwargs)
+
+    async def click(self, selector, call_timeout=None, **kwargs):
+        """在主标签页点击元素（见 AsyncWebOperator.click）"""
+        await self.start()
+        return await self.operator.click(selector, call_timeout=call_timeout, **kwargs)
+
+    async def input(self, selector, text, call_timeout=None, **kwargs):
+        """在主标签页输入文本（见 AsyncWebOperator.input）"""
+        await self.start()
+        return await self.operator.input(selector, text, call_timeout=call_timeout, **kwargs)
+
+    async def extract(self, call_timeout=None, **kwargs):
+        """提取主标签页的元素（见 AsyncWebOperator.extract）"""
+        await self.start()
+        return await self.operator.extract(call_timeout=call_timeout, **kwargs)
+
+    async def screenshot(self, selector=None, call_timeout=None, **kwargs):
+        """主标签页截图（见 AsyncWebOperator.screenshot）"""
+        await self.start()
+        return await self.operator.screenshot(selector, call_timeout=call_timeout, **kwargs)
+
+    async def close(self):
+        """关闭所有标签页和浏览器"""
+        if self.browser is not None:
+            for tab in self.tabs:
+                try:
+                    await tab.close()
+                except Exception as e:
+                    logger.warning(f"⚠️  关闭标签页失败: {e}")
+            await self.operator.call(self.browser.close)
+            self.browser = None
+            self.operator = None
+            self._tabs = []
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def __repr__(self):
+        return f"AsyncBrowser(max_workers={self.max_workers}, started={self.browser is not None})"
@@ -24,6 +24,15 @@ class Browser:
             headless=False,
             fingerprint_config='mac_chrome'
         )
+        
+        # 批量填表时直接设置 value，跳过逐键输入
+        browser = Browser(input_mode='fast')
+        
+        # 抓取场景：不加载图片、视频和字体
+        browser = Browser(resource_policy='no-media')
+        
+        # 从预热过的用户目录模板克隆启动（可与其他实例并发使用同一模板）
+        browser = Browser(profile_template=ProfileTemplate('profiles/base'))
     """
     
     def __init__(
@@ -32,6 +41,14 @@ class Browser:
         window_size: Optional[Dict[str, int]] = None,
         fingerprint_config: Optional[Any] = None,
         user_data_dir: Optional[str] = None,
+        incremental_extraction: bool = False,
+        extraction_engine: str = 'dom',
+        viewport_only_extraction: bool = False,
+        input_mode: str = 'standard',
+        keystroke_delay: tuple = (0.05, 0.15),
+        resource_policy: Optional[Any] = None,
+        profile_template: Optional[Any] = None,
+        multi_tab: bool = False,
     ):
         """
         初始化浏览器
@@ -41,6 +58,15 @@ class Browser:
             window_size: 窗口大小，格式 {'width': 1000, 'height': 700}
             fingerprint_config: 指纹配置
             user_data_dir: 用户数据目录
+            incremental_extraction: 是否启用增量元素提取（只返回页面变化的元素）
+            extraction_engine: 元素提取引擎，'dom'（默认）、'snapshot'（DOMSnapshot）或 'ax'（可访问性树）
+            viewport_only_extraction: 是否只提取与视口相交的元素
+            input_mode: 文本输入方式，'standard'（默认）、'fast'（直接设置 value）或 'paced'（逐键输入）
+            keystroke_delay: paced 模式下相邻按键的间隔范围（秒）
+            resource_policy: 资源加载策略，预设名称（'text-only'、'no-media'、'first-party-only'、
+                'no-trackers'）、预设列表、参数字典或 ResourcePolicy 实例
+            profile_template: 用户目录模板（ProfileTemplate 或模板目录），使用模板的克隆启动浏览器
+            multi_tab: 是否用于多标签页并发，为 True 时关闭后台标签页的定时器和渲染节流
         """
         self.headless = headless
         self.window_size = window_size or {'width': 1280, 'height': 720}
@@ -51,7 +77,12 @@ class Browser:
         self.operator = WebOperator(
             headless=headless,
             fingerprint_config=fingerprint_config,
-            user_data_dir=user_data_dir
+            user_data_dir=user_data_dir,
+            input_mode=input_mode,
+            keystroke_delay=keystroke_delay,
+            resource_policy=resource_policy,
+            profile_template=profile_template,
+            multi_tab=multi_tab
         )
         
         # 设置窗口大小
@@ -65,10 +96,30 @@ class Browser:
                 logger.warning(f"设置窗口大小失败: {e}")
         
         # 创建 PageExtractor
-        self.extractor = PageExtractor(self.operator.page)
+        self.extractor = PageExtractor(
+            self.operator.page,
+            incremental=incremental_extraction,
+            engine=extraction_engine,
+            viewport_only=viewport_only_extraction
+        )
         
         logger.success(f"✅ Browser 初始化完成 - {'无头' if headless else '有头'}模式, 窗口大小: {self.window_size['width']}x{self.window_size['height']}")
     
+    def enable_profiling(self, profiler=None):
+        """
+        启用 CDP 往返分析（页面、操作和元素提取）
+        
+        Args:
+            profiler: 可选，CDPProfiler 实例
+            
+        Returns:
+            CDPProfiler 实例
+        """
+        profiler = self.operator.enable_profiling(profiler)
+        profiler.instrument(self.extractor, ('extract_elements', 'highlight_elements', 'marked_screenshot'),
+                            'extract', owner=self.operator)
+        return profiler
+    
     @property
     def page(self):
         """获取 page 对象"""
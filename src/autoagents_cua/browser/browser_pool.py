@@ -0,0 +1,355 @@
+import threading
+from collections import deque
+from time import monotonic
+from ..utils.logging import logger
+from .web_operator import WebOperator
+
+
+
+class BrowserLease:
+    """
+    浏览器租约 - with 语句结束或调用 release() 时归还到浏览器池
+
+    使用示例:
+        with pool.lease('mac_chrome') as operator:
+            operator.navigate('https://example.com')
+    """
+
+    def __init__(self, pool, entry, wait_time, warm):
+        """
+        初始化租约（由 BrowserPool.lease() 创建）
+
+        Args:
+            pool: 所属的 BrowserPool
+            entry: 池内实例记录
+            wait_time: 获取租约的等待时间（秒）
+            warm: 是否为已就绪的实例（False 表示为该租约冷启动）
+        """
+        self.pool = pool
+        self.operator = entry['operator']
+        self.fingerprint = entry['key']
+        self.warm = warm
+        self.wait_time = wait_time
+        self.released = False
+        self._entry = entry
+
+    def release(self, discard=False):
+        """
+        归还浏览器（重复调用无副作用）
+
+        Args:
+            discard: 是否直接关闭该实例（例如浏览器已崩溃），不再放回池中
+        """
+        if self.released:
+            return
+        self.released = True
+        self.pool._release(self._entry, discard)
+
+    def __enter__(self):
+        return self.operator
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    def __repr__(self):
+        return f"BrowserLease(fingerprint={self.fingerprint}, warm={self.warm}, released={self.released})"
+
+
+class BrowserPool:
+    """
+    浏览器实例池 - 预先启动的浏览器保持就绪，按租约借出、归还时重置，并发的 Agent 不用等待浏览器冷启动
+
+    - 按指纹预设分组：每个预设最多 size 个实例（None 表示不使用指纹），warm=True 时预先全部启动
+    - 借出：有空闲实例时立即返回；否则启动新实例，或等待其他租约归还
+    - 归还：按 reset 策略关闭多余标签页、清除 Cookie / 站点存储 / 缓存，并回到 about:blank
+    - 回收：使用次数达到 max_uses、浏览器进程内存超过 max_memory_mb 或重置失败时关闭实例，
+      warm=True 时在后台启动替补
+    - 每个实例使用独立端口和临时用户目录（ChromiumOptions.auto_port），互不影响；传入
+      profile_template 时每个实例使用模板的克隆，启动时已有扩展和热缓存
+
+    使用示例:
+        pool = BrowserPool(size=2, fingerprints=[None, 'mac_chrome'], headless=True)
+        with pool.lease('mac_chrome') as operator:
+            operator.navigate('https://example.com')
+        print(pool.metrics())
+        pool.close()
+    """
+
+    # 归还时可重置的内容
+    RESET_OPTIONS = ('tabs', 'cookies', 'storage', 'cache')
+
+    # 保留的耗时样本数
+    METRIC_WINDOW = 200
+
+    def __init__(self, size=2, fingerprints=(None,), max_uses=50, max_memory_mb=None,
+                 reset=('tabs', 'cookies', 'storage'), warm=True, lease_timeout=60, **operator_kwargs):
+        """
+        初始化浏览器池
+
+        Args:
+            size: 每个指纹预设最多保持的实例数
+            fingerprints: 预先启动的指纹预设名称列表，None 表示不使用指纹
+            max_uses: 每个实例最多借出的次数，达到后回收
+            max_memory_mb: 浏览器进程（含子进程）内存上限（MB），归还时超过则回收；None 不检查
+            reset: 归还时重置的内容，'tabs' | 'cookies' | 'storage' | 'cache' 的组合
+            warm: 是否预先启动实例，并在回收后后台启动替补
+            lease_timeout: 默认的借出等待超时（秒）
+            **operator_kwargs: 创建 WebOperator 的其他参数（如 headless、resource_policy）
+        """
+        unknown = set(reset or ()) - set(self.RESET_OPTIONS)
+        if unknown:
+            raise ValueError(f"不支持的重置选项: {', '.join(sorted(unknown))}，可选: {', '.join(self.RESET_OPTIONS)}")
+        for name in ('fingerprint_config', 'auto_port'):
+            if name in operator_kwargs:
+                raise ValueError(f"{name} 由浏览器池管理，不能通过 operator_kwargs 传入")
+
+        self.size = size
+        self.fingerprints = list(fingerprints) if fingerprints else [None]
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self.reset = tuple(reset or ())
+        self.warm = warm
+        self.lease_timeout = lease_timeout
+        self.operator_kwargs = operator_kwargs
+
+        self._cond = threading.Condition()
+        self._idle = {}
+        self._instances = {}
+        self._leased = 0
+        self._closed = False
+        self._stats = {'leases': 0, 'warm_hits': 0, 'cold_starts': 0, 'waits': 0, 'timeouts': 0,
+                       'launched': 0, 'launch_failures': 0, 'recycled': {}}
+        self._times = {name: deque(maxlen=self.METRIC_WINDOW) for name in ('lease_wait', 'launch', 'reset')}
+
+        if warm:
+            for key in self.fingerprints:
+                self.warm_up(key)
+
+    # ========== 启动 ==========
+
+    def warm_up(self, fingerprint=None):
+        """
+        在后台启动实例，直到该指纹预设的实例数达到 size
+
+        Args:
+            fingerprint: 指纹预设名称，None 表示不使用指纹
+        """
+        with self._cond:
+            missing = 0 if self._closed else self.size - self._instances.get(fingerprint, 0)
+            self._instances[fingerprint] = self._instances.get(fingerprint, 0) + max(missing, 0)
+        for _ in range(max(missing, 0)):
+            threading.Thread(target=self._launch_idle, args=(fingerprint,), daemon=True).start()
+
+    def _create(self, key):
+        """启动一个浏览器实例（调用方已占用实例名额）"""
+        started = monotonic()
+        operator = WebOperator(fingerprint_config=key, auto_port=True, **self.operator_kwargs)
+        with self._cond:
+            self._stats['launched'] += 1
+            self._times['launch'].append(monotonic() - started)
+        return {'operator': operator, 'key': key, 'uses': 0}
+
+    def _launch_idle(self, key):
+        try:
+            entry = self._create(key)
+        except Exception as e:
+            logger.error(f"❌ 浏览器池启动实例失败（{key or '无指纹'}）: {e}")
+            with self._cond:
+                self._instances[key] -= 1
+                self._stats['launch_failures'] += 1
+                self._cond.notify_all()
+            return
+        with self._cond:
+            if not self._closed:
+                self._idle.setdefault(key, deque()).append(entry)
+                self._cond.notify_all()
+                return
+            self._instances[key] -= 1
+        entry['operator'].close()
+
+    # ========== 借出与归还 ==========
+
+    def lease(self, fingerprint=None, timeout=None):
+        """
+        借出一个浏览器
+
+        Args:
+            fingerprint: 指纹预设名称，None 表示不使用指纹
+            timeout: 等待空闲实例的超时时间（秒），None 使用 lease_timeout
+
+        Returns:
+            BrowserLease，可用于 with 语句（as 得到 WebOperator）
+
+        Raises:
+            TimeoutError: 超时仍没有可用实例
+            RuntimeError: 浏览器池已关闭或实例启动失败
+        """
+        started = monotonic()
+        deadline = started + (self.lease_timeout if timeout is None else timeout)
+        entry, launch = None, False
+        with self._cond:
+            waited = False
+            while True:
+                if self._closed:
+                    raise RuntimeError("浏览器池已关闭")
+                idle = self._idle.get(fingerprint)
+                if idle:
+                    entry = idle.popleft()
+                    break
+                if self._instances.get(fingerprint, 0) < self.size:
+                    # 占用名额后在锁外启动，避免阻塞其他租约
+                    self._instances[fingerprint] = self._instances.get(fingerprint, 0) + 1
+                    launch = True
+                    break
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise TimeoutError(f"等待浏览器超时（{fingerprint or '无指纹'}，{self.size} 个实例均在使用中）")
+                waited = True
+                self._cond.wait(remaining)
+            self._leased += 1
+            self._stats['waits'] += int(waited)
+
+        if launch:
+            try:
+                entry = self._create(fingerprint)
+            except Exception as e:
+                with self._cond:
+                    self._instances[fingerprint] -= 1
+                    self._leased -= 1
+                    self._stats['launch_failures'] += 1
+                    self._cond.notify_all()
+                raise RuntimeError(f"浏览器启动失败: {e}") from e
+
+        entry['uses'] += 1
+        wait_time = monotonic() - started
+        with self._cond:
+            self._stats['leases'] += 1
+            self._stats['cold_starts' if launch else 'warm_hits'] += 1
+            self._times['lease_wait'].append(wait_time)
+        lease = BrowserLease(self, entry, wait_time, warm=not launch)
+        logger.debug(f"浏览器池借出实例（{fingerprint or '无指纹'}，第 {entry['uses']} 次使用，等待 {wait_time:.3f}s）")
+        return lease
+
+    def _release(self, entry, discard=False):
+        """归还实例：重置后放回空闲队列，或回收"""
+        reason = 'discarded' if discard else None
+        if reason is None and self._closed:
+            reason = 'closed'
+        if reason is None and self.max_uses and entry['uses'] >= self.max_uses:
+            reason = 'max_uses'
+        if reason is None:
+            started = monotonic()
+            try:
+                self._reset(entry['operator'])
+                with self._cond:
+                    self._times['reset'].append(monotonic() - started)
+            except Exception as e:
+                logger.warning(f"⚠️  重置浏览器失败，回收该实例: {e}")
+                reason = 'reset_failed'
+        if reason is None and self.max_memory_mb:
+            memory = self._memory_mb(entry['operator'])
+            if memory is not None and memory > self.max_memory_mb:
+                logger.info(f"浏览器内存 {memory:.0f} MB 超过上限 {self.max_memory_mb} MB，回收该实例")
+                reason = 'memory'
+
+        with self._cond:
+            self._leased -= 1
+            if reason is None:
+                self._idle.setdefault(entry['key'], deque()).append(entry)
+                self._cond.notify_all()
+                return
+            self._instances[entry['key']] -= 1
+            if reason != 'closed':
+                self._stats['recycled'][reason] = self._stats['recycled'].get(reason, 0) + 1
+            self._cond.notify_all()
+            replace = self.warm and not self._closed
+
+        entry['operator'].close()
+        if replace:
+            self.warm_up(entry['key'])
+
+    def _reset(self, operator):
+        """按 reset 策略清理浏览器状态"""
+        page = operator.page
+        if 'tabs' in self.reset and page.browser.tabs_count > 1:
+            page.close_tabs(page.tab_id, others=True)
+        # 先离开当前页面，避免页面脚本在清理之后重新写入存储
+        page.get('about:blank')
+        if 'storage' in self.reset:
+            page.run_cdp('Storage.clearDataForOrigin', origin='*', storageTypes='all')
+        if 'cookies' in self.reset or 'cache' in self.reset:
+            page.browser.clear_cache(cache='cache' in self.reset, cookies='cookies' in self.reset)
+        operator.last_readiness = None
+
+    @staticmethod
+    def _memory_mb(operator):
+        """浏览器主进程及其子进程的内存占用（MB），无法获取时返回 None"""
+        try:
+            import psutil  # DrissionPage 的依赖
+            pid = operator.page.browser.process_id
+            if not pid:
+                return None
+            process = psutil.Process(pid)
+            total = 0
+            for item in [process] + process.children(recursive=True):
+                try:
+                    total += item.memory_info().rss
+                except psutil.Error:
+                    pass
+            return total / 1024 / 1024
+        except Exception as e:
+            logger.debug(f"获取浏览器内存占用失败: {e}")
+            return None
+
+    # ========== 统计 ==========
+
+    @staticmethod
+    def _summary(samples):
+        if not samples:
+            return {'mean': None, 'max': None}
+        return {'mean': round(sum(samples) / len(samples) * 1000, 1), 'max': round(max(samples) * 1000, 1)}
+
+    def metrics(self):
+        """
+        浏览器池统计
+
+        Returns:
+            {'leases', 'warm_hits', 'cold_starts', 'waits', 'timeouts', 'launched', 'launch_failures',
+             'recycled': {原因: 次数}, 'leased': 借出中的实例数, 'idle': {指纹: 空闲数},
+             'instances': {指纹: 实例数（含启动中）},
+             'lease_wait_ms' / 'launch_ms' / 'reset_ms': {'mean', 'max'}}
+        """
+        with self._cond:
+            stats = dict(self._stats, recycled=dict(self._stats['recycled']))
+            stats['leased'] = self._leased
+            stats['idle'] = {key: len(idle) for key, idle in self._idle.items()}
+            stats['instances'] = dict(self._instances)
+            times = {name: list(samples) for name, samples in self._times.items()}
+        for name, samples in times.items():
+            stats[f'{name}_ms'] = self._summary(samples)
+        return stats
+
+    # ========== 关闭 ==========
+
+    def close(self):
+        """关闭所有空闲实例；借出中的实例在归还时关闭"""
+        with self._cond:
+            self._closed = True
+            entries = [entry for idle in self._idle.values() for entry in idle]
+            self._idle = {}
+            for entry in entries:
+                self._instances[entry['key']] -= 1
+            self._cond.notify_all()
+        for entry in entries:
+            entry['operator'].close()
+        logger.info(f"浏览器池已关闭（关闭 {len(entries)} 个空闲实例）")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return f"BrowserPool(size={self.size}, fingerprints={self.fingerprints}, max_uses={self.max_uses})"
@@ -10,7 +10,9 @@ from openai import OpenAI
 import re
 from ..utils.logging import logger, set_stage
 from ..models import Stage
-from ..utils.image_converter import encode_image
+from ..utils.image_converter import encode_image, encode_image_bytes
+from .settle_learner import SettleLearner
+from .screenshot import ScreenshotCapture
 from time import sleep
 import random
 import os
@@ -25,15 +27,23 @@ from DrissionPage import ChromiumPage, ChromiumOptions
 # ========== 通用验证码代理 ==========
 
 class CaptchaAgent:
+    # 验证码加载 / 提交后的默认等待上限（秒），积累足够样本后改用学习到的超时
+    CAPTCHA_LOAD_TIMEOUT = 5
+    CAPTCHA_SUBMIT_TIMEOUT = 5
+
     def __init__(self, 
                 api_key: str , 
                 base_url: str ,
                 model: str ,
+                settle_learner=None,
                 ):
         self.api_key = api_key
         self.base_url = base_url
         self.model = model
         
+        # 页面稳定时间学习器（None 使用共享学习器，False 不学习）
+        self.settle_learner = SettleLearner.shared() if settle_learner is None else (settle_learner or None)
+        
         # 初始化输出目录
         self._init_output_dir()
 
@@ -64,12 +74,109 @@ class CaptchaAgent:
         """
         return os.path.join(self.output_dir, filename)
     
+    def _learned_timeout(self, page, action, default):
+        """获取学习到的等待超时，没有学习器时返回默认值"""
+        if self.settle_learner is None:
+            return default
+        return self.settle_learner.timeout(page.url, action, default)
+    
+    def _learned_delay(self, page, action, default):
+        """
+        获取没有就绪信号、只能固定等待时的等待时间
+
+        样本来自同一域名下有就绪信号的等待（wait_captcha_loaded 记录 'captcha_load'，
+        wait_captcha_passed 记录 'captcha_submit'，WebOperator 记录 'click'），
+        样本足够时取 p95 且不超过 default，没有学习器或样本不足时返回 default
+        """
+        if self.settle_learner is None:
+            return default
+        return self.settle_learner.delay(page.url, action, default)
+    
+    def _record_settle(self, page, action, seconds, timed_out=False):
+        """记录一次稳定耗时（超时记为删失样本）"""
+        if self.settle_learner is not None:
+            self.settle_learner.record(page.url, action, seconds, timed_out=timed_out)
+    
+    def wait_captcha_loaded(self, page, captcha_selector, timeout=None):
+        """
+        等待验证码面板加载完成（图片全部加载且位置尺寸不再变化），替代固定等待
+        
+        Args:
+            page: DrissionPage 页面对象
+            captcha_selector: 验证码面板定位器
+            timeout: 超时时间（秒），None 时使用学习到的超时
+            
+        Returns:
+            bool: 是否在超时前加载完成
+        """
+        if timeout is None:
+            timeout = self._learned_timeout(page, 'captcha_load', self.CAPTCHA_LOAD_TIMEOUT)
+        start = time.perf_counter()
+        last_rect = None
+        while time.perf_counter() - start < timeout:
+            try:
+                panel = page.ele(captcha_selector, timeout=0)
+                if panel:
+                    rect = (panel.rect.location, panel.rect.size)
+                    images_loaded = panel.run_js(
+                        'return Array.from(this.querySelectorAll("img")).every(i => i.complete && i.naturalWidth > 0);'
+                    )
+                    if images_loaded and rect == last_rect:
+                        elapsed = time.perf_counter() - start
+                        self._record_settle(page, 'captcha_load', elapsed)
+                        logger.debug(f"验证码加载完成，用时 {elapsed:.2f}s")
+                        return True
+                    last_rect = rect
+            except Exception as e:
+                logger.debug(f"检查验证码加载状态失败: {e}")
+            sleep(0.1)
+        self._record_settle(page, 'captcha_load', timeout, timed_out=True)
+        logger.warning(f"等待验证码加载超时（{timeout:.1f}s）")
+        return False
+    
+    def wait_captcha_passed(self, page, captcha_selector, timeout=None):
+        """
+        等待验证码面板消失（验证通过），替代提交后的固定等待
+        
+        Args:
+            page: DrissionPage 页面对象
+            captcha_selector: 验证码面板定位器
+            timeout: 超时时间（秒），None 时使用学习到的超时
+            
+        Returns:
+            bool: 面板是否在超时前消失
+        """
+        if timeout is None:
+            timeout = self._learned_timeout(page, 'captcha_submit', self.CAPTCHA_SUBMIT_TIMEOUT)
+        start = time.perf_counter()
+        passed = page.wait.ele_deleted(captcha_selector, timeout=timeout)
+        if passed:
+            # 只有验证通过时的耗时代表页面的稳定时间
+            self._record_settle(page, 'captcha_submit', time.perf_counter() - start)
+        return bool(passed)
+    
     
 
-    def recognize_captcha(self, captcha_img_path: str):
+    @staticmethod
+    def _encode_captcha_image(captcha_image):
+        """验证码图片转 base64：内存中的 PNG 字节直接编码，字符串视为文件路径"""
+        if isinstance(captcha_image, (bytes, bytearray)):
+            return encode_image_bytes(captcha_image)
+        return encode_image(captcha_image)
+
+    def recognize_captcha(self, captcha_image):
+        """
+        识别验证码图片
+
+        Args:
+            captcha_image: 验证码截图的 PNG 字节，或图片文件路径
+
+        Returns:
+            模型回答，失败时返回空字符串
+        """
         log = set_stage(Stage.CAPTCHA)
         # 编码验证码图片
-        image_data = encode_image(captcha_img_path)
+        image_data = self._encode_captcha_image(captcha_image)
 
         # 构建提示词
         prompt = (
@@ -224,7 +331,7 @@ class CaptchaAgent:
             
             # 点击确认按钮（如果有）
             try:
-                sleep(1)
+                sleep(self._learned_delay(page, 'click', 1))
                 commit_button = page.ele('t:div@@class=geetest_commit_tip')
                 if commit_button:
                     commit_button.click()
@@ -247,7 +354,8 @@ class CaptchaAgent:
         Args:
             page: DrissionPage 页面对象
             captcha_selector: 验证码面板定位器
-            save_path: 验证码截图保存路径（默认为 playground/outputs/captcha.png）
+            save_path: 可选，验证码截图保存路径（相对路径保存在 playground/outputs 下）；
+                默认只在内存中截图，不写入磁盘
             timeout: 等待超时时间（秒）
             max_retries: 最大重试次数
             
@@ -258,10 +366,8 @@ class CaptchaAgent:
         
         log = set_stage(Stage.CAPTCHA)
         
-        # 如果没有指定保存路径，使用默认路径
-        if save_path is None:
-            save_path = self._get_output_path('captcha.png')
-        elif not os.path.isabs(save_path):
+        # 只有指定保存路径时才写入磁盘
+        if save_path and not os.path.isabs(save_path):
             # 如果是相对路径，转换为输出目录下的路径
             save_path = self._get_output_path(save_path)
         
@@ -271,7 +377,7 @@ class CaptchaAgent:
             # 1. 等待验证码出现
             log.info("等待验证码出现...")
             page.wait.ele_displayed(captcha_selector, timeout=timeout)
-            sleep(5)  # 额外等待确保完全加载
+            self.wait_captcha_loaded(page, captcha_selector)  # 等待图片加载完成
             
             # 尝试多次识别和点击
             for attempt in range(1, max_retries + 1):
@@ -284,7 +390,7 @@ class CaptchaAgent:
                         log.warning("未找到验证码面板")
                         if attempt < max_retries:
                             log.info("等待验证码刷新...")
-                            sleep(2)
+                            sleep(self._learned_delay(page, 'captcha_load', 2))
                             continue
                         return False
                     
@@ -300,12 +406,15 @@ class CaptchaAgent:
                     log.success(f"验证码信息: 位置{location}, 尺寸{size}")
                     
                     # 3. 截取验证码图片
-                    captcha_panel.get_screenshot(save_path)
-                    log.success(f"验证码截图已保存: {save_path}")
+                    captcha_image = ScreenshotCapture(page).capture(captcha_panel, format='png', save_path=save_path)
+                    if captcha_image is None:
+                        raise RuntimeError("验证码截图失败")
+                    if save_path:
+                        log.success(f"验证码截图已保存: {save_path}")
                     
                     # 4. 识别验证码
                     log.info("识别验证码...")
-                    answer = self.recognize_captcha(save_path)
+                    answer = self.recognize_captcha(captcha_image)
                     
                     # 5. 解析坐标
                     coordinates = self.parse_coordinates(answer)
@@ -314,7 +423,7 @@ class CaptchaAgent:
                         log.warning("未能解析出坐标")
                         if attempt < max_retries:
                             log.info("准备重试...")
-                            sleep(2)
+                            sleep(self._learned_delay(page, 'captcha_load', 2))
                             continue
                         return False
                     
@@ -330,22 +439,20 @@ class CaptchaAgent:
                         log.warning("坐标点击失败")
                         if attempt < max_retries:
                             log.info("准备重试...")
-                            sleep(2)
+                            sleep(self._learned_delay(page, 'captcha_load', 2))
                             continue
                         return False
                     
-                    # 7. 等待验证结果
-                    sleep(3)
+                    # 7. 等待验证结果（面板消失即验证通过）
+                    passed = self.wait_captcha_passed(page, captcha_selector)
                     
                     # 8. 检查验证码面板是否还存在
-                    captcha_panel_after = page.ele(captcha_selector, timeout=2)
-                    
-                    if captcha_panel_after:
+                    if not passed:
                         # 验证码面板还在，说明验证失败，需要重试
                         log.warning(f"验证码验证失败，面板仍然存在")
                         if attempt < max_retries:
                             log.info("验证码已刷新，准备重新识别...")
-                            sleep(2)
+                            sleep(self._learned_delay(page, 'captcha_load', 2))
                             continue
                         else:
                             log.error(f"已达到最大重试次数 {max_retries}")
@@ -359,7 +466,7 @@ class CaptchaAgent:
                     log.warning(f"第 {attempt} 次尝试出错: {e}")
                     if attempt < max_retries:
                         log.info("准备重试...")
-                        sleep(2)
+                        sleep(self._learned_delay(page, 'captcha_load', 2))
                         continue
                     else:
                         raise
@@ -597,7 +704,7 @@ class CaptchaAgent:
             if not challenge_iframe:
                 # 再等待一下，有些情况下挑战出现较慢
                 log.info("等待验证挑战出现...")
-                sleep(2)
+                sleep(self._learned_delay(self.page, 'captcha_load', 2))
                 challenge_iframe = self.page.ele('css:iframe[title*="recaptcha challenge"]', timeout=3)
             
             if not challenge_iframe:
@@ -620,7 +727,7 @@ class CaptchaAgent:
         try:
             # 切换到挑战 iframe
             self.page.get_frame(challenge_iframe)
-            sleep(1)
+            sleep(self._learned_delay(self.page, 'captcha_load', 1))
             
             for attempt in range(1, max_retries + 1):
                 log.info(f"第 {attempt}/{max_retries} 次尝试识别图片验证码...")
@@ -631,7 +738,7 @@ class CaptchaAgent:
                 
                 if not challenge_container:
                     log.warning("未找到验证码图片容器")
-                    sleep(1)
+                    sleep(self._learned_delay(self.page, 'captcha_load', 1))
                     continue
                 
                 # 截图
@@ -639,7 +746,7 @@ class CaptchaAgent:
                     if not challenge_container.states.is_displayed:
                         log.warning(f"验证码容器在第 {attempt} 次尝试时不可见")
                         if attempt < max_retries:
-                            sleep(2)
+                            sleep(self._learned_delay(self.page, 'captcha_load', 2))
                             continue
                         return False
                     
@@ -649,7 +756,7 @@ class CaptchaAgent:
                     log.warning(f"第 {attempt} 次尝试截图失败: {e}")
                     if attempt < max_retries:
                         log.info("等待验证码刷新...")
-                        sleep(2)
+                        sleep(self._learned_delay(self.page, 'captcha_load', 2))
                         continue
                     return False
                 
@@ -660,7 +767,7 @@ class CaptchaAgent:
                 if not answer:
                     log.warning("AI 识别失败")
                     if attempt < max_retries:
-                        sleep(2)
+                        sleep(self._learned_delay(self.page, 'captcha_load', 2))
                         continue
                     return False
                 
@@ -670,7 +777,7 @@ class CaptchaAgent:
                 if not coordinates:
                     log.warning("未能解析出坐标")
                     if attempt < max_retries:
-                        sleep(2)
+                        sleep(self._learned_delay(self.page, 'captcha_load', 2))
                         continue
                     return False
                 
@@ -680,7 +787,7 @@ class CaptchaAgent:
                 if not tile_ids:
                     log.warning("未能转换出有效的格子 ID")
                     if attempt < max_retries:
-                        sleep(2)
+                        sleep(self._learned_delay(self.page, 'captcha_load', 2))
                         continue
                     return False
                 
@@ -691,17 +798,17 @@ class CaptchaAgent:
                 if not success:
                     log.warning("点击格子失败")
                     if attempt < max_retries:
-                        sleep(2)
+                        sleep(self._learned_delay(self.page, 'captcha_load', 2))
                         continue
                     return False
                 
                 # 点击验证按钮
-                sleep(1)
+                sleep(self._learned_delay(self.page, 'click', 1))
                 verify_button = self.page.ele('css:#recaptcha-verify-button', timeout=3)
                 if verify_button:
                     verify_button.click()
                     log.success("✅ 已点击验证按钮")
-                    sleep(1)
+                    sleep(self._learned_delay(self.page, 'captcha_submit', 1))
                 
                 # 检查是否还有挑战
                 new_challenge = self.page.ele('css:.rc-imageselect-challenge', timeout=2)
@@ -711,7 +818,7 @@ class CaptchaAgent:
                     return True
                 else:
                     log.warning("验证失败，准备重试...")
-                    sleep(1)
+                    sleep(self._learned_delay(self.page, 'captcha_load', 1))
             
             log.error(f"图片验证失败，已尝试 {max_retries} 次")
             self.page.get_frame('main')
@@ -857,7 +964,7 @@ class CaptchaAgent:
         try:
             # 切换到挑战 iframe
             self.page.get_frame(challenge_iframe)
-            sleep(2)
+            sleep(self._learned_delay(self.page, 'captcha_load', 2))
             
             # 检测验证码容器
             challenge_container = self.page.ele('css:.rc-imageselect-challenge', timeout=5)
@@ -901,7 +1008,7 @@ class CaptchaAgent:
                     if not challenge_container.states.is_displayed:
                         log.warning(f"验证码容器在第 {attempt} 次尝试时不可见")
                         if attempt < max_retries:
-                            sleep(2)
+                            sleep(self._learned_delay(self.page, 'captcha_load', 2))
                             continue
                         return False
                     
@@ -912,7 +1019,7 @@ class CaptchaAgent:
                     log.warning(f"第 {attempt} 次尝试截图失败: {e}")
                     if attempt < max_retries:
                         log.info("等待验证码刷新...")
-                        sleep(2)
+                        sleep(self._learned_delay(self.page, 'captcha_load', 2))
                         continue
                     return False
                 
@@ -923,7 +1030,7 @@ class CaptchaAgent:
                 if not answer:
                     log.warning("AI 识别失败")
                     if attempt < max_retries:
-                        sleep(2)
+                        sleep(self._learned_delay(self.page, 'captcha_load', 2))
                         continue
                     return False
                 
@@ -933,7 +1040,7 @@ class CaptchaAgent:
                 if not coordinates:
                     log.warning("未能解析出坐标")
                     if attempt < max_retries:
-                        sleep(2)
+                        sleep(self._learned_delay(self.page, 'captcha_load', 2))
                         continue
                     return False
                 
@@ -943,7 +1050,7 @@ class CaptchaAgent:
                 if not tile_ids:
                     log.warning("未能转换出有效的格子 ID")
                     if attempt < max_retries:
-                        sleep(2)
+                        sleep(self._learned_delay(self.page, 'captcha_load', 2))
                         continue
                     return False
                 
@@ -954,17 +1061,17 @@ class CaptchaAgent:
                 if not success:
                     log.warning("点击格子失败")
                     if attempt < max_retries:
-                        sleep(2)
+                        sleep(self._learned_delay(self.page, 'captcha_load', 2))
                         continue
                     return False
                 
                 # 点击验证按钮
-                sleep(1)
+                sleep(self._learned_delay(self.page, 'click', 1))
                 verify_button = self.page.ele('css:#recaptcha-verify-button', timeout=3)
                 if verify_button:
                     verify_button.click()
                     log.success("✅ 已点击验证按钮")
-                    sleep(3)
+                    sleep(self._learned_delay(self.page, 'captcha_submit', 3))
                 
                 # 检查是否还有挑战
                 new_challenge = self.page.ele('css:.rc-imageselect-challenge', timeout=2)
@@ -973,7 +1080,7 @@ class CaptchaAgent:
                     return True
                 else:
                     log.warning("验证失败，准备重试...")
-                    sleep(2)
+                    sleep(self._learned_delay(self.page, 'captcha_load', 2))
             
             log.error(f"4x4 图片验证失败，已尝试 {max_retries} 次")
             return False
@@ -1074,7 +1181,7 @@ class CaptchaAgent:
                     if not challenge_container.states.is_displayed:
                         log.warning(f"验证码容器在第 {attempt} 次尝试时不可见")
                         if attempt < max_retries:
-                            sleep(2)
+                            sleep(self._learned_delay(self.page, 'captcha_load', 2))
                             continue
                         return False
                     
@@ -1085,7 +1192,7 @@ class CaptchaAgent:
                     log.warning(f"第 {attempt} 次尝试截图失败: {e}")
                     if attempt < max_retries:
                         log.info("等待验证码刷新...")
-                        sleep(2)
+                        sleep(self._learned_delay(self.page, 'captcha_load', 2))
                         continue
                     return False
                 
@@ -1132,12 +1239,12 @@ class CaptchaAgent:
                     return False
                 
                 # 点击验证按钮
-                sleep(1)
+                sleep(self._learned_delay(self.page, 'click', 1))
                 verify_button = self.page.ele('css:#recaptcha-verify-button', timeout=3)
                 if verify_button:
                     verify_button.click()
                     log.success("✅ 已点击验证按钮")
-                    sleep(3)
+                    sleep(self._learned_delay(self.page, 'captcha_submit', 3))
                 
                 # 检查是否还有挑战
                 new_challenge = self.page.ele('css:.rc-imageselect-challenge', timeout=2)
@@ -1146,7 +1253,7 @@ class CaptchaAgent:
                     return True
                 else:
                     log.warning("验证失败，准备重试...")
-                    sleep(2)
+                    sleep(self._learned_delay(self.page, 'captcha_load', 2))
             
             log.error(f"图片验证失败，已尝试 {max_retries} 次")
             return False
@@ -0,0 +1,478 @@
+import os
+import sys
+import json
+import threading
+import importlib
+from contextlib import contextmanager
+from collections import defaultdict
+from time import perf_counter_ns
+from ..utils.logging import logger
+
+# 包名（autoagents_cua 或 src.autoagents_cua），用于在调用栈中找到本项目的调用方
+_PACKAGE = __name__.rsplit('.', 2)[0]
+
+
+class CDPProfiler:
+    """
+    CDP 往返分析器 - 统计并计时页面上的每次 CDP 往返、run_js / run_cdp / ele 调用和 WebOperator 操作
+
+    按需启用（WebOperator.enable_profiling() / Browser.enable_profiling()），只替换被分析对象的实例属性，
+    停用后恢复，不影响未启用的页面：
+    - cdp：页面（及其 iframe）Driver 的每次 CDP 往返，记录方法名、耗时、请求 / 响应的 JSON 字节数
+    - api：页面对象的 run_js、run_cdp、ele、eles 等调用（一次调用可能包含多次 CDP 往返）
+    - action：WebOperator 的操作方法（navigate、click_element、input_text 等）
+    - sleep：web_operator / captcha_solver 模块中的固定等待
+    - 其他类别：span() 手动标记的耗时，如 LLM 调用
+    每条记录都归属到调用栈中最近的项目方法（caller）和最外层的工具 / 浏览器方法（tool），
+    以及当前线程所在的步骤（step()）。report() 输出每个步骤的汇总，export_trace() 输出
+    Chrome trace-event JSON（可在 chrome://tracing 或 Perfetto 中打开）。
+
+    使用示例:
+        profiler = operator.enable_profiling()
+        with profiler.step('login'):
+            login_agent.login(username, password)
+        print(profiler.format_report())
+        profiler.export_trace('playground/outputs/login_trace.json')
+    """
+
+    # 页面对象上记录的调用
+    API_METHODS = ('run_js', 'run_js_loaded', 'run_cdp', 'run_cdp_loaded', 'ele', 'eles', 's_ele', 's_eles',
+                   'get_frame', 'get_frames')
+
+    # 返回值可能是 iframe 的调用，iframe 有自己的 Driver，需要一并分析
+    FRAME_METHODS = ('ele', 'eles', 'get_frame', 'get_frames')
+
+    # WebOperator 上记录的操作
+    ACTION_METHODS = ('navigate', 'refresh_page', 'go_back', 'wait_until_ready', 'input_text', 'click_element',
+                      'select_option', 'scroll_to_element', 'wait_for_element', 'is_element_visible',
+                      'run_batch', 'capture_screenshot')
+
+    # 包含 CDP 往返的类别，计算步骤中的其他耗时时不重复扣除
+    NESTED_CATEGORIES = ('api', 'action', 'extract')
+
+    # 使用模块级 sleep 的模块
+    SLEEP_MODULES = ('web_operator', 'captcha_solver')
+
+    # 工具 / 浏览器层的模块，用于确定调用归属的工具
+    TOOL_PACKAGES = ('tools', 'browser', 'prebuilt')
+
+    # sleep 替换的引用计数（多个分析器共享一次替换）
+    _sleep_lock = threading.Lock()
+    _sleep_users = 0
+    _sleep_originals = {}
+    _sleep_profilers = []
+
+    def __init__(self, measure_payload=True, max_events=200000):
+        """
+        初始化分析器
+
+        Args:
+            measure_payload: 是否记录 CDP 请求 / 响应的 JSON 字节数（需要序列化一次，大响应时有额外开销）
+            max_events: 最多保留的记录数，超出后丢弃新记录
+        """
+        self.measure_payload = measure_payload
+        self.max_events = max_events
+        self.events = []
+        self.dropped = 0
+        self._origin = perf_counter_ns()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._patched = []
+        self._threads = {}
+        self._step_count = 0
+        self._uses_sleep = False
+
+    # ========== 挂载 ==========
+
+    def attach(self, operator):
+        """
+        分析 WebOperator 的页面、操作和固定等待
+
+        Args:
+            operator: WebOperator 实例（open_tab() 返回的标签页同样适用）
+
+        Returns:
+            self
+        """
+        self.instrument(operator, self.ACTION_METHODS, 'action', owner=operator)
+        self.instrument_page(operator.page, owner=operator)
+        if not self._uses_sleep:
+            self._patch_sleep()
+            self._uses_sleep = True
+        return self
+
+    def instrument_page(self, page, owner=None):
+        """
+        分析页面对象（或 iframe）的 Driver 和 API 调用（重复调用无副作用）
+
+        Args:
+            page: DrissionPage 的页面 / 标签页 / iframe 对象
+            owner: 可选，所属的 WebOperator（detach(owner) 时一并恢复）
+        """
+        driver = getattr(page, 'driver', None)
+        if driver is not None:
+            self._wrap(driver, 'run', self._cdp_wrapper, owner)
+        for name in self.API_METHODS:
+            if hasattr(page, name):
+                self._wrap(page, name, lambda original, name=name: self._api_wrapper(original, name, owner), owner)
+
+    def instrument(self, obj, methods, category='action', owner=None):
+        """
+        记录任意对象的方法调用（如 PageExtractor.extract_elements）
+
+        Args:
+            obj: 对象
+            methods: 方法名列表
+            category: 记录类别
+            owner: 可选，所属的 WebOperator（detach(owner) 时一并恢复）
+        """
+        label = type(obj).__name__
+        for name in methods:
+            if hasattr(obj, name):
+                self._wrap(obj, name, lambda original, name=name: self._span_wrapper(
+                    original, f'{label}.{name}', category), owner)
+
+    def _wrap(self, obj, name, factory, owner=None):
+        current = obj.__dict__.get(name)
+        if current is not None and getattr(current, '__profiler__', None) is self:
+            return
+        original = getattr(obj, name)
+        wrapper = factory(original)
+        wrapper.__profiler__ = self
+        setattr(obj, name, wrapper)
+        self._patched.append((obj, name, wrapper, owner))
+
+    def detach(self, operator=None):
+        """
+        恢复被替换的方法
+
+        Args:
+            operator: 只恢复该 WebOperator（及其页面）；None 恢复全部
+        """
+        remaining = []
+        for obj, name, wrapper, owner in self._patched:
+            if operator is not None and owner is not operator:
+                remaining.append((obj, name, wrapper, owner))
+                continue
+            if obj.__dict__.get(name) is wrapper:
+                delattr(obj, name)
+        self._patched = remaining
+        if not remaining and self._uses_sleep:
+            self._restore_sleep()
+            self._uses_sleep = False
+
+    def _patch_sleep(self):
+        cls = CDPProfiler
+        with cls._sleep_lock:
+            cls._sleep_profilers.append(self)
+            cls._sleep_users += 1
+            if cls._sleep_users > 1:
+                return
+            package = __name__.rsplit('.', 1)[0]
+            for name in cls.SLEEP_MODULES:
+                try:
+                    module = importlib.import_module(f'{package}.{name}')
+                except Exception as e:
+                    logger.debug(f"无法分析 {name} 的固定等待: {e}")
+                    continue
+                original = module.sleep
+                cls._sleep_originals[module] = original
+
+                def sleep(seconds, original=original):
+                    start = perf_counter_ns()
+                    try:
+                        original(seconds)
+                    finally:
+                        for profiler in list(cls._sleep_profilers):
+                            profiler._record('sleep', 'sleep', start, {'seconds': seconds})
+
+                module.sleep = sleep
+
+    def _restore_sleep(self):
+        cls = CDPProfiler
+        with cls._sleep_lock:
+            if self in cls._sleep_profilers:
+                cls._sleep_profilers.remove(self)
+            cls._sleep_users -= 1
+            if cls._sleep_users > 0:
+                return
+            for module, original in cls._sleep_originals.items():
+                module.sleep = original
+            cls._sleep_originals = {}
+
+    # ========== 包装 ==========
+
+    def _cdp_wrapper(self, original):
+        def run(_method, *args, **kwargs):
+            start = perf_counter_ns()
+            result = original(_method, *args, **kwargs)
+            args_info = {}
+            if isinstance(result, dict) and 'error' in result and 'type' in result:
+                args_info['error'] = str(result['error'])[:200]
+            if self.measure_payload:
+                params = {k: v for k, v in kwargs.items() if not k.startswith('_')}
+                args_info['bytes_out'] = self._size(params)
+                args_info['bytes_in'] = self._size(result)
+            self._record('cdp', _method, start, args_info)
+            return result
+        return run
+
+    def _api_wrapper(self, original, name, owner):
+        def call(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                result = original(*args, **kwargs)
+            except Exception as e:
+                self._record('api', name, start, {'error': str(e)[:200]})
+                raise
+            self._record('api', name, start, {})
+            if name in self.FRAME_METHODS:
+                self._instrument_frames(result, owner)
+            return result
+        return call
+
+    def _span_wrapper(self, original, label, category):
+        def call(*args, **kwargs):
+            with self.span(label, category):
+                return original(*args, **kwargs)
+        return call
+
+    def _instrument_frames(self, result, owner):
+        for item in result if isinstance(result, list) else (result,):
+            if getattr(item, '_type', None) == 'ChromiumFrame':
+                self.instrument_page(item, owner)
+
+    @staticmethod
+    def _size(value):
+        try:
+            return len(json.dumps(value, ensure_ascii=False, default=str).encode('utf-8'))
+        except Exception:
+            return 0
+
+    # ========== 记录 ==========
+
+    @contextmanager
+    def step(self, name):
+        """
+        标记一个步骤（如一次工具调用），期间当前线程的记录都归属于该步骤
+
+        Args:
+            name: 步骤名称
+        """
+        stack = self._steps()
+        index = self._next_step_index()
+        stack.append((index, name))
+        start = perf_counter_ns()
+        try:
+            yield
+        finally:
+            stack.pop()
+            self._record('step', name, start, {'step_index': index}, step=(index, name))
+
+    @contextmanager
+    def span(self, name, category='llm'):
+        """
+        手动记录一段耗时（如 LLM 调用）
+
+        Args:
+            name: 名称
+            category: 类别
+        """
+        start = perf_counter_ns()
+        try:
+            yield
+        finally:
+            self._record(category, name, start, {})
+
+    def _steps(self):
+        if not hasattr(self._local, 'steps'):
+            self._local.steps = []
+        return self._local.steps
+
+    def _next_step_index(self):
+        with self._lock:
+            self._step_count += 1
+            return self._step_count
+
+    def _record(self, category, name, start, args, step=None):
+        end = perf_counter_ns()
+        if step is None:
+            stack = self._steps()
+            step = stack[-1] if stack else None
+        caller, tool = self._attribute()
+        thread = threading.current_thread()
+        event = {
+            'cat': category, 'name': name, 'start': start - self._origin, 'dur': end - start,
+            'tid': thread.ident, 'step': step, 'caller': caller, 'tool': tool, **args,
+        }
+        with self._lock:
+            self._threads.setdefault(thread.ident, thread.name)
+            if len(self.events) >= self.max_events:
+                self.dropped += 1
+                return
+            self.events.append(event)
+
+    @staticmethod
+    def _attribute():
+        """调用栈中最近的项目方法和最外层的工具 / 浏览器方法"""
+        caller = tool = None
+        frame = sys._getframe(2)
+        while frame is not None:
+            module = frame.f_globals.get('__name__', '')
+            if module.startswith(_PACKAGE) and module != __name__:
+                name = frame.f_code.co_qualname
+                if '<' not in name:
+                    caller = caller or name
+                    parts = module.split('.')
+                    if len(parts) > 1 and parts[-2] in CDPProfiler.TOOL_PACKAGES:
+                        tool = name
+            frame = frame.f_back
+        return caller, tool
+
+    def reset(self):
+        """清空记录"""
+        with self._lock:
+            self.events = []
+            self.dropped = 0
+
+    # ========== 报告 ==========
+
+    def report(self, top=10):
+        """
+        按步骤汇总
+
+        Args:
+            top: 每个步骤列出的调用方 / CDP 方法数
+
+        Returns:
+            {'steps': [{'name', 'wall_ms', 'cdp': {'calls', 'ms', 'bytes_out', 'bytes_in'},
+                        'api' / 'action' / 'sleep' / 其他类别: {'calls', 'ms'}, 'other_ms',
+                        'callers': [{'caller', 'calls', 'ms'}], 'methods': [{'method', 'calls', 'ms', 'bytes_in'}]}],
+             'total': 所有记录的汇总（格式同上，没有 wall_ms / other_ms）, 'dropped': 丢弃的记录数}
+            不在任何步骤中的记录归入名为 None 的步骤
+        """
+        with self._lock:
+            events = list(self.events)
+        groups = defaultdict(list)
+        walls = {}
+        for event in events:
+            if event['cat'] == 'step':
+                walls[event['step']] = event['dur']
+            else:
+                groups[event['step']].append(event)
+        steps = []
+        for key in sorted(set(groups) | set(walls), key=lambda k: (k is None, k[0] if k else 0)):
+            summary = self._summarize(groups.get(key, []), top)
+            summary['name'] = key[1] if key else None
+            if key in walls:
+                summary['wall_ms'] = round(walls[key] / 1e6, 2)
+                exclusive = sum(v['ms'] for cat, v in summary['categories'].items() if cat not in self.NESTED_CATEGORIES)
+                summary['other_ms'] = round(max(0.0, summary['wall_ms'] - exclusive), 2)
+            steps.append(summary)
+        return {'steps': steps, 'total': self._summarize(events, top, with_steps=False), 'dropped': self.dropped}
+
+    @staticmethod
+    def _summarize(events, top, with_steps=True):
+        categories = defaultdict(lambda: {'calls': 0, 'ms': 0.0})
+        callers = defaultdict(lambda: {'calls': 0, 'ns': 0})
+        methods = defaultdict(lambda: {'calls': 0, 'ns': 0, 'bytes_in': 0})
+        bytes_out = bytes_in = 0
+        for event in events:
+            if event['cat'] == 'step':
+                continue
+            category = categories[event['cat']]
+            category['calls'] += 1
+            category['ms'] += event['dur'] / 1e6
+            if event['cat'] == 'cdp':
+                bytes_out += event.get('bytes_out', 0)
+                bytes_in += event.get('bytes_in', 0)
+                caller = callers[event['caller'] or '(外部)']
+                caller['calls'] += 1
+                caller['ns'] += event['dur']
+                method = methods[event['name']]
+                method['calls'] += 1
+                method['ns'] += event['dur']
+                method['bytes_in'] += event.get('bytes_in', 0)
+        for category in categories.values():
+            category['ms'] = round(category['ms'], 2)
+        if 'cdp' in categories:
+            categories['cdp'].update(bytes_out=bytes_out, bytes_in=bytes_in)
+
+        def ranked(items):
+            return sorted(items.items(), key=lambda item: -item[1]['ns'])[:top]
+
+        return {
+            'categories': dict(categories),
+            'callers': [{'caller': name, 'calls': v['calls'], 'ms': round(v['ns'] / 1e6, 2)}
+                        for name, v in ranked(callers)],
+            'methods': [{'method': name, 'calls': v['calls'], 'ms': round(v['ns'] / 1e6, 2), 'bytes_in': v['bytes_in']}
+                        for name, v in ranked(methods)],
+        }
+
+    def format_report(self, top=5):
+        """
+        报告的文本形式
+
+        Args:
+            top: 每个步骤列出的调用方 / CDP 方法数
+
+        Returns:
+            多行描述字符串
+        """
+        report = self.report(top)
+        if not report['steps']:
+            return "没有记录"
+        lines = []
+        for step in report['steps']:
+            categories = step['categories']
+            cdp = categories.get('cdp', {'calls': 0, 'ms': 0, 'bytes_out': 0, 'bytes_in': 0})
+            title = step['name'] if step['name'] is not None else '(步骤外)'
+            if 'wall_ms' in step:
+                title += f" - 总耗时 {step['wall_ms']} ms，其他（Python / 等待外部）{step['other_ms']} ms"
+            lines.append(title)
+            lines.append(f"  CDP 往返 {cdp['calls']} 次 {cdp['ms']} ms（发送 {cdp['bytes_out']} B / 接收 {cdp['bytes_in']} B）")
+            for name, value in categories.items():
+                if name != 'cdp':
+                    lines.append(f"  {name}: {value['calls']} 次 {value['ms']} ms")
+            for caller in step['callers']:
+                lines.append(f"  ↳ {caller['caller']}: {caller['calls']} 次往返 {caller['ms']} ms")
+            for method in step['methods']:
+                lines.append(f"  · {method['method']}: {method['calls']} 次 {method['ms']} ms，接收 {method['bytes_in']} B")
+        if report['dropped']:
+            lines.append(f"（超出记录上限，丢弃 {report['dropped']} 条）")
+        return '\n'.join(lines)
+
+    def export_trace(self, path):
+        """
+        导出 Chrome trace-event JSON
+
+        Args:
+            path: 文件路径
+
+        Returns:
+            是否成功
+        """
+        pid = os.getpid()
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self._threads)
+        trace = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                 for tid, name in threads.items()]
+        for event in events:
+            args = {key: value for key, value in event.items()
+                    if key not in ('cat', 'name', 'start', 'dur', 'tid', 'step') and value is not None}
+            trace.append({
+                'name': event['name'], 'cat': event['cat'], 'ph': 'X', 'pid': pid, 'tid': event['tid'],
+                'ts': event['start'] / 1000, 'dur': event['dur'] / 1000, 'args': args,
+            })
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+            logger.success(f"✅ trace 已保存: {path}（{len(trace)} 条）")
+            return True
+        except Exception as e:
+            logger.error(f"❌ 保存 trace 失败: {e}")
+            return False
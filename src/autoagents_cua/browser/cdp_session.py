@@ -0,0 +1,153 @@
+import threading
+from ..utils.logging import logger
+
+
+
+class CDPSession:
+    """
+    专用 CDP 会话 - 为页面单独建立一条 CDP 连接并支持同一事件的多个订阅者
+
+    DrissionPage 的 Driver 每个事件只能注册一个回调，且页面自身的 Driver 已经占用了
+    Page.* 生命周期事件。这里参照 DrissionPage Listener 的做法，新建一个 Driver 并以
+    flatten 模式附加到同一个 target，事件在该 Driver 自己的线程中分发，不影响页面对象。
+    """
+
+    def __init__(self, page):
+        """
+        初始化 CDP 会话（调用 start() 后才建立连接）
+
+        Args:
+            page: DrissionPage 的页面对象
+        """
+        self.page = page
+        self._driver = None
+        self._handlers = {}
+        self._enabled = set()
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self):
+        """会话是否已连接"""
+        return self._driver is not None and self._driver.is_running
+
+    def start(self):
+        """
+        建立连接并附加到页面 target（重复调用无副作用）
+
+        Returns:
+            是否成功
+        """
+        if self.is_running:
+            return True
+        try:
+            # DrissionPage 没有公开 Driver，Listener 也是这样创建独立连接的
+            from DrissionPage._base.driver import Driver
+            target_id = self.page._target_id
+            driver = Driver(target_id, self.page.browser._ws_address)
+            result = driver.run('Target.attachToTarget', targetId=target_id, flatten=True)
+            if 'sessionId' not in result:
+                driver.stop()
+                raise RuntimeError(result.get('error', result))
+            driver.session_id = result['sessionId']
+            self._driver = driver
+            self._enabled = set()
+            # 重新连接时恢复已有的订阅
+            for event in self._handlers:
+                driver.set_callback(event, self._dispatcher(event))
+            logger.debug(f"CDP 会话已附加到 target {target_id}")
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️  CDP 会话创建失败: {e}")
+            self._driver = None
+            return False
+
+    def run(self, method, **kwargs):
+        """
+        在该会话上执行 CDP 命令
+
+        Args:
+            method: CDP 方法名，如 'Network.enable'
+            **kwargs: 命令参数（_timeout 为超时时间，秒）
+
+        Returns:
+            命令返回值
+
+        Raises:
+            RuntimeError: 会话未连接或命令执行失败
+        """
+        if not self.is_running:
+            raise RuntimeError(f"CDP 会话未连接: {method}")
+        result = self._driver.run(method, **kwargs)
+        if isinstance(result, dict) and 'error' in result and 'type' in result:
+            raise RuntimeError(f"{method} 执行失败: {result['error']}")
+        return result
+
+    def enable(self, domain, **kwargs):
+        """
+        启用 CDP 域（每个会话只启用一次）
+
+        Args:
+            domain: 域名，如 'Network'、'Page'
+            **kwargs: enable 命令参数
+        """
+        with self._lock:
+            if domain in self._enabled:
+                return
+            self._enabled.add(domain)
+        self.run(f'{domain}.enable', **kwargs)
+
+    def on(self, event, callback):
+        """
+        订阅事件（同一事件可以有多个订阅者）
+
+        Args:
+            event: 事件名，如 'Network.requestWillBeSent'
+            callback: 回调函数，参数为事件的 params 字典
+        """
+        with self._lock:
+            callbacks = self._handlers.setdefault(event, [])
+            first = not callbacks
+            callbacks.append(callback)
+        if first and self._driver is not None:
+            self._driver.set_callback(event, self._dispatcher(event))
+
+    def off(self, event, callback=None):
+        """
+        取消订阅
+
+        Args:
+            event: 事件名
+            callback: 要移除的回调，None 表示移除该事件的所有订阅
+        """
+        with self._lock:
+            callbacks = self._handlers.get(event, [])
+            if callback is None:
+                callbacks.clear()
+            elif callback in callbacks:
+                callbacks.remove(callback)
+            empty = not callbacks
+            if empty:
+                self._handlers.pop(event, None)
+        if empty and self._driver is not None:
+            self._driver.set_callback(event, None)
+
+    def _dispatcher(self, event):
+        def dispatch(**params):
+            with self._lock:
+                callbacks = list(self._handlers.get(event, ()))
+            for callback in callbacks:
+                try:
+                    callback(params)
+                except Exception as e:
+                    logger.debug(f"CDP 事件回调失败 {event}: {e}")
+        return dispatch
+
+    def close(self):
+        """断开连接（订阅保留，再次 start() 后恢复）"""
+        if self._driver is not None:
+            try:
+                self._driver.stop()
+            except Exception as e:
+                logger.debug(f"关闭 CDP 会话失败: {e}")
+            self._driver = None
+            self._enabled = set()
@@ -0,0 +1,118 @@
+from ..utils.logging import logger
+
+
+
+class ElementHandle:
+    """
+    惰性元素句柄 - 只有在工具真正操作元素时才解析出 DrissionPage 元素对象
+
+    提取脚本会给每个元素打上 data-extractor-index 标记，句柄通过该标记
+    精确定位元素，避免提取阶段对每个元素单独调用 page.ele()。
+    位于开放 Shadow DOM 或同源 iframe 中的元素会带有 host 路径，
+    解析时沿路径上的 data-extractor-host 标记逐层进入。
+    由 DOMSnapshot / 可访问性树引擎提取的元素没有标记，直接通过 backendNodeId 解析。
+    """
+
+    MARKER_ATTR = 'data-extractor-index'
+    HOST_ATTR = 'data-extractor-host'
+
+    def __init__(self, page, index, selector=None, host_path=None, backend_id=None):
+        """
+        初始化元素句柄
+
+        Args:
+            page: DrissionPage 的页面对象
+            index: 提取时分配的元素索引（与 data-extractor-index 一致）
+            selector: 可选，DrissionPage 定位字符串，标记失效时作为降级方案
+            host_path: 可选，从顶层文档到元素的 host 路径，
+                格式: [{'type': 'shadow' | 'frame', 'id': 1}, ...]
+            backend_id: 可选，CDP backendNodeId（快照类引擎提取的元素）
+        """
+        self.page = page
+        self.index = index
+        self.selector = selector
+        self.host_path = host_path or []
+        self.backend_id = backend_id
+        self._element = None
+
+    @property
+    def locator(self):
+        """基于 data-extractor-index 标记的定位字符串"""
+        return f'css:[{self.MARKER_ATTR}="{self.index}"]'
+
+    def resolve(self, timeout=0.5, refresh=False):
+        """
+        解析出 DrissionPage 元素对象（结果会被缓存）
+
+        Args:
+            timeout: 查找超时时间（秒）
+            refresh: 是否忽略缓存重新查找
+
+        Returns:
+            元素对象，未找到返回 None
+        """
+        if self._element is not None and not refresh:
+            return self._element
+
+        element = None
+        try:
+            if self.backend_id is not None:
+                element = self._resolve_backend_id()
+            else:
+                scope = self._resolve_scope(timeout)
+                if scope is not None:
+                    element = scope.ele(self.locator, timeout=timeout)
+            # 定位字符串只在顶层文档中有效
+            if not element and self.selector and not self.host_path:
+                logger.debug(f"索引标记 [{self.index}] 已失效，使用定位器降级查找: {self.selector}")
+                element = self.page.ele(self.selector, timeout=timeout)
+        except Exception as e:
+            logger.debug(f"解析元素句柄 [{self.index}] 失败: {e}")
+
+        self._element = element if element else None
+        return self._element
+
+    def _resolve_backend_id(self):
+        """通过 backendNodeId 创建元素对象（节点已被移除时返回 None）"""
+        from DrissionPage.items import ChromiumElement
+        try:
+            return ChromiumElement(self.page, backend_id=self.backend_id)
+        except Exception as e:
+            logger.debug(f"元素句柄 [{self.index}] 的 backendNodeId={self.backend_id} 已失效: {e}")
+            return None
+
+    def _resolve_scope(self, timeout):
+        """
+        沿 host 路径进入元素所在的查找范围
+
+        Returns:
+            页面 / ShadowRoot / ChromiumFrame 对象，路径失效时返回 None
+        """
+        scope = self.page
+        for hop in self.host_path:
+            host = scope.ele(f'css:[{self.HOST_ATTR}="{hop["id"]}"]', timeout=timeout)
+            if not host:
+                logger.debug(f"元素句柄 [{self.index}] 的 host 路径已失效: {hop}")
+                return None
+            # iframe 元素会被 DrissionPage 直接返回为 ChromiumFrame
+            scope = host.shadow_root if hop['type'] == 'shadow' else host
+            if not scope:
+                return None
+        return scope
+
+    def reset(self):
+        """清除缓存的元素对象"""
+        self._element = None
+
+    @property
+    def is_resolved(self):
+        """是否已经解析过元素对象"""
+        return self._element is not None
+
+    def __repr__(self):
+        if self.backend_id is not None:
+            return f"ElementHandle(index={self.index}, backend_id={self.backend_id}, selector={self.selector!r})"
+        if self.host_path:
+            path = '/'.join(f"{hop['type']}:{hop['id']}" for hop in self.host_path)
+            return f"ElementHandle(index={self.index}, host_path={path!r}, selector={self.selector!r})"
+        return f"ElementHandle(index={self.index}, selector={self.selector!r})"
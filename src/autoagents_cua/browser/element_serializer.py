@@ -0,0 +1,268 @@
+import re
+from urllib.parse import urlsplit
+
+
+
+class ElementSerializer:
+    """
+    元素序列化器 - 在 token 预算内按相关度输出元素表格（专用于喂给大模型）
+
+    按可见性、视口位置、元素类型和与当前指令的文本重合度给元素打分，
+    合并文本和链接相同的重复链接，输出 "index|tag|text|attrs" 紧凑表格；
+    超出预算的元素通过游标分页，由 more_page_elements 工具继续查看。
+    """
+
+    # 默认每次输出的 token 预算
+    DEFAULT_MAX_TOKENS = 1500
+
+    # 输出的属性（按顺序，class 等噪声属性不输出）
+    COMPACT_ATTRS = ('id', 'name', 'type', 'role', 'placeholder', 'aria-label', 'title', 'value', 'href')
+
+    # 参与文本匹配的属性
+    LABEL_ATTRS = ('placeholder', 'aria-label', 'title', 'name', 'id', 'value')
+
+    # 元素类型权重（输入类元素通常是任务的关键）
+    TAG_WEIGHTS = {
+        'input': 2.0,
+        'textarea': 2.0,
+        'select': 1.8,
+        'button': 1.5,
+        'a': 0.6,
+    }
+    ROLE_WEIGHTS = {
+        'button': 1.2,
+        'textbox': 1.8,
+        'searchbox': 1.8,
+        'combobox': 1.5,
+        'checkbox': 1.0,
+        'tab': 0.8,
+        'menuitem': 0.8,
+        'link': 0.5,
+    }
+    DEFAULT_WEIGHT = 0.3
+
+    # 单个属性值 / 文本的最大长度
+    MAX_TEXT = 40
+    MAX_ATTR = 40
+    MAX_HREF = 60
+
+    _ASCII_WORD = re.compile(r'[a-z]{2,}|[0-9]+')
+    _CJK_RUN = re.compile(r'[一-鿿]+')
+
+    def __init__(self, max_tokens=DEFAULT_MAX_TOKENS):
+        """
+        初始化元素序列化器
+
+        Args:
+            max_tokens: 每次输出的 token 预算
+        """
+        self.max_tokens = max_tokens
+        # 最近一次排序结果，供游标分页使用
+        self._ranked = []
+        self._duplicates = 0
+        self._query = None
+
+    # ========== 打分 ==========
+
+    @staticmethod
+    def estimate_tokens(text):
+        """
+        粗略估算 token 数（ASCII 约 4 字符 1 token，其余字符按 1 token 计）
+
+        Args:
+            text: 文本
+
+        Returns:
+            估算的 token 数
+        """
+        ascii_count = sum(1 for ch in text if ord(ch) < 128)
+        return (ascii_count + 3) // 4 + (len(text) - ascii_count)
+
+    @classmethod
+    def terms(cls, text):
+        """
+        切分文本为匹配词（英文单词 + 中文二元组）
+
+        Args:
+            text: 文本
+
+        Returns:
+            词集合
+        """
+        if not text:
+            return set()
+        text = text.lower()
+        result = set(cls._ASCII_WORD.findall(text))
+        for run in cls._CJK_RUN.findall(text):
+            if len(run) == 1:
+                result.add(run)
+            else:
+                result.update(run[i:i + 2] for i in range(len(run) - 1))
+        return result
+
+    def score(self, record, query_terms=None, viewport=None):
+        """
+        计算元素的相关度分数
+
+        Args:
+            record: ElementRecord
+            query_terms: 当前指令切分出的词集合
+            viewport: 视口信息 {'width', 'height', ...}
+
+        Returns:
+            分数（越大越靠前）
+        """
+        attrs = record.attrs
+        score = self.TAG_WEIGHTS.get(record.tag, self.DEFAULT_WEIGHT)
+        score += self.ROLE_WEIGHTS.get(attrs.get('role'), 0)
+
+        # 可见性和视口位置：视口内的元素优先，越靠上分数越高
+        in_viewport = getattr(record, 'in_viewport', None)
+        rect = getattr(record, 'rect', None)
+        if in_viewport:
+            score += 3.0
+        if rect and viewport and viewport.get('height'):
+            y = max(rect[1], 0) / viewport['height']
+            score += max(0.0, 1.5 - y * 0.5)
+
+        # 与当前指令的文本重合度
+        if query_terms:
+            label = ' '.join([record.text or ''] + [str(attrs.get(attr, '')) for attr in self.LABEL_ATTRS])
+            overlap = len(query_terms & self.terms(label))
+            if overlap:
+                score += 2.0 + 4.0 * overlap / len(query_terms)
+
+        # 没有任何可读标签的元素难以被模型使用
+        if not record.text and not any(attrs.get(attr) for attr in self.LABEL_ATTRS):
+            score -= 1.0
+        return score
+
+    def _dedupe_key(self, record):
+        """重复链接的判定键（文本 + 去掉查询参数的链接），非链接返回 None"""
+        href = record.attrs.get('href')
+        if record.tag != 'a' or not href:
+            return None
+        parts = urlsplit(href)
+        text = ' '.join((record.text or '').lower().split())
+        return (text, parts.netloc, parts.path.rstrip('/'))
+
+    def rank(self, records, query=None, viewport=None):
+        """
+        按相关度排序并合并重复链接
+
+        Args:
+            records: ElementRecord 可迭代对象
+            query: 当前指令或关注点
+            viewport: 视口信息
+
+        Returns:
+            (排序后的记录列表, 被合并的重复元素数)
+        """
+        query_terms = self.terms(query)
+        scored = [(self.score(record, query_terms, viewport), record) for record in records]
+        # 分数相同时保持页面顺序
+        scored.sort(key=lambda item: (-item[0], item[1].index))
+
+        ranked, seen, duplicates = [], set(), 0
+        for _, record in scored:
+            key = self._dedupe_key(record)
+            if key is not None:
+                if key in seen:
+                    duplicates += 1
+                    continue
+                seen.add(key)
+            ranked.append(record)
+        return ranked, duplicates
+
+    # ========== 输出 ==========
+
+    @staticmethod
+    def _clean(value, limit):
+        value = ' '.join(str(value).split()).replace('|', '/')
+        return value if len(value) <= limit else value[:limit] + '…'
+
+    def format_row(self, record):
+        """
+        格式化单个元素为表格行
+
+        Args:
+            record: ElementRecord
+
+        Returns:
+            "index|tag|text|attrs" 字符串
+        """
+        attrs = []
+        for attr in self.COMPACT_ATTRS:
+            value = record.attrs.get(attr)
+            # 密码框的值不输出给模型
+            if not value or (attr == 'value' and record.attrs.get('type') == 'password'):
+                continue
+            if attr == 'href':
+                parts = urlsplit(value)
+                # 去掉协议和查询参数，只保留域名和路径
+                if parts.scheme in ('http', 'https'):
+                    value = parts.netloc + parts.path
+                value = self._clean(value, self.MAX_HREF)
+            else:
+                value = self._clean(value, self.MAX_ATTR)
+            attrs.append(f"{attr}={value}")
+        text = self._clean(record.text, self.MAX_TEXT) if record.text else ''
+        return f"{record.index}|{record.tag}|{text}|{' '.join(attrs)}"
+
+    def serialize(self, records, query=None, viewport=None, max_tokens=None):
+        """
+        重新排序并输出第一页
+
+        Args:
+            records: ElementRecord 可迭代对象（通常是 ElementTable）
+            query: 当前指令或关注点，用于文本相关度排序
+            viewport: 视口信息
+            max_tokens: 本次 token 预算，None 时使用初始化时的设置
+
+        Returns:
+            (文本, 下一页游标)，没有更多元素时游标为 None
+        """
+        self._ranked, self._duplicates = self.rank(records, query, viewport)
+        self._query = query
+        return self.more(0, max_tokens)
+
+    def more(self, cursor=0, max_tokens=None):
+        """
+        从最近一次排序结果中输出一页
+
+        Args:
+            cursor: 起始位置（上一页返回的游标）
+            max_tokens: 本次 token 预算
+
+        Returns:
+            (文本, 下一页游标)，没有更多元素时游标为 None
+        """
+        budget = max_tokens or self.max_tokens
+        total = len(self._ranked)
+        cursor = max(0, min(int(cursor), total))
+
+        header = "index|tag|text|attrs"
+        rows, used, position = [], self.estimate_tokens(header) + 40, cursor
+        while position < total:
+            row = self.format_row(self._ranked[position])
+            cost = self.estimate_tokens(row) + 1
+            # 至少输出一行，避免预算过小时无法翻页
+            if rows and used + cost > budget:
+                break
+            rows.append(row)
+            used += cost
+            position += 1
+
+        if total == 0:
+            return "❌ 没有可显示的元素", None
+        if cursor >= total:
+            return f"没有更多元素（共 {total} 个，均已显示）", None
+
+        order = "按与指令的相关度排序" if self._query else "按可见性和位置排序"
+        lines = [f"元素 {cursor + 1}-{position} / 共 {total} 个（{order}）", header] + rows
+        if self._duplicates and cursor == 0:
+            lines.append(f"（已合并 {self._duplicates} 个重复链接）")
+        next_cursor = position if position < total else None
+        if next_cursor is not None:
+            lines.append(f"还有 {total - position} 个元素未显示，调用 more_page_elements(cursor={position}) 查看")
+        return "\n".join(lines), next_cursor
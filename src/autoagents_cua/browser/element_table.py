@@ -0,0 +1,274 @@
+from itertools import islice
+from .element_handle import ElementHandle
+
+
+
+class ElementRecord:
+    """
+    提取到的单个元素记录（__slots__，不持有 DrissionPage 元素对象）
+
+    兼容原来的 dict 访问方式：record['index']、record.get('attrs', {})；
+    record['element'] 为惰性创建的 ElementHandle。与 dict 一致，值为 None 的可选字段（如 rect、backend_id）
+    视为不存在：'rect' in record 为 False，record.get('rect', default) 返回 default。
+    """
+
+    __slots__ = ('index', 'tag', 'selector', 'text', 'attrs', 'host_path', 'rect', 'in_viewport', 'backend_id',
+                 '_page', '_element')
+
+    KEYS = ('index', 'tag', 'selector', 'text', 'attrs', 'host_path', 'rect', 'in_viewport', 'backend_id', 'element')
+
+    def __init__(self, page, index, tag, selector, text='', attrs=None, host_path=None, element=None,
+                 rect=None, in_viewport=None, backend_id=None):
+        """
+        初始化元素记录
+
+        Args:
+            page: DrissionPage 的页面对象（用于创建元素句柄）
+            index: 元素索引
+            tag: 标签名
+            selector: DrissionPage 定位字符串
+            text: 文本内容
+            attrs: 属性字典
+            host_path: Shadow DOM / iframe 的 host 路径
+            element: 可选，已有的元素对象或句柄（为空时按需创建 ElementHandle）
+            rect: 可选，顶层视口坐标 [x, y, width, height]
+            in_viewport: 可选，提取时元素是否在视口内
+            backend_id: 可选，CDP backendNodeId（快照类引擎提取的元素）
+        """
+        self.index = index
+        self.tag = tag
+        self.selector = selector
+        self.text = text
+        self.attrs = attrs or {}
+        self.host_path = host_path or []
+        self.rect = rect
+        self.in_viewport = in_viewport
+        self.backend_id = backend_id
+        self._page = page
+        self._element = element
+
+    @property
+    def element(self):
+        """元素句柄（首次访问时才创建）"""
+        if self._element is None:
+            self._element = ElementHandle(self._page, self.index, self.selector, self.host_path, self.backend_id)
+        return self._element
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        if key not in self.KEYS:
+            return default
+        value = getattr(self, key)
+        return default if value is None else value
+
+    def __contains__(self, key):
+        # element 句柄总是可以按需创建
+        return key in self.KEYS and (key == 'element' or getattr(self, key) is not None)
+
+    def keys(self):
+        return [key for key in self.KEYS if key in self]
+
+    def to_dict(self):
+        """转换为普通字典"""
+        return {key: getattr(self, key) for key in self.KEYS}
+
+    def __repr__(self):
+        return f"ElementRecord(index={self.index}, tag={self.tag!r}, text={self.text[:20]!r})"
+
+
+class ElementTable:
+    """
+    元素表 - 按索引、标签、id、name 建立哈希索引的元素集合
+
+    PageExtractor 和工具函数共享同一张表，按索引 / 标签 / 属性查找都是 O(1)，
+    迭代顺序始终按元素索引递增。table[index]、index in table、table.get(index) 都按元素索引，
+    按位置访问使用 table.at(position)。
+    """
+
+    # 建立哈希索引的属性
+    INDEXED_ATTRS = ('id', 'name')
+
+    def __init__(self):
+        """初始化元素表"""
+        self._records = {}
+        self._by_tag = {}
+        self._by_attr = {attr: {} for attr in self.INDEXED_ATTRS}
+
+    # ========== 写入 ==========
+
+    def load(self, records):
+        """
+        用一组记录替换整张表
+
+        Args:
+            records: ElementRecord 列表
+        """
+        self.clear()
+        for record in records:
+            self._insert(record)
+
+    def upsert(self, record):
+        """
+        插入或替换记录（同索引的旧记录会被替换）
+
+        Args:
+            record: ElementRecord
+        """
+        old = self._records.get(record.index)
+        if old is not None:
+            self._unindex(old)
+            self._records[record.index] = record
+            self._index(record)
+        else:
+            self._insert(record)
+
+    def remove(self, index):
+        """
+        移除指定索引的记录
+
+        Args:
+            index: 元素索引
+
+        Returns:
+            被移除的记录，不存在时返回 None
+        """
+        record = self._records.pop(index, None)
+        if record is not None:
+            self._unindex(record)
+        return record
+
+    def clear(self):
+        """清空元素表"""
+        self._records = {}
+        self._by_tag = {}
+        self._by_attr = {attr: {} for attr in self.INDEXED_ATTRS}
+
+    def _insert(self, record):
+        # 新索引比现有索引大时直接追加，否则重建顺序（增量提取的新索引总是递增的）
+        needs_sort = bool(self._records) and record.index < next(reversed(self._records))
+        self._records[record.index] = record
+        self._index(record)
+        if needs_sort:
+            self._records = dict(sorted(self._records.items()))
+
+    def _index(self, record):
+        self._by_tag.setdefault(record.tag, {})[record.index] = record
+        for attr in self.INDEXED_ATTRS:
+            value = record.attrs.get(attr)
+            if value:
+                self._by_attr[attr].setdefault(value, {})[record.index] = record
+
+    def _unindex(self, record):
+        bucket = self._by_tag.get(record.tag)
+        if bucket is not None:
+            bucket.pop(record.index, None)
+            if not bucket:
+                del self._by_tag[record.tag]
+        for attr in self.INDEXED_ATTRS:
+            value = record.attrs.get(attr)
+            bucket = self._by_attr[attr].get(value) if value else None
+            if bucket is not None:
+                bucket.pop(record.index, None)
+                if not bucket:
+                    del self._by_attr[attr][value]
+
+    # ========== 查询 ==========
+
+    def get(self, index):
+        """
+        按索引获取记录
+
+        Args:
+            index: 元素索引
+
+        Returns:
+            ElementRecord，不存在时返回 None
+        """
+        return self._records.get(index)
+
+    def by_tag(self, tag):
+        """
+        获取指定标签的所有记录
+
+        Args:
+            tag: 标签名
+
+        Returns:
+            记录列表（按索引排序）
+        """
+        bucket = self._by_tag.get(tag)
+        return sorted(bucket.values(), key=lambda r: r.index) if bucket else []
+
+    def by_attr(self, attr, value):
+        """
+        按属性值查找记录（id / name 走哈希索引，其余属性线性扫描）
+
+        Args:
+            attr: 属性名
+            value: 属性值
+
+        Returns:
+            记录列表（按索引排序）
+        """
+        if attr in self._by_attr:
+            bucket = self._by_attr[attr].get(value)
+            return sorted(bucket.values(), key=lambda r: r.index) if bucket else []
+        return [record for record in self._records.values() if record.attrs.get(attr) == value]
+
+    def by_id(self, value):
+        """按 id 属性查找记录"""
+        return self.by_attr('id', value)
+
+    def by_name(self, value):
+        """按 name 属性查找记录"""
+        return self.by_attr('name', value)
+
+    def tags(self):
+        """
+        获取每种标签的元素数量
+
+        Returns:
+            {tag: count} 字典
+        """
+        return {tag: len(bucket) for tag, bucket in self._by_tag.items()}
+
+    def indexes(self):
+        """所有元素索引（递增）"""
+        return list(self._records)
+
+    def __contains__(self, index):
+        return index in self._records
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(list(self._records.values()))
+
+    def __getitem__(self, index):
+        return self._records[index]
+
+    def at(self, position):
+        """
+        按位置获取记录（按元素索引递增排列，支持负数位置）
+
+        Args:
+            position: 位置
+
+        Returns:
+            ElementRecord；位置越界时抛出 IndexError
+        """
+        if position < 0:
+            position += len(self._records)
+        if not 0 <= position < len(self._records):
+            raise IndexError(position)
+        if position == len(self._records) - 1:
+            return self._records[next(reversed(self._records))]
+        return next(islice(self._records.values(), position, None))
+
+    def __repr__(self):
+        return f"ElementTable({len(self._records)} elements)"
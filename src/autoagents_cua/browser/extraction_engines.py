@@ -0,0 +1,337 @@
+from ..utils.logging import logger
+
+
+
+class ExtractionEngine:
+    """
+    元素提取引擎基类
+
+    所有引擎都返回与页面运行时 __cua.extract 相同格式的结果：
+    {'mode': 'full'|'delta', 'added': [...], 'changed': [...], 'removed': [...], 'viewport': {...}}，
+    其中每个元素为 {'index', 'tag', 'text', 'attrs', 'rect', 'inViewport', ...}，
+    PageExtractor 按同样的方式转换为 ElementRecord。
+    """
+
+    name = None
+
+    # 与运行时 ATTRS 一致的属性列表
+    ATTRS = ('id', 'class', 'name', 'type', 'href', 'value', 'placeholder', 'title', 'role', 'aria-label', 'tabindex')
+
+    # 文本内容最大长度（与运行时 textContent.substring(0, 50) 一致）
+    MAX_TEXT = 50
+
+    def __init__(self, page):
+        """
+        初始化提取引擎
+
+        Args:
+            page: DrissionPage 的页面对象
+        """
+        self.page = page
+
+    def extract(self, incremental=False, viewport_only=False):
+        """
+        提取可交互元素
+
+        Args:
+            incremental: 是否增量提取（不支持增量的引擎会忽略该参数）
+            viewport_only: 是否只提取与视口相交的元素
+
+        Returns:
+            提取结果字典
+        """
+        raise NotImplementedError
+
+
+class DOMEngine(ExtractionEngine):
+    """
+    DOM 引擎（默认）- 页面运行时用 CSS 选择器查找候选元素并逐个检查样式
+
+    支持增量提取和开放 Shadow DOM / 同源 iframe，元素通过 data-extractor-index 标记定位。
+    """
+
+    name = 'dom'
+
+    def __init__(self, page, runtime):
+        """
+        初始化 DOM 引擎
+
+        Args:
+            page: DrissionPage 的页面对象
+            runtime: PageRuntime 实例
+        """
+        super().__init__(page)
+        self.runtime = runtime
+
+    def extract(self, incremental=False, viewport_only=False):
+        return self.runtime.call('extract', {'incremental': bool(incremental), 'viewportOnly': bool(viewport_only)})
+
+
+class DOMSnapshotEngine(ExtractionEngine):
+    """
+    DOMSnapshot 引擎 - 一次 DOMSnapshot.captureSnapshot 调用拿到整棵 DOM、布局框和计算样式
+
+    不在页面中执行脚本、也不修改 DOM：可见性来自快照中的布局树和计算样式，
+    文本由后代文本节点拼接，元素通过 backendNodeId 定位。
+    快照天然包含 Shadow DOM 和同进程 iframe；带点击监听器的元素（isClickable）也会被收录。
+    """
+
+    name = 'snapshot'
+
+    # 快照中需要的计算样式（顺序与 layout.styles 中的值一一对应）
+    COMPUTED_STYLES = ('display', 'visibility')
+
+    # 原生可交互标签
+    INTERACTIVE_TAGS = ('button', 'select', 'textarea')
+
+    # 视为可交互的 ARIA 角色
+    INTERACTIVE_ROLES = frozenset((
+        'button', 'link', 'textbox', 'searchbox', 'combobox', 'checkbox', 'radio', 'switch',
+        'menuitem', 'menuitemcheckbox', 'menuitemradio', 'tab', 'option', 'slider', 'spinbutton',
+    ))
+
+    # 节点类型
+    ELEMENT_NODE = 1
+    TEXT_NODE = 3
+
+    def capture(self):
+        """
+        获取 DOM 快照
+
+        Returns:
+            DOMSnapshot.captureSnapshot 的原始返回值
+        """
+        return self.page.run_cdp(
+            'DOMSnapshot.captureSnapshot',
+            computedStyles=list(self.COMPUTED_STYLES),
+            includeDOMRects=False,
+        )
+
+    def viewport(self, snapshot=None):
+        """
+        获取视口信息（与运行时 viewport() 格式一致）
+
+        Args:
+            snapshot: 可选，已获取的快照（用于读取滚动偏移）
+
+        Returns:
+            {'width', 'height', 'scrollX', 'scrollY'}
+        """
+        metrics = self.page.run_cdp('Page.getLayoutMetrics')
+        layout = metrics.get('cssLayoutViewport') or metrics.get('layoutViewport') or {}
+        document = (snapshot or {}).get('documents', [{}])[0]
+        return {
+            'width': layout.get('clientWidth', 0),
+            'height': layout.get('clientHeight', 0),
+            'scrollX': document.get('scrollOffsetX', layout.get('pageX', 0)),
+            'scrollY': document.get('scrollOffsetY', layout.get('pageY', 0)),
+        }
+
+    def extract(self, incremental=False, viewport_only=False):
+        snapshot = self.capture()
+        viewport = self.viewport(snapshot)
+        nodes = self.parse(snapshot, viewport)
+        elements = [node for node in nodes.values() if node['interactive'] and node['visible']]
+        return self._result(elements, viewport, viewport_only)
+
+    def _result(self, elements, viewport, viewport_only=False):
+        """按文档顺序分配索引，生成与运行时一致的结果"""
+        if viewport_only:
+            elements = [node for node in elements if self._in_viewport(node['rect'], viewport)]
+        added = []
+        for index, node in enumerate(elements, start=1):
+            info = {
+                'index': index,
+                'tag': node['tag'],
+                'text': node['text'].strip()[:self.MAX_TEXT],
+                'attrs': {key: value for key, value in node['attrs'].items() if key in self.ATTRS and value},
+                'rect': node['rect'],
+                'inViewport': self._in_viewport(node['rect'], viewport),
+                'backendId': node['backend_id'],
+            }
+            added.append(info)
+        return {'mode': 'full', 'added': added, 'changed': [], 'removed': [], 'viewport': viewport}
+
+    @staticmethod
+    def _in_viewport(rect, viewport):
+        x, y, width, height = rect
+        return x < viewport['width'] and y < viewport['height'] and x + width > 0 and y + height > 0
+
+    def parse(self, snapshot, viewport):
+        """
+        解析快照中的元素节点
+
+        Args:
+            snapshot: DOMSnapshot.captureSnapshot 的返回值
+            viewport: 视口信息
+
+        Returns:
+            {backendNodeId: 节点信息} 字典（按文档顺序），节点信息包含
+            tag、attrs、text、rect（顶层视口坐标）、visible、interactive、backend_id
+        """
+        strings = snapshot.get('strings', [])
+        documents = snapshot.get('documents', [])
+        result = {}
+
+        # iframe 文档相对顶层视口的偏移（先处理父文档，再处理子文档）
+        offsets = {0: (-viewport['scrollX'], -viewport['scrollY'])}
+        for doc_index, document in enumerate(documents):
+            if doc_index not in offsets:
+                continue
+            self._parse_document(documents, doc_index, strings, offsets, result)
+        return result
+
+    def _parse_document(self, documents, doc_index, strings, offsets, result):
+        document = documents[doc_index]
+        nodes = document['nodes']
+        layout = document.get('layout', {})
+        parents = nodes.get('parentIndex', [])
+        types = nodes.get('nodeType', [])
+        names = nodes.get('nodeName', [])
+        values = nodes.get('nodeValue', [])
+        backend_ids = nodes.get('backendNodeId', [])
+        attributes = nodes.get('attributes', [])
+        clickable = set(nodes.get('isClickable', {}).get('index', []))
+        content_docs = nodes.get('contentDocumentIndex', {})
+        content_docs = dict(zip(content_docs.get('index', []), content_docs.get('value', [])))
+
+        def string(idx):
+            return strings[idx] if 0 <= idx < len(strings) else ''
+
+        # 布局信息：节点索引 -> (bounds, styles)
+        boxes = {}
+        for node_index, bounds, styles in zip(layout.get('nodeIndex', []), layout.get('bounds', []), layout.get('styles', [])):
+            boxes[node_index] = (bounds, [string(idx) for idx in styles])
+
+        dx, dy = offsets[doc_index]
+        doc_nodes = {}
+        for i, node_type in enumerate(types):
+            if node_type == self.TEXT_NODE:
+                # 文本追加到所有元素祖先（等价于 textContent）
+                text = string(values[i]) if i < len(values) else ''
+                if not text.strip():
+                    continue
+                parent = parents[i]
+                while parent >= 0:
+                    node = doc_nodes.get(parent)
+                    if node is not None and node['interactive'] and len(node['text']) < self.MAX_TEXT * 2:
+                        node['text'] += text
+                    parent = parents[parent]
+                continue
+            if node_type != self.ELEMENT_NODE:
+                continue
+
+            tag = string(names[i]).lower()
+            flat = attributes[i] if i < len(attributes) else []
+            attrs = {string(flat[k]): string(flat[k + 1]) for k in range(0, len(flat) - 1, 2)}
+
+            box = boxes.get(i)
+            visible = False
+            rect = [0, 0, 0, 0]
+            if box is not None:
+                (x, y, width, height), styles = box
+                rect = [round(x + dx), round(y + dy), round(width), round(height)]
+                style = dict(zip(self.COMPUTED_STYLES, styles))
+                visible = (width > 0 and height > 0 and style.get('display') != 'none'
+                           and style.get('visibility') not in ('hidden', 'collapse'))
+
+                # 子文档偏移 = iframe 在顶层视口中的位置 - 子文档自身滚动
+                child = content_docs.get(i)
+                if child is not None and child < len(documents):
+                    offsets[child] = (
+                        rect[0] - documents[child].get('scrollOffsetX', 0),
+                        rect[1] - documents[child].get('scrollOffsetY', 0),
+                    )
+
+            node = {
+                'tag': tag,
+                'attrs': attrs,
+                'text': '',
+                'rect': rect,
+                'visible': visible,
+                'interactive': self._is_interactive(tag, attrs, i in clickable),
+                'backend_id': backend_ids[i],
+            }
+            doc_nodes[i] = node
+            result[backend_ids[i]] = node
+
+    def _is_interactive(self, tag, attrs, clickable):
+        """与运行时 SELECTORS 等价的判断，另外收录 ARIA 角色控件和带点击监听器的元素"""
+        if tag == 'a':
+            return 'href' in attrs or clickable
+        if tag == 'input':
+            return attrs.get('type', '').lower() != 'hidden'
+        if tag in self.INTERACTIVE_TAGS:
+            return True
+        if attrs.get('role') in self.INTERACTIVE_ROLES:
+            return True
+        return clickable or 'onclick' in attrs or 'tabindex' in attrs
+
+
+class AXTreeEngine(DOMSnapshotEngine):
+    """
+    可访问性树引擎 - 用 Accessibility.getFullAXTree 按 ARIA 角色筛选控件
+
+    能发现只通过 ARIA 角色 / 事件监听器实现的自定义控件，并使用可访问名称
+    （包含 aria-labelledby、<label for> 等）作为文本；布局框和可见性仍来自一次 DOM 快照。
+    getFullAXTree 只返回主框架的节点，iframe 中的控件请使用 snapshot 引擎。
+    """
+
+    name = 'ax'
+
+    def extract(self, incremental=False, viewport_only=False):
+        tree = self.page.run_cdp('Accessibility.getFullAXTree')
+        snapshot = self.capture()
+        viewport = self.viewport(snapshot)
+        nodes = self.parse(snapshot, viewport)
+
+        elements, seen = [], set()
+        for ax_node in tree.get('nodes', []):
+            backend_id = ax_node.get('backendDOMNodeId')
+            if ax_node.get('ignored') or backend_id is None or backend_id in seen:
+                continue
+            role = (ax_node.get('role') or {}).get('value')
+            node = nodes.get(backend_id)
+            if node is None or not node['visible']:
+                continue
+            if role not in self.INTERACTIVE_ROLES and not node['interactive']:
+                continue
+            seen.add(backend_id)
+
+            name = (ax_node.get('name') or {}).get('value')
+            if name:
+                node['text'] = str(name)
+            # 只通过 ARIA 实现的控件补上角色，方便模型理解
+            if role in self.INTERACTIVE_ROLES and not node['interactive'] and 'role' not in node['attrs']:
+                node['attrs']['role'] = role
+            elements.append(node)
+
+        return self._result(elements, viewport, viewport_only)
+
+
+# 可用引擎（名称 -> 类）
+ENGINES = {
+    DOMEngine.name: DOMEngine,
+    DOMSnapshotEngine.name: DOMSnapshotEngine,
+    AXTreeEngine.name: AXTreeEngine,
+}
+
+
+def create_engine(name, page, runtime=None):
+    """
+    按名称创建提取引擎
+
+    Args:
+        name: 引擎名称，'dom' | 'snapshot' | 'ax'
+        page: DrissionPage 的页面对象
+        runtime: PageRuntime 实例（dom 引擎需要）
+
+    Returns:
+        ExtractionEngine 实例
+    """
+    if name not in ENGINES:
+        logger.warning(f"⚠️  未知的提取引擎 {name!r}，使用默认的 dom 引擎")
+        name = DOMEngine.name
+    if name == DOMEngine.name:
+        return DOMEngine(page, runtime)
+    return ENGINES[name](page)
@@ -0,0 +1,338 @@
+import os
+import json
+import hashlib
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from ..utils.logging import logger
+from .request_interceptor import RequestInterceptor
+from .response_capture import ResponseCapture
+
+
+
+class NetworkArchive:
+    """
+    网络响应存档 - 按请求（方法 + URL + 请求体）保存响应，响应体按内容哈希存储
+
+    目录结构：
+        <path>/index.json               请求 -> 响应列表（状态码、响应头、响应体哈希）
+        <path>/bodies/ab/abcdef...      响应体（sha256 命名，相同内容只存一份）
+    同一请求被记录多次时按顺序保存，回放时依次返回（轮询类接口保持录制时的顺序），之后重复最后一个。
+    """
+
+    INDEX_VERSION = 1
+
+    def __init__(self, path, ignore_params=()):
+        """
+        初始化存档（目录存在时加载索引）
+
+        Args:
+            path: 存档目录
+            ignore_params: 生成请求键时忽略的查询参数名，如 ('_', 'timestamp')（缓存破坏参数）
+        """
+        self.path = os.path.abspath(path)
+        self.ignore_params = frozenset(ignore_params or ())
+        self.entries = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    @property
+    def index_path(self):
+        return os.path.join(self.path, 'index.json')
+
+    def key(self, method, url, post_data=None):
+        """
+        请求键
+
+        Args:
+            method: 请求方法
+            url: 请求 URL（忽略 # 片段和 ignore_params 中的查询参数）
+            post_data: 可选，请求体
+
+        Returns:
+            键字符串，如 'GET https://example.com/api?q=1'
+        """
+        parts = urlsplit(url)
+        query = parts.query
+        if self.ignore_params and query:
+            query = urlencode([(k, v) for k, v in parse_qsl(query, keep_blank_values=True)
+                               if k not in self.ignore_params])
+        key = f"{(method or 'GET').upper()} {urlunsplit((parts.scheme, parts.netloc, parts.path, query, ''))}"
+        if post_data:
+            key += f" {hashlib.sha256(post_data.encode('utf-8')).hexdigest()[:16]}"
+        return key
+
+    def _body_path(self, digest):
+        return os.path.join(self.path, 'bodies', digest[:2], digest)
+
+    # ========== 写入 ==========
+
+    def add(self, method, url, status, headers, body, mime_type=None, post_data=None):
+        """
+        记录一个响应（响应体立即写入，索引在 save() 时写入）
+
+        Args:
+            method: 请求方法
+            url: 请求 URL
+            status: 状态码
+            headers: 响应头字典
+            body: 响应体（str / bytes / None）
+            mime_type: 可选，MIME 类型
+            post_data: 可选，请求体
+        """
+        digest = None
+        if body is not None:
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+            digest = hashlib.sha256(body).hexdigest()
+            body_path = self._body_path(digest)
+            if not os.path.exists(body_path):
+                os.makedirs(os.path.dirname(body_path), exist_ok=True)
+                tmp_path = f"{body_path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(body)
+                os.replace(tmp_path, body_path)
+        entry = {'url': url, 'method': (method or 'GET').upper(), 'status': status, 'headers': headers or {},
+                 'mime_type': mime_type, 'body': digest}
+        with self._lock:
+            self.entries.setdefault(self.key(method, url, post_data), []).append(entry)
+
+    def save(self):
+        """
+        写入索引
+
+        Returns:
+            是否成功
+        """
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            with self._lock:
+                data = {'version': self.INDEX_VERSION, 'entries': self.entries}
+                tmp_path = f"{self.index_path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+            logger.success(f"✅ 网络存档已保存: {self.path}（{len(self)} 个请求）")
+            return True
+        except Exception as e:
+            logger.error(f"❌ 保存网络存档失败: {e}")
+            return False
+
+    def load(self):
+        """加载索引（不存在时为空存档）"""
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            with self._lock:
+                self.entries = data.get('entries', {})
+        except Exception as e:
+            logger.warning(f"⚠️  加载网络存档失败: {e}")
+
+    # ========== 读取 ==========
+
+    def lookup(self, method, url, post_data=None, occurrence=0):
+        """
+        查找响应
+
+        Args:
+            method: 请求方法
+            url: 请求 URL
+            post_data: 可选，请求体
+            occurrence: 第几次请求（从 0 开始），超出录制次数时返回最后一个
+
+        Returns:
+            响应记录字典，没有时返回 None
+        """
+        with self._lock:
+            entries = self.entries.get(self.key(method, url, post_data))
+        if not entries:
+            return None
+        return entries[min(occurrence, len(entries) - 1)]
+
+    def body(self, entry):
+        """
+        读取响应体
+
+        Args:
+            entry: lookup() 返回的记录
+
+        Returns:
+            bytes，没有响应体时返回 None
+        """
+        if not entry.get('body'):
+            return None
+        with open(self._body_path(entry['body']), 'rb') as f:
+            return f.read()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return f"NetworkArchive(path={self.path}, requests={len(self)})"
+
+
+class NetworkRecorder:
+    """
+    网络录制 / 回放 - 录制页面收到的全部响应，之后不访问网络、按存档回放，让页面加载可重复
+
+    - record：基于 ResponseCapture（Network 事件，不暂停请求）保存所有 http(s) 响应，
+      重定向通过 requestWillBeSent 的 redirectResponse 记录，回放时按原样重定向
+    - replay：基于 RequestInterceptor 暂停所有请求，命中存档的用 Fetch.fulfillRequest 直接返回，
+      未命中的默认以 InternetDisconnected 失败（fallback='network' 时正常访问网络）
+
+    使用示例:
+        recorder = operator.record_network('playground/outputs/archives/pubmed')
+        operator.navigate('https://pubmed.ncbi.nlm.nih.gov/?term=cancer')
+        recorder.stop()
+
+        operator.replay_network('playground/outputs/archives/pubmed')
+        operator.navigate('https://pubmed.ncbi.nlm.nih.gov/?term=cancer')   # 不访问网络
+    """
+
+    MODES = ('record', 'replay')
+    FALLBACKS = ('fail', 'network')
+
+    # 回放时去掉的响应头（存档中是解码后的响应体）
+    DROP_HEADERS = frozenset(('content-encoding', 'content-length', 'transfer-encoding'))
+
+    # 录制的响应体大小上限（字节）
+    MAX_BODY_SIZE = 50 * 1024 * 1024
+
+    # 回放时记录的未命中 URL 数
+    MISS_SAMPLES = 50
+
+    def __init__(self, page, archive, mode='replay', fallback='fail', session=None, interceptor=None):
+        """
+        初始化（调用 start() 后生效）
+
+        Args:
+            page: DrissionPage 的页面对象
+            archive: NetworkArchive 实例或存档目录
+            mode: 'record' | 'replay'
+            fallback: 回放未命中时的处理，'fail'（不访问网络）| 'network'
+            session: 可选，共享的 CDPSession
+            interceptor: 可选，共享的 RequestInterceptor（回放模式使用）
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"不支持的模式: {mode}，可选: {', '.join(self.MODES)}")
+        if fallback not in self.FALLBACKS:
+            raise ValueError(f"不支持的未命中处理: {fallback}，可选: {', '.join(self.FALLBACKS)}")
+        self.page = page
+        self.archive = archive if isinstance(archive, NetworkArchive) else NetworkArchive(archive)
+        self.mode = mode
+        self.fallback = fallback
+        self.interceptor = interceptor or RequestInterceptor(page, session=session)
+        self.session = session or self.interceptor.session
+        self.stats = {'recorded': 0, 'redirects': 0, 'hits': 0, 'misses': 0}
+        self.missed = []
+        self._requests = {}
+        self._occurrences = {}
+        self._capture = None
+        self._lock = threading.Lock()
+        self.running = False
+
+    def start(self):
+        """
+        开始录制 / 回放
+
+        Returns:
+            是否成功
+        """
+        if self.running:
+            return True
+        if self.mode == 'record':
+            if not self.session.start():
+                return False
+            self.session.on('Network.requestWillBeSent', self._on_request)
+            self._capture = ResponseCapture(self.page, content_types=None, resource_types=None,
+                                            callback=self._store, max_buffer=0,
+                                            max_body_size=self.MAX_BODY_SIZE, session=self.session)
+            if not self._capture.start():
+                self.session.off('Network.requestWillBeSent', self._on_request)
+                return False
+        elif not self.interceptor.add_handler(self._replay):
+            return False
+        self.running = True
+        logger.info(f"网络{'录制' if self.mode == 'record' else '回放'}已开始: {self.archive.path}")
+        return True
+
+    def stop(self):
+        """停止录制 / 回放（录制模式下保存存档）"""
+        if not self.running:
+            return
+        self.running = False
+        if self.mode == 'record':
+            self._capture.stop()
+            self.session.off('Network.requestWillBeSent', self._on_request)
+            with self._lock:
+                self._requests.clear()
+            self.archive.save()
+        else:
+            self.interceptor.remove_handler(self._replay)
+        logger.info(f"网络{'录制' if self.mode == 'record' else '回放'}已停止: {self.stats}")
+
+    # ========== 录制 ==========
+
+    def _on_request(self, params):
+        # 运行在 CDP 会话的事件线程中
+        request = params.get('request', {})
+        request_id = params['requestId']
+        with self._lock:
+            previous = self._requests.get(request_id)
+            self._requests[request_id] = (request.get('method'), request.get('postData'))
+        redirect = params.get('redirectResponse')
+        if redirect and previous and redirect.get('url', '').startswith('http'):
+            self.archive.add(previous[0], redirect['url'], redirect.get('status'), redirect.get('headers'), None,
+                             redirect.get('mimeType'), previous[1])
+            with self._lock:
+                self.stats['redirects'] += 1
+
+    def _store(self, response):
+        # 运行在 ResponseCapture 的线程中
+        if not response['url'].startswith('http') or response['body'] is None:
+            return
+        with self._lock:
+            method, post_data = self._requests.pop(response['request_id'], ('GET', None))
+        self.archive.add(method, response['url'], response['status'], response['headers'], response['body'],
+                         response['mime_type'], post_data)
+        with self._lock:
+            self.stats['recorded'] += 1
+
+    # ========== 回放 ==========
+
+    def _replay(self, params):
+        # RequestInterceptor 的处理函数
+        request = params['request']
+        key = self.archive.key(request.get('method'), request['url'], request.get('postData'))
+        with self._lock:
+            occurrence = self._occurrences.get(key, 0)
+            self._occurrences[key] = occurrence + 1
+        entry = self.archive.lookup(request.get('method'), request['url'], request.get('postData'), occurrence)
+        if entry is None:
+            with self._lock:
+                self.stats['misses'] += 1
+                if len(self.missed) < self.MISS_SAMPLES:
+                    self.missed.append(key)
+            if self.fallback == 'network':
+                return None
+            return {'action': 'fail', 'reason': 'InternetDisconnected'}
+        with self._lock:
+            self.stats['hits'] += 1
+        headers = {name: value for name, value in entry['headers'].items() if name.lower() not in self.DROP_HEADERS}
+        return {'action': 'fulfill', 'status': entry['status'], 'headers': headers, 'body': self.archive.body(entry)}
+
+    def reset(self):
+        """重置回放顺序（之后的请求重新从每个请求的第一次录制开始返回）"""
+        with self._lock:
+            self._occurrences.clear()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def __repr__(self):
+        return f"NetworkRecorder(mode={self.mode}, archive={self.archive.path}, stats={self.stats})"
@@ -1,5 +1,10 @@
 from ..utils.logging import logger
 from collections import defaultdict
+from .element_table import ElementRecord, ElementTable
+from .element_serializer import ElementSerializer
+from .page_runtime import PageRuntime
+from .extraction_engines import create_engine
+from .set_of_marks import SetOfMarks
 
 
 
@@ -26,15 +31,43 @@ class PageExtractor:
     # 属性优先级（用于生成定位器）
     PRIORITY_ATTRS = ['id', 'name', 'type', 'role', 'class', 'aria-label', 'placeholder', 'title', 'href', 'value']
     
-    def __init__(self, page):
+    def __init__(self, page, incremental=False, max_tokens=ElementSerializer.DEFAULT_MAX_TOKENS, engine='dom',
+                 viewport_only=False, highlight_mode='dom'):
         """
         初始化页面元素提取器
         
         Args:
             page: DrissionPage 的页面对象
+            incremental: 是否默认使用增量提取模式（基于 MutationObserver 只返回变化的元素）
+            max_tokens: 元素描述（喂给大模型）每页的 token 预算
+            engine: 提取引擎，'dom'（默认，页面脚本 + CSS 选择器，支持增量）、
+                'snapshot'（一次 DOMSnapshot 调用）或 'ax'（可访问性树 + DOMSnapshot）
+            viewport_only: 是否默认只提取与视口相交的元素（长页面上更快，视口模式总是全量提取）
+            highlight_mode: 高亮方式，'dom'（默认，每个元素两个 div）或 'canvas'（可选，页面中只添加一个
+                宿主节点，单个 canvas 绘制，滚动时按缓存的位置重绘）；完全不改动页面的标注见 marked_screenshot()
         """
         self.page = page
-        self.interactive_elements = []
+        self.incremental = incremental
+        self.viewport_only = viewport_only
+        self.highlight_mode = highlight_mode
+        # 页面运行时（window.__cua），第一次调用时注册（同一页面只注册一次）
+        self.runtime = PageRuntime(page)
+        # 提取引擎（按名称缓存）
+        self.engine = engine
+        self._engines = {}
+        # 元素表（与工具函数共享，按索引 / 标签 / id / name O(1) 查找）
+        self.interactive_elements = ElementTable()
+        # 最近一次提取的变化信息：{'mode': 'full'|'delta', 'added': [...], 'changed': [...], 'removed': [...]}
+        self.last_delta = None
+        # 最近一次提取时的视口信息 {'width', 'height', 'scrollX', 'scrollY'}
+        self.viewport = None
+        # 元素表对应的运行时提取引擎；None 表示元素表不是运行时提取的结果（尚未提取、已清空或降级），
+        # 此时页面中的 MutationObserver 快照（window.__cua，按页面共享）不是元素表的基线，不能增量提取
+        self._baseline_engine = None
+        # 元素序列化器（按相关度排序、token 预算、游标分页）
+        self.serializer = ElementSerializer(max_tokens)
+        # 截图标注器（Pillow 在内存中绘制编号框）
+        self.set_of_marks = SetOfMarks()
     
     def generate_selector(self, tag, attrs, text=''):
         """
@@ -77,7 +110,10 @@ class PageExtractor:
         Returns:
             提取的元素列表
         """
-        self.interactive_elements = []
+        self.interactive_elements.clear()
+        self._baseline_engine = None
+        # 传统方法没有视口信息，不能沿用上一次运行时提取的视口
+        self.viewport = None
         
         # 优化：使用CSS选择器一次性获取所有可交互元素
         selector = ', '.join(self.INTERACTIVE_TAGS)
@@ -104,15 +140,16 @@ class PageExtractor:
                     # 生成定位字符串
                     selector = self.generate_selector(tag, attrs, text)
                     
-                    info = {
-                        'index': idx,  # 添加索引（从1开始）
-                        'tag': tag,
-                        'selector': selector,
-                        'text': text,
-                        'attrs': attrs,
-                        'element': ele
-                    }
-                    self.interactive_elements.append(info)
+                    info = ElementRecord(
+                        self.page,
+                        index=idx,  # 添加索引（从1开始）
+                        tag=tag,
+                        selector=selector,
+                        text=text,
+                        attrs=attrs,
+                        element=ele
+                    )
+                    self.interactive_elements.upsert(info)
                 except Exception as e:
                     # 跳过有问题的元素
                     continue
@@ -120,6 +157,7 @@ class PageExtractor:
         except Exception as e:
             logger.error(f"元素提取失败: {e}")
         
+        self.last_delta = {'mode': 'full', 'added': list(self.interactive_elements), 'changed': [], 'removed': []}
         return self.interactive_elements
     
     def print_elements(self, detailed=True):
@@ -168,7 +206,32 @@ class PageExtractor:
         Returns:
             该标签的所有元素列表
         """
-        return [info for info in self.interactive_elements if info['tag'] == tag]
+        return self.interactive_elements.by_tag(tag)
+    
+    def get_element(self, index):
+        """
+        按索引获取元素
+        
+        Args:
+            index: 元素索引（与页面高亮标签一致）
+            
+        Returns:
+            元素记录，不存在时返回 None
+        """
+        return self.interactive_elements.get(index)
+    
+    def get_elements_by_attr(self, attr, value):
+        """
+        按属性值获取元素（id / name 走哈希索引）
+        
+        Args:
+            attr: 属性名
+            value: 属性值
+            
+        Returns:
+            匹配的元素列表
+        """
+        return self.interactive_elements.by_attr(attr, value)
     
     def get_selector_list(self):
         """
@@ -184,13 +247,14 @@ class PageExtractor:
         获取所有提取的元素
         
         Returns:
-            所有元素的列表
+            元素表（ElementTable，可迭代，按索引递增）
         """
         return self.interactive_elements
     
     def clear(self):
         """清空已提取的元素"""
-        self.interactive_elements = []
+        self.interactive_elements.clear()
+        self._baseline_engine = None
     
     
     
@@ -268,156 +332,103 @@ class PageExtractor:
     
     
     
-    def _generate_text_content(self):
-        """生成简洁的文本内容（专用于喂给大模型）"""
-        text_lines = []
-        
-        # 添加统计信息
-        tag_counts = {}
-        for element in self.interactive_elements:
-            tag = element['tag']
-            tag_counts[tag] = tag_counts.get(tag, 0) + 1
-        
-        text_lines.append(f"总计: {len(self.interactive_elements)} 个可交互元素")
-        text_lines.append("统计: " + ", ".join([f"{tag.upper()}: {count}" for tag, count in sorted(tag_counts.items())]))
-        text_lines.append("")
-        
-        # 按类型分组
-        grouped = {}
-        for element in self.interactive_elements:
-            tag = element['tag']
-            if tag not in grouped:
-                grouped[tag] = []
-            grouped[tag].append(element)
-        
-        for tag, elements in sorted(grouped.items()):
-            text_lines.append(f"=== {tag.upper()} 元素 ({len(elements)} 个) ===")
-            
-            for i, element in enumerate(elements, 1):
-                text_lines.append(f"{i}. {element['selector']}")
-                
-                # 显示所有属性
-                if element['attrs']:
-                    attrs_str = ", ".join([f"{k}={v}" for k, v in element['attrs'].items()])
-                    text_lines.append(f"   属性: {attrs_str}")
-                
-                text_lines.append("")  # 空行分隔
-            
-            text_lines.append("")  # 类型间空行
+    def _generate_text_content(self, query=None, max_tokens=None):
+        """
+        生成简洁的文本内容（专用于喂给大模型）
+        
+        Args:
+            query: 可选，当前指令或关注点，用于相关度排序
+            max_tokens: 可选，本次 token 预算
+        
+        Returns:
+            紧凑表格文本（超出预算的部分通过 describe_more 分页）
+        """
+        text, _ = self.describe_elements(query, max_tokens)
+        return text
+    
+    def describe_elements(self, query=None, max_tokens=None):
+        """
+        按相关度排序并在 token 预算内描述已提取的元素
+        
+        Args:
+            query: 可选，当前指令或关注点，用于相关度排序
+            max_tokens: 可选，本次 token 预算，默认使用初始化时的设置
+        
+        Returns:
+            (文本, 下一页游标)，没有更多元素时游标为 None
+        """
+        return self.serializer.serialize(self.interactive_elements, query, self.viewport, max_tokens)
+    
+    def describe_more(self, cursor, max_tokens=None):
+        """
+        继续输出上一次 describe_elements 排序结果中的下一页
         
-        return "\n".join(text_lines)
+        Args:
+            cursor: 上一页返回的游标
+            max_tokens: 可选，本次 token 预算
+        
+        Returns:
+            (文本, 下一页游标)，没有更多元素时游标为 None
+        """
+        return self.serializer.more(cursor, max_tokens)
+
 
 
+    def get_engine(self, name=None):
+        """
+        获取提取引擎实例
+        
+        Args:
+            name: 引擎名称，None 时使用初始化时的设置
+        
+        Returns:
+            ExtractionEngine 实例
+        """
+        name = name or self.engine
+        if name not in self._engines:
+            self._engines[name] = create_engine(name, self.page, self.runtime)
+        return self._engines[name]
 
-    def extract_elements(self, highlight=True, save_to_file=None):
+    def extract_elements(self, highlight=True, save_to_file=None, incremental=None, engine=None, viewport_only=None):
             """
-            提取所有可交互元素（使用 test_highlight 的优化逻辑）
+            提取所有可交互元素（调用页面运行时 window.__cua.extract）
             
             Args:
                 highlight: 是否在页面上高亮显示元素
                 save_to_file: 可选，保存提取结果到 txt 文件的路径（例如："elements.txt"）
+                incremental: 是否使用增量提取模式，None 时使用初始化时的设置。
+                    增量模式首次调用时全量扫描并在页面中安装 MutationObserver，之后只重新检查
+                    发生变化的子树；未变化元素的索引保持不变，页面跳转后自动退化为全量提取。
+                    只有 dom 引擎支持增量模式。
+                engine: 本次使用的提取引擎，None 时使用初始化时的设置
+                viewport_only: 是否只提取与视口相交的元素，None 时使用初始化时的设置
             
             Returns:
                 提取的元素列表，格式为: [{'index': 0, 'tag': 'a', 'attrs': {...}, 'text': '...', ...}, ...]
+                其中 'element' 为 ElementHandle 惰性句柄，调用 resolve() 时才会获取元素对象。
+                本次相对上一次提取的变化见 self.last_delta
             """
-            
-            # 清空已提取元素
-            self.clear()
+            if incremental is None:
+                incremental = self.incremental
+            if viewport_only is None:
+                viewport_only = self.viewport_only
+            engine = engine or self.engine
+            # 元素表为空、上次降级或换了引擎时，页面中的快照不是元素表的基线，强制全量提取（同时重置快照）
+            if incremental and (not self.interactive_elements or self._baseline_engine != engine):
+                incremental = False
             
             try:
-                # 使用 test_highlight 的逻辑：基于 CSS 选择器批量提取
-                js_script = """
-                // 可交互元素选择器（与 test_highlight 保持一致）
-                const selectors = [
-                    'a[href]',
-                    'button',
-                    'input:not([type="hidden"])',
-                    'select',
-                    'textarea',
-                    '[role="button"]',
-                    '[onclick]',
-                    '[tabindex]'
-                ];
-                
-                // 需要提取的属性列表
-                const attrs = ['id', 'class', 'name', 'type', 'href', 'value', 'placeholder', 'title', 'role', 'aria-label', 'tabindex'];
-                
-                const results = [];
-                
-                // 获取所有可交互元素
-                const elements = Array.from(document.querySelectorAll(selectors.join(',')))
-                    .filter(el => {
-                        // 过滤不可见元素
-                        const style = window.getComputedStyle(el);
-                        const rect = el.getBoundingClientRect();
-                        return style.display !== 'none' && 
-                            style.visibility !== 'hidden' && 
-                            rect.width > 0 && 
-                            rect.height > 0;
-                    });
-                
-                // 提取每个元素的信息（下标从 1 开始）
-                elements.forEach((el, index) => {
-                    const displayIndex = index + 1;  // 下标从 1 开始
-                    const info = {
-                        tag: el.tagName.toLowerCase(),
-                        text: el.textContent ? el.textContent.substring(0, 50).trim() : '',
-                        attrs: {},
-                        index: displayIndex  // 添加索引，用于后续高亮时的 ID 匹配
-                    };
-                    
-                    // 批量获取属性
-                    attrs.forEach(attr => {
-                        const value = el.getAttribute(attr);
-                        if (value) {
-                            info.attrs[attr] = value;
-                        }
-                    });
-                    
-                    // 给元素打上标记，方便后续高亮时识别（使用显示索引）
-                    el.setAttribute('data-extractor-index', displayIndex);
-                    
-                    results.push(info);
-                });
-                
-                return results;
-                """
-                
-                # 执行JavaScript获取所有元素信息
-                elements_data = self.page.run_js(js_script)
+                result = self.get_engine(engine).extract(incremental=incremental, viewport_only=viewport_only)
                 
                 # 调试：检查返回值
-                if elements_data is None:
+                if result is None:
                     raise Exception("JavaScript返回None，可能是代码执行失败")
                 
-                if not isinstance(elements_data, (list, tuple)):
-                    raise Exception(f"JavaScript返回类型错误: {type(elements_data)}, 值: {elements_data}")
+                if not isinstance(result, dict):
+                    raise Exception(f"JavaScript返回类型错误: {type(result)}, 值: {result}")
                 
-                # 处理返回的数据
-                for data in elements_data:
-                    tag = data['tag']
-                    text = data['text']
-                    attrs = data['attrs']
-                    index = data.get('index', len(self.interactive_elements))
-                    
-                    # 生成定位字符串
-                    selector = self.generate_selector(tag, attrs, text)
-                    
-                    # 重新获取元素对象（用于后续操作）
-                    try:
-                        element = self.page.ele(selector, timeout=0.5)
-                    except:
-                        element = None
-                    
-                    info = {
-                        'index': index,
-                        'tag': tag,
-                        'selector': selector,
-                        'text': text,
-                        'attrs': attrs,
-                        'element': element
-                    }
-                    self.interactive_elements.append(info)
+                self._apply_extraction_result(result)
+                self._baseline_engine = engine
                 
                 # 如果需要保存到文件
                 if save_to_file:
@@ -432,6 +443,7 @@ class PageExtractor:
             except Exception as e:
                 # 如果JavaScript方式失败，降级使用原始方法
                 logger.warning(f"JavaScript批量提取失败，使用传统方法: {e}")
+                self.clear()
                 result = self._extract_elements_fallback()
                 
                 # 降级情况下也需要保存文件
@@ -440,107 +452,89 @@ class PageExtractor:
                 
                 return result
 
-    def highlight_elements(self, save_to_file=None):
+    def _build_element_info(self, data):
+        """
+        将提取脚本返回的原始数据转换为元素信息字典
+        
+        Args:
+            data: 引擎返回的 {'index', 'tag', 'text', 'attrs', 'hosts', 'rect', 'inViewport', 'backendId'} 字典，
+                'hosts' 仅在元素位于 Shadow DOM / iframe 中时存在，'backendId' 仅由快照类引擎返回
+            
+        Returns:
+            ElementRecord 元素记录（元素句柄在首次访问时才创建）
+        """
+        tag = data['tag']
+        text = data['text']
+        attrs = data['attrs']
+        index = data.get('index', len(self.interactive_elements))
+        host_path = data.get('hosts') or []
+        
+        # 生成定位字符串
+        selector = self.generate_selector(tag, attrs, text)
+        
+        # 惰性句柄：只有工具真正操作元素时才通过 data-extractor-index 解析
+        return ElementRecord(
+            self.page, index, tag, selector, text, attrs, host_path,
+            rect=data.get('rect'), in_viewport=data.get('inViewport'), backend_id=data.get('backendId')
+        )
+    
+    def _apply_extraction_result(self, result):
+        """
+        将运行时返回的提取结果（全量或增量）合并到已提取元素中
+        
+        Args:
+            result: {'mode': 'full'|'delta', 'added': [...], 'changed': [...], 'removed': [...],
+                'positions': [...], 'viewport': {...}}
+        """
+        added = [self._build_element_info(data) for data in result.get('added') or []]
+        changed = [self._build_element_info(data) for data in result.get('changed') or []]
+        removed = [int(index) for index in result.get('removed') or []]
+        
+        if result.get('mode') == 'delta':
+            for index in removed:
+                self.interactive_elements.remove(index)
+            for info in changed + added:
+                self.interactive_elements.upsert(info)
+            # 未变化元素只更新位置
+            for index, x, y, width, height, visible in result.get('positions') or []:
+                record = self.interactive_elements.get(index)
+                if record is not None:
+                    record.rect = [x, y, width, height]
+                    record.in_viewport = bool(visible)
+        else:
+            self.interactive_elements.load(added)
+        
+        self.viewport = result.get('viewport')
+        self.last_delta = {
+            'mode': result.get('mode', 'full'),
+            'added': added,
+            'changed': changed,
+            'removed': removed,
+        }
+        if self.last_delta['mode'] == 'delta':
+            logger.debug(
+                f"增量提取: 新增 {len(added)}，变化 {len(changed)}，"
+                f"移除 {len(removed)}，当前共 {len(self.interactive_elements)} 个元素"
+            )
+    
+    def highlight_elements(self, save_to_file=None, mode=None):
         """
         在页面上高亮显示所有可交互元素（使用与提取时相同的索引）
         
         Args:
             save_to_file: 可选，保存高亮元素列表到 txt 文件的路径（例如："highlighted.txt"）
+            mode: 高亮方式，'dom' 或 'canvas'，None 时使用初始化时的设置
         
         Returns:
             高亮的元素列表，格式同 extract_elements 返回值
         """
-        js_code = """
-        // 移除旧的高亮容器
-        const oldContainer = document.getElementById('eko-highlight-container');
-        if (oldContainer) {
-            oldContainer.remove();
-        }
-
-        // 获取所有已标记的元素（在 extract_elements 时已经打上 data-extractor-index 标记）
-        const elements = Array.from(document.querySelectorAll('[data-extractor-index]'))
-            .sort((a, b) => {
-                // 按索引排序，确保顺序一致
-                return parseInt(a.getAttribute('data-extractor-index')) - 
-                    parseInt(b.getAttribute('data-extractor-index'));
-            });
-
-        if (elements.length === 0) {
-            console.warn('没有找到已标记的元素，请先调用 extract_elements()');
-            return 0;
-        }
-
-        // 颜色池
-        const colors = [
-            '#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8',
-            '#F7DC6F', '#BB8FCE', '#85C1E2', '#F8B739', '#52B788'
-        ];
-
-        // 创建高亮容器
-        const container = document.createElement('div');
-        container.id = 'eko-highlight-container';
-        container.style.cssText = `
-            position: absolute;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            pointer-events: none;
-            z-index: 999999;
-        `;
-        document.body.appendChild(container);
-
-        // 给每个元素添加高亮和标签（使用元素上的 data-extractor-index）
-        elements.forEach(el => {
-            const index = parseInt(el.getAttribute('data-extractor-index'));
-            const color = colors[index % colors.length];
-            const rect = el.getBoundingClientRect();
-            
-            if (rect.width > 0 && rect.height > 0) {
-                const x = rect.left + window.scrollX;
-                const y = rect.top + window.scrollY;
-
-                // 创建高亮框
-                const highlightBox = document.createElement('div');
-                highlightBox.style.cssText = `
-                    position: absolute;
-                    left: ${x}px;
-                    top: ${y}px;
-                    width: ${rect.width}px;
-                    height: ${rect.height}px;
-                    border: 2px solid ${color};
-                    box-sizing: border-box;
-                    pointer-events: none;
-                    border-radius: 4px;
-                `;
-
-                // 创建标签（使用 data-extractor-index 作为标签文本）
-                const label = document.createElement('div');
-                label.textContent = `[${index}]`;
-                label.style.cssText = `
-                    position: absolute;
-                    right: -2px;
-                    top: -20px;
-                    background: ${color};
-                    color: white;
-                    padding: 2px 6px;
-                    font-size: 12px;
-                    font-weight: bold;
-                    border-radius: 3px;
-                    font-family: monospace;
-                    box-shadow: 0 2px 4px rgba(0,0,0,0.3);
-                `;
-
-                highlightBox.appendChild(label);
-                container.appendChild(highlightBox);
-            }
-        });
-
-        return elements.length;
-        """
-        
         try:
-            count = self.page.run_js(js_code)
+            mode = mode or self.highlight_mode
+            # 快照类引擎不在页面中标记元素，按提取到的位置绘制
+            boxes = None
+            if self.interactive_elements and self.interactive_elements.at(0).backend_id is not None:
+                boxes = [[record.index] + list(record.rect) for record in self.interactive_elements if record.rect]
+            count = self.runtime.call('highlight', boxes, mode)
             logger.success(f"✅ 已高亮 {count} 个可交互元素")
             
             # 如果需要保存到文件
@@ -552,6 +546,19 @@ class PageExtractor:
             logger.error(f"❌ 高亮元素失败: {e}")
             return []
     
+    def marked_screenshot(self, set_of_marks=None):
+        """
+        截取当前视口并用 Pillow 绘制已提取元素的编号框（不修改页面 DOM，不写入磁盘）
+        
+        Args:
+            set_of_marks: 可选，自定义的 SetOfMarks（输出格式、质量、尺寸），默认使用 self.set_of_marks
+        
+        Returns:
+            JPEG / WebP 图片字节，失败时返回 None
+        """
+        marker = set_of_marks or self.set_of_marks
+        return marker.annotate(self.page, self.interactive_elements, self.viewport)
+    
     def clear_highlight(self, remove_markers=False):
         """
         清除页面上的所有高亮标记
@@ -559,26 +566,11 @@ class PageExtractor:
         Args:
             remove_markers: 是否同时移除 data-extractor-index 标记（默认 False，保留标记以便重新高亮）
         """
-        js_code = f"""
-        // 移除高亮容器（包含所有边框和标签）
-        const container = document.getElementById('eko-highlight-container');
-        if (container) {{
-            container.remove();
-        }}
-        
-        // 可选：移除元素上的标记
-        if ({str(remove_markers).lower()}) {{
-            document.querySelectorAll('[data-extractor-index]').forEach(el => {{
-                el.removeAttribute('data-extractor-index');
-            }});
-        }}
-        """
-        
         try:
-            self.page.run_js(js_code)
+            self.runtime.call('clearHighlight', bool(remove_markers))
             if remove_markers:
                 logger.success("✅ 已清除所有高亮标记和索引标记")
             else:
                 logger.success("✅ 已清除所有高亮标记（保留索引标记）")
         except Exception as e:
-            logger.error(f"❌ 清除高亮失败: {e}")
\ No newline at end of file
+            logger.error(f"❌ 清除高亮失败: {e}")
@@ -0,0 +1,322 @@
+import threading
+from time import monotonic
+from ..utils.logging import logger
+from .cdp_session import CDPSession
+
+
+
+class PageReadiness:
+    """
+    页面就绪检测 - 基于 CDP 生命周期事件判断页面何时稳定，替代固定的 sleep
+
+    通过独立的 CDP 会话监听 Page / Network 事件，维护以下状态：
+    - 主框架导航序号（每次导航、前进后退、同文档路由变化加一）
+    - 当前文档的 DOMContentLoaded / load 状态
+    - 进行中的网络请求（忽略 WebSocket / EventSource 长连接）
+    DOM 静默由页面内的 MutationObserver 判断，只在等待时按需探测。
+
+    wait() 在条件满足后立即返回，并报告触发的条件，例如：
+    {'condition': 'network_idle', 'elapsed': 0.62, 'navigated': True, 'timed_out': False}
+    """
+
+    # 可等待的条件
+    CONDITIONS = ('settled', 'domcontentloaded', 'load', 'network_idle', 'dom_quiet')
+
+    # 不计入网络空闲判断的长连接请求类型
+    IGNORED_RESOURCE_TYPES = ('WebSocket', 'EventSource')
+
+    # 状态轮询间隔（秒），用于检查静默窗口是否已过
+    POLL_INTERVAL = 0.05
+
+    # DOM 静默探测脚本：静默 quiet 毫秒后返回 true，超过 limit 毫秒仍有变化时返回 false
+    DOM_QUIET_SCRIPT = '''
+        new Promise(resolve => {
+            const quiet = %d, limit = %d;
+            let timer = null;
+            const observer = new MutationObserver(() => {
+                clearTimeout(timer);
+                timer = setTimeout(() => done(true), quiet);
+            });
+            const cap = setTimeout(() => done(false), limit);
+            function done(result) {
+                observer.disconnect();
+                clearTimeout(timer);
+                clearTimeout(cap);
+                resolve(result);
+            }
+            observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+            timer = setTimeout(() => done(true), quiet);
+        })
+    '''
+
+    def __init__(self, page, session=None, network_quiet=0.5, dom_quiet=0.3, max_inflight=0,
+                 timeout=10, stale_request=5):
+        """
+        初始化页面就绪检测（调用 start() 后开始监听）
+
+        Args:
+            page: DrissionPage 的页面对象
+            session: 可选，共享的 CDPSession；None 时自行创建
+            network_quiet: 网络空闲判定的静默窗口（秒）
+            dom_quiet: DOM 静默判定的静默窗口（秒）
+            max_inflight: 网络空闲时允许的进行中请求数（类似 networkidle0 / networkidle2）
+            timeout: 默认等待超时时间（秒）
+            stale_request: 超过该时长（秒）仍未完成的请求视为长轮询，不再计入
+        """
+        self.page = page
+        self.session = session or CDPSession(page)
+        self.network_quiet = network_quiet
+        self.dom_quiet = dom_quiet
+        self.max_inflight = max_inflight
+        self.timeout = timeout
+        self.stale_request = stale_request
+
+        self._cond = threading.Condition()
+        self._nav_seq = 0
+        self._lifecycle = set()
+        self._inflight = {}
+        self._last_network = monotonic()
+        self._main_frame = None
+        self._started = False
+
+    # ========== 事件监听 ==========
+
+    def start(self):
+        """
+        开始监听生命周期事件（重复调用无副作用）
+
+        Returns:
+            是否成功
+        """
+        if self._started and self.session.is_running:
+            return True
+        if not self.session.start():
+            return False
+        try:
+            if not self._started:
+                handlers = {
+                    'Page.frameStartedLoading': self._on_frame_started_loading,
+                    'Page.frameNavigated': self._on_frame_navigated,
+                    'Page.navigatedWithinDocument': self._on_navigated_within_document,
+                    'Page.domContentEventFired': self._on_dom_content_loaded,
+                    'Page.loadEventFired': self._on_load,
+                    'Network.requestWillBeSent': self._on_request,
+                    'Network.loadingFinished': self._on_request_done,
+                    'Network.loadingFailed': self._on_request_done,
+                }
+                for event, handler in handlers.items():
+                    self.session.on(event, handler)
+            self.session.enable('Page')
+            self.session.enable('Network')
+
+            # 以当前文档状态作为初始状态
+            frame = self.session.run('Page.getFrameTree')['frameTree']['frame']
+            state = self.session.run('Runtime.evaluate', expression='document.readyState', returnByValue=True)
+            ready_state = state.get('result', {}).get('value')
+            with self._cond:
+                self._main_frame = frame['id']
+                self._lifecycle = set()
+                if ready_state in ('interactive', 'complete'):
+                    self._lifecycle.add('domcontentloaded')
+                if ready_state == 'complete':
+                    self._lifecycle.add('load')
+            self._started = True
+            logger.debug(f"页面就绪检测已启动（readyState={ready_state}）")
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️  页面就绪检测启动失败: {e}")
+            return False
+
+    def close(self):
+        """停止监听并关闭 CDP 会话"""
+        self.session.close()
+        self._started = False
+
+    def _is_main_frame(self, frame_id):
+        return self._main_frame is None or frame_id == self._main_frame
+
+    def _on_frame_started_loading(self, params):
+        if not self._is_main_frame(params.get('frameId')):
+            return
+        with self._cond:
+            self._nav_seq += 1
+            self._lifecycle = set()
+            # 旧文档的请求不会再收到完成事件，只保留新文档自身的导航请求
+            self._inflight = {request_id: request for request_id, request in self._inflight.items()
+                              if request[1] == 'Document' and self._is_main_frame(request[2])}
+            self._last_network = monotonic()
+            self._cond.notify_all()
+
+    def _on_frame_navigated(self, params):
+        frame = params.get('frame', {})
+        if frame.get('parentId'):
+            return
+        with self._cond:
+            self._main_frame = frame.get('id')
+            # 从往返缓存恢复的页面不会再触发 DOMContentLoaded / load
+            if params.get('type') == 'BackForwardCacheRestore':
+                self._nav_seq += 1
+                self._lifecycle = {'domcontentloaded', 'load'}
+            self._cond.notify_all()
+
+    def _on_navigated_within_document(self, params):
+        if not self._is_main_frame(params.get('frameId')):
+            return
+        with self._cond:
+            # 同文档路由变化（pushState / hash），文档本身已加载
+            self._nav_seq += 1
+            self._lifecycle = {'domcontentloaded', 'load'}
+            self._last_network = monotonic()
+            self._cond.notify_all()
+
+    def _on_dom_content_loaded(self, params):
+        with self._cond:
+            self._lifecycle.add('domcontentloaded')
+            self._cond.notify_all()
+
+    def _on_load(self, params):
+        with self._cond:
+            self._lifecycle.update(('domcontentloaded', 'load'))
+            self._cond.notify_all()
+
+    def _on_request(self, params):
+        if params.get('type') in self.IGNORED_RESOURCE_TYPES:
+            return
+        with self._cond:
+            self._inflight[params['requestId']] = (monotonic(), params.get('type'), params.get('frameId'))
+            self._last_network = monotonic()
+
+    def _on_request_done(self, params):
+        with self._cond:
+            if self._inflight.pop(params.get('requestId'), None) is not None:
+                self._last_network = monotonic()
+                self._cond.notify_all()
+
+    # ========== 状态查询 ==========
+
+    def mark(self):
+        """
+        记录当前时刻，作为 wait(since=...) 的起点（在触发操作之前调用）
+
+        Returns:
+            (导航序号, 时间戳)
+        """
+        with self._cond:
+            return self._nav_seq, monotonic()
+
+    def inflight(self):
+        """
+        当前进行中的请求数（不含长连接和超时的长轮询）
+
+        Returns:
+            请求数量
+        """
+        with self._cond:
+            return self._count_inflight(monotonic())
+
+    def _count_inflight(self, now):
+        """调用方需持有锁；超过 stale_request 的请求视为长轮询，同时从记录中移除"""
+        stale = [request_id for request_id, request in self._inflight.items()
+                 if now - request[0] >= self.stale_request]
+        for request_id in stale:
+            del self._inflight[request_id]
+        return len(self._inflight)
+
+    def _network_idle(self, now, since_time):
+        """调用方需持有锁"""
+        if self._count_inflight(now) > self.max_inflight:
+            return False
+        return now - max(self._last_network, since_time) >= self.network_quiet
+
+    # ========== 等待 ==========
+
+    def wait(self, until='settled', since=None, expect_navigation=False, timeout=None):
+        """
+        等待页面就绪
+
+        Args:
+            until: 等待条件
+                - 'settled': 有导航时先等 DOMContentLoaded，然后网络空闲或 DOM 静默任一满足即返回
+                - 'domcontentloaded' / 'load': 当前文档的生命周期事件
+                - 'network_idle': 进行中的请求数不超过 max_inflight 且静默 network_quiet 秒
+                - 'dom_quiet': DOM 静默 dom_quiet 秒
+            since: mark() 的返回值，在此之后发生的导航才算数；None 表示从现在开始
+            expect_navigation: 是否必须等到一次新的导航（如 page.get 之后）
+            timeout: 超时时间（秒），None 使用默认值
+
+        Returns:
+            {'condition': 触发的条件（超时为 'timeout'）, 'elapsed': 耗时（秒）,
+             'navigated': 是否发生了导航, 'timed_out': 是否超时}
+        """
+        if until not in self.CONDITIONS:
+            raise ValueError(f"不支持的等待条件: {until}，可选: {', '.join(self.CONDITIONS)}")
+
+        start = monotonic()
+        since_seq, since_time = since if since is not None else self.mark()
+        deadline = start + (self.timeout if timeout is None else timeout)
+        probe = {'seq': None, 'result': None, 'thread': None}
+
+        with self._cond:
+            while True:
+                now = monotonic()
+                navigated = self._nav_seq > since_seq
+                condition = None
+                if navigated or not expect_navigation:
+                    condition = self._check(until, now, since_time, probe)
+                if condition:
+                    return self._result(condition, start, navigated, False)
+                if now >= deadline:
+                    return self._result('timeout', start, navigated, True)
+                self._cond.wait(min(self.POLL_INTERVAL, deadline - now))
+
+    def _check(self, until, now, since_time, probe):
+        """检查条件是否满足（调用方需持有锁），返回触发的条件名或 None"""
+        if until in ('domcontentloaded', 'load'):
+            return until if until in self._lifecycle else None
+        if until == 'network_idle':
+            return until if self._network_idle(now, since_time) else None
+
+        # dom_quiet / settled 都需要文档已解析
+        if 'domcontentloaded' not in self._lifecycle:
+            return None
+        if until == 'settled' and self._network_idle(now, since_time):
+            return 'network_idle'
+        if probe['seq'] == self._nav_seq and probe['result']:
+            return 'dom_quiet'
+        if probe['seq'] != self._nav_seq or (probe['thread'] is not None and not probe['thread'].is_alive()):
+            self._start_probe(probe)
+        return None
+
+    def _start_probe(self, probe):
+        """启动 DOM 静默探测（调用方需持有锁）"""
+        probe['seq'] = self._nav_seq
+        probe['result'] = None
+        seq = self._nav_seq
+        quiet_ms = int(self.dom_quiet * 1000)
+        script = self.DOM_QUIET_SCRIPT % (quiet_ms, max(quiet_ms * 10, 3000))
+
+        def run():
+            try:
+                result = self.session.run('Runtime.evaluate', expression=script, awaitPromise=True,
+                                          returnByValue=True, _timeout=self.timeout)
+                quiet = bool(result.get('result', {}).get('value'))
+            except Exception as e:
+                # 探测期间发生导航时执行上下文会被销毁，等待下一次探测
+                logger.debug(f"DOM 静默探测失败: {e}")
+                quiet = False
+            with self._cond:
+                if probe['seq'] == seq:
+                    probe['result'] = quiet
+                self._cond.notify_all()
+
+        probe['thread'] = threading.Thread(target=run, daemon=True)
+        probe['thread'].start()
+
+    @staticmethod
+    def _result(condition, start, navigated, timed_out):
+        return {
+            'condition': condition,
+            'elapsed': round(monotonic() - start, 3),
+            'navigated': navigated,
+            'timed_out': timed_out,
+        }
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import threading
+import weakref
+from pathlib import Path
+from ..utils.logging import logger
+
+
+
+class PageRuntime:
+    """
+    页面运行时 - 把提取、高亮、标记等页面脚本以 window.__cua 的形式注册到每个文档
+
+    运行时源码位于 scripts/cua_runtime.js，第一次调用时通过 Page.addScriptToEvaluateOnNewDocument
+    注册，之后每个新文档加载前自动执行；Python 侧每次只需要发送类似 __cua.extract({...}) 的短调用。
+    注册按页面的 CDP 连接记录（同一页面上创建多个 PageRuntime 也只注册一次）。
+    """
+
+    SCRIPT_PATH = Path(__file__).parent / 'scripts' / 'cua_runtime.js'
+
+    _source = None
+    _version = None
+
+    # 页面的 CDP 连接 -> addScriptToEvaluateOnNewDocument 返回的脚本标识（连接释放后自动移除）
+    _registrations = weakref.WeakKeyDictionary()
+    _registrations_lock = threading.Lock()
+
+    def __init__(self, page):
+        """
+        初始化页面运行时
+
+        Args:
+            page: DrissionPage 的页面对象
+        """
+        self.page = page
+
+    @classmethod
+    def _load(cls):
+        """读取运行时源码，并用内容哈希作为版本号"""
+        if cls._source is None:
+            raw = cls.SCRIPT_PATH.read_text(encoding='utf-8')
+            cls._version = hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]
+            cls._source = raw.replace('__CUA_VERSION__', cls._version)
+        return cls._source
+
+    @classmethod
+    def source(cls):
+        """
+        获取运行时脚本源码
+
+        Returns:
+            已替换版本号的 JavaScript 源码
+        """
+        return cls._load()
+
+    @classmethod
+    def version(cls):
+        """
+        获取运行时版本号
+
+        Returns:
+            版本号字符串
+        """
+        cls._load()
+        return cls._version
+
+    def register(self):
+        """
+        在页面加载前自动注入运行时（每个页面连接只注册一次，call() 会自动调用）
+
+        Returns:
+            脚本标识，注册失败时返回 None
+        """
+        try:
+            driver = self.page.driver
+            with self._registrations_lock:
+                identifier = self._registrations.get(driver)
+                if identifier is None:
+                    identifier = self.page.run_cdp('Page.addScriptToEvaluateOnNewDocument',
+                                                   source=self.source())['identifier']
+                    self._registrations[driver] = identifier
+                    logger.debug(f"页面运行时已通过 CDP 注册 (version={self.version()}, id={identifier})")
+            return identifier
+        except Exception as e:
+            logger.warning(f"页面运行时 CDP 注册失败，将在调用时按需注入: {e}")
+            return None
+
+    def unregister(self):
+        """取消自动注入（已加载的文档中的运行时不受影响）"""
+        try:
+            driver = self.page.driver
+            with self._registrations_lock:
+                identifier = self._registrations.pop(driver, None)
+            if identifier is not None:
+                self.page.run_cdp('Page.removeScriptToEvaluateOnNewDocument', identifier=identifier)
+        except Exception as e:
+            logger.warning(f"取消页面运行时注册失败: {e}")
+
+    def inject(self):
+        """向当前文档注入运行时（用于注册前已经加载的文档）"""
+        self.page.run_js(self.source())
+
+    def call(self, method, *args, timeout=None):
+        """
+        调用运行时方法
+
+        当前文档中没有运行时（或版本不一致）时会先注入再重试，正常情况下只有一次往返。
+        方法返回 Promise 时会等待其完成。
+
+        Args:
+            method: window.__cua 上的方法名，如 'extract'
+            *args: 传给方法的参数（需可 JSON 序列化；统一以 JSON 字符串传入，
+                因为 run_js 不支持直接传 list / None）
+            timeout: 脚本执行超时时间（秒），None 使用页面默认值
+
+        Returns:
+            方法返回值
+        """
+        self.register()
+        script = (
+            f"return (window.__cua && window.__cua.version === '{self.version()}') "
+            f"? window.__cua.{method}(...JSON.parse(arguments[0])) : {{__cua_missing__: true}};"
+        )
+        payload = json.dumps(list(args))
+        result = self.page.run_js(script, payload, timeout=timeout)
+        if isinstance(result, dict) and result.get('__cua_missing__'):
+            self.inject()
+            result = self.page.run_js(script, payload, timeout=timeout)
+        return result
+
+    def call_on(self, element, method, *args, timeout=None):
+        """
+        以元素为第一个参数调用运行时方法（在元素所在的文档中执行，iframe 中的元素同样适用）
+
+        Args:
+            element: DrissionPage 元素对象
+            method: window.__cua 上的方法名，如 'fill'
+            *args: 元素之后的参数（需可 JSON 序列化）
+            timeout: 脚本执行超时时间（秒），None 使用页面默认值
+
+        Returns:
+            方法返回值
+        """
+        self.register()
+        script = (
+            f"return (window.__cua && window.__cua.version === '{self.version()}') "
+            f"? window.__cua.{method}(this, ...JSON.parse(arguments[0])) : {{__cua_missing__: true}};"
+        )
+        payload = json.dumps(list(args))
+        result = element.run_js(script, payload, timeout=timeout)
+        if isinstance(result, dict) and result.get('__cua_missing__'):
+            # 注入到元素所在的文档（可能是 iframe）
+            element.run_js(self.source())
+            result = element.run_js(script, payload, timeout=timeout)
+        return result
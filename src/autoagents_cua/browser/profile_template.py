@@ -0,0 +1,283 @@
+import os
+import sys
+import shutil
+import tempfile
+import threading
+from time import monotonic
+from ..utils.logging import logger
+
+
+
+class ClonedProfile:
+    """
+    从模板克隆出的用户目录 - 浏览器关闭后调用 release() 合并缓存并删除
+
+    使用示例:
+        with template.clone() as profile:
+            operator = WebOperator(user_data_dir=profile.path)
+            ...
+            operator.close()
+    """
+
+    def __init__(self, template, path, stats):
+        """
+        初始化克隆（由 ProfileTemplate.clone() 创建）
+
+        Args:
+            template: 来源模板
+            path: 克隆目录
+            stats: 克隆统计 {'reflinked', 'hardlinked', 'copied', 'bytes', 'elapsed'}
+        """
+        self.template = template
+        self.path = path
+        self.stats = stats
+        self.released = False
+
+    def merge_back(self, names=None):
+        """
+        把克隆中的指定目录（默认为模板的 merge 配置）写回模板，保持模板缓存是热的
+
+        Args:
+            names: 目录名列表，如 ('Cache', 'Code Cache')；None 使用模板的 merge 配置
+
+        Returns:
+            写回的目录数
+        """
+        return self.template.merge_from(self.path, names)
+
+    def discard(self):
+        """删除克隆目录"""
+        shutil.rmtree(self.path, ignore_errors=True)
+        logger.debug(f"已删除克隆的用户目录: {self.path}")
+
+    def release(self):
+        """按模板配置合并缓存后删除克隆目录（重复调用无副作用；需在浏览器关闭后调用）"""
+        if self.released:
+            return
+        self.released = True
+        if self.template.merge:
+            self.merge_back()
+        self.discard()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    def __repr__(self):
+        return f"ClonedProfile(path={self.path}, stats={self.stats})"
+
+
+class ProfileTemplate:
+    """
+    浏览器用户目录模板 - 预先初始化好的用户目录（扩展、首次运行状态、磁盘缓存），为每个实例廉价地克隆一份
+
+    同一个用户目录不能被多个浏览器同时使用，模板本身从不直接启动浏览器，每个实例使用自己的克隆：
+    - reflink：文件系统支持写时复制时（Btrfs / XFS 的 FICLONE，macOS APFS 的 clonefile）整个目录零拷贝克隆
+    - hardlink：不支持 reflink 时，浏览器不会原地修改的文件（扩展、LevelDB 表文件等）使用硬链接
+    - copy：其余文件使用系统的快速复制路径（shutil.copy2，Linux 上为 sendfile）
+    实例关闭后克隆被删除，或者把 merge 中的目录（默认不合并）写回模板，让之后的实例继续使用热缓存。
+
+    使用示例:
+        template = ProfileTemplate('profiles/base', merge=('Cache', 'Code Cache'))
+        template.initialize(lambda operator: operator.navigate('https://example.com'))
+        operator = WebOperator(profile_template=template)
+        pool = BrowserPool(size=4, profile_template=template)
+    """
+
+    MODES = ('auto', 'reflink', 'hardlink', 'copy')
+
+    # 不复制的文件和目录：单例锁、调试端口、崩溃报告
+    SKIP_NAMES = frozenset((
+        'SingletonLock', 'SingletonSocket', 'SingletonCookie', 'lockfile', 'LOCK',
+        'DevToolsActivePort', 'RunningChromeVersion', 'Crashpad', 'Crash Reports', 'BrowserMetrics',
+    ))
+
+    # 浏览器只整体替换、不会原地修改的内容，可以安全地使用硬链接
+    HARDLINK_DIRS = frozenset(('Extensions', 'Dictionaries', 'extensions_crx_cache', 'component_crx_cache',
+                               'WidevineCdm'))
+    HARDLINK_SUFFIXES = ('.ldb', '.sst')
+
+    # Linux FICLONE ioctl
+    FICLONE = 0x40049409
+
+    def __init__(self, path, mode='auto', merge=(), clone_dir=None):
+        """
+        初始化模板
+
+        Args:
+            path: 模板目录
+            mode: 克隆方式，'auto'（优先 reflink，否则硬链接 + 复制）| 'reflink' | 'hardlink' | 'copy'
+            merge: 实例释放时写回模板的目录名，如 ('Cache', 'Code Cache', 'GPUCache')
+            clone_dir: 克隆目录的父目录，None 使用系统临时目录（与模板在同一文件系统时 reflink / 硬链接才可用）
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"不支持的克隆方式: {mode}，可选: {', '.join(self.MODES)}")
+        self.path = os.path.abspath(path)
+        self.mode = mode
+        self.merge = tuple(merge or ())
+        self.clone_dir = clone_dir
+        self._reflink_supported = None if mode in ('auto', 'reflink') else False
+        self._lock = threading.Lock()
+
+    @property
+    def exists(self):
+        """模板是否已初始化"""
+        return os.path.isdir(self.path) and bool(os.listdir(self.path))
+
+    def initialize(self, prepare=None, force=False, headless=True, **operator_kwargs):
+        """
+        启动一次浏览器初始化模板（完成首次运行，可在 prepare 中安装扩展、访问页面预热缓存）
+
+        Args:
+            prepare: 可选，prepare(operator) 在浏览器关闭前执行
+            force: 模板已存在时是否删除后重新初始化
+            headless: 是否使用无头模式
+            **operator_kwargs: 创建 WebOperator 的其他参数
+
+        Returns:
+            是否成功
+        """
+        if self.exists and not force:
+            return True
+        from .web_operator import WebOperator
+        with self._lock:
+            shutil.rmtree(self.path, ignore_errors=True)
+            os.makedirs(self.path, exist_ok=True)
+            operator = None
+            try:
+                operator = WebOperator(headless=headless, user_data_dir=self.path, settle_learner=False,
+                                       **operator_kwargs)
+                if prepare:
+                    prepare(operator)
+                logger.success(f"✅ 用户目录模板已初始化: {self.path}")
+                return True
+            except Exception as e:
+                logger.error(f"❌ 初始化用户目录模板失败: {e}")
+                return False
+            finally:
+                if operator is not None:
+                    operator.close()
+
+    # ========== 克隆 ==========
+
+    def clone(self, dest=None):
+        """
+        克隆模板
+
+        Args:
+            dest: 克隆目录（必须不存在或为空），None 时在 clone_dir 下新建临时目录
+
+        Returns:
+            ClonedProfile
+        """
+        if dest is None:
+            if self.clone_dir:
+                os.makedirs(self.clone_dir, exist_ok=True)
+            dest = tempfile.mkdtemp(prefix='cua-profile-', dir=self.clone_dir)
+        os.makedirs(dest, exist_ok=True)
+        stats = {'reflinked': 0, 'hardlinked': 0, 'copied': 0, 'bytes': 0}
+        start = monotonic()
+        with self._lock:
+            if os.path.isdir(self.path):
+                self._clone_tree(self.path, dest, stats, shareable=False)
+        stats['elapsed'] = round(monotonic() - start, 3)
+        logger.debug(f"已克隆用户目录模板 {self.path} -> {dest}: {stats}")
+        return ClonedProfile(self, dest, stats)
+
+    def _clone_tree(self, source, target, stats, shareable):
+        for entry in os.scandir(source):
+            if entry.name in self.SKIP_NAMES or entry.is_symlink():
+                continue
+            destination = os.path.join(target, entry.name)
+            if entry.is_dir():
+                os.makedirs(destination, exist_ok=True)
+                self._clone_tree(entry.path, destination, stats,
+                                 shareable or entry.name in self.HARDLINK_DIRS)
+            else:
+                kind = self._clone_file(entry.path, destination,
+                                        shareable or entry.name.endswith(self.HARDLINK_SUFFIXES))
+                stats[kind] += 1
+                stats['bytes'] += entry.stat().st_size
+
+    def _clone_file(self, source, destination, shareable):
+        """克隆单个文件，返回使用的方式"""
+        if self._reflink_supported is not False:
+            try:
+                self._reflink(source, destination)
+                self._reflink_supported = True
+                return 'reflinked'
+            except OSError as e:
+                if os.path.exists(destination):
+                    os.remove(destination)
+                if self.mode == 'reflink':
+                    raise
+                logger.debug(f"文件系统不支持 reflink，改用硬链接 / 复制: {e}")
+                self._reflink_supported = False
+        if shareable and self.mode != 'copy':
+            try:
+                os.link(source, destination)
+                return 'hardlinked'
+            except OSError:
+                # 跨文件系统等情况无法硬链接
+                pass
+        shutil.copy2(source, destination)
+        return 'copied'
+
+    @classmethod
+    def _reflink(cls, source, destination):
+        """写时复制克隆文件，不支持时抛出 OSError"""
+        if sys.platform.startswith('linux'):
+            import fcntl
+            with open(source, 'rb') as src, open(destination, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), cls.FICLONE, src.fileno())
+        elif sys.platform == 'darwin':
+            import ctypes
+            libc = ctypes.CDLL('libc.dylib', use_errno=True)
+            if libc.clonefile(os.fsencode(source), os.fsencode(destination), 0) != 0:
+                errno = ctypes.get_errno()
+                raise OSError(errno, os.strerror(errno))
+        else:
+            raise OSError(f"{sys.platform} 不支持 reflink")
+        shutil.copystat(source, destination)
+
+    # ========== 合并 ==========
+
+    def merge_from(self, profile_path, names=None):
+        """
+        把另一个用户目录中的指定目录写回模板（整体替换模板中的同名目录）
+
+        Args:
+            profile_path: 已关闭浏览器的用户目录
+            names: 目录名列表，None 使用 merge 配置
+
+        Returns:
+            写回的目录数
+        """
+        names = set(self.merge if names is None else names)
+        if not names:
+            return 0
+        merged = 0
+        with self._lock:
+            for root, dirs, _ in os.walk(profile_path):
+                for name in [d for d in dirs if d in names]:
+                    dirs.remove(name)
+                    source = os.path.join(root, name)
+                    target = os.path.join(self.path, os.path.relpath(source, profile_path))
+                    try:
+                        # 先复制到临时目录再替换，避免中途失败留下不完整的缓存
+                        staging = f"{target}.merging"
+                        shutil.rmtree(staging, ignore_errors=True)
+                        shutil.copytree(source, staging, ignore=shutil.ignore_patterns(*self.SKIP_NAMES))
+                        shutil.rmtree(target, ignore_errors=True)
+                        os.replace(staging, target)
+                        merged += 1
+                    except Exception as e:
+                        logger.warning(f"⚠️  写回模板失败 {name}: {e}")
+        if merged:
+            logger.debug(f"已把 {merged} 个目录写回用户目录模板: {self.path}")
+        return merged
+
+    def __repr__(self):
+        return f"ProfileTemplate(path={self.path}, mode={self.mode}, merge={self.merge})"
@@ -0,0 +1,387 @@
+import base64
+import queue
+import threading
+from collections import deque
+from fnmatch import fnmatchcase
+from time import monotonic
+from ..utils.logging import logger
+from ..utils.helpers import percentile
+from .cdp_session import CDPSession
+
+
+
+class RequestInterceptor:
+    """
+    请求拦截引擎 - 基于 Fetch 域暂停请求，由处理函数逐个决定放行、修改、拦截或直接返回响应
+
+    - 只暂停处理函数注册的 URL 模式 / 资源类型，其他请求不经过拦截
+    - requestPaused 事件只在 CDP 会话的事件线程中入队，由专用线程调用处理函数并回复，
+      处理函数再慢也不会阻塞生命周期、网络统计等其他事件
+    - 回复默认不等待浏览器确认（请求可能已被取消，不能因此卡住后续请求）
+    - 处理函数出错时按原样放行，保证不会有请求一直停在暂停状态
+    - 不需要逐个请求判断的固定请求头用 set_extra_headers()（Network.setExtraHTTPHeaders），完全不暂停请求
+
+    处理函数接收 Fetch.requestPaused 的参数字典，返回值：
+    - None / 'continue': 原样放行
+    - 'fail': 以 BlockedByClient 拦截
+    - {'action': 'continue', 'headers': {...}, 'url': ..., 'method': ..., 'post_data': ...}:
+      修改后放行，headers 与原请求头合并，值为 None 表示删除该请求头
+    - {'action': 'fail', 'reason': 'BlockedByClient'}
+    - {'action': 'fulfill', 'status': 200, 'headers': {...}, 'body': str 或 bytes}: 不发出请求，直接返回响应
+
+    使用示例:
+        interceptor = RequestInterceptor(page)
+        interceptor.add_handler(lambda request: {'headers': {'X-Debug': '1'}}, url_pattern='*/api/*')
+        interceptor.set_extra_headers({'Accept-Language': 'zh-CN'})
+        print(RequestInterceptor.format_metrics(interceptor.metrics()))
+    """
+
+    # 回复类型
+    ACTIONS = ('continue', 'fail', 'fulfill')
+
+    # 各回复命令对应的计数项
+    _COUNTERS = {
+        'Fetch.continueRequest': 'continued',
+        'Fetch.failRequest': 'failed',
+        'Fetch.fulfillRequest': 'fulfilled',
+    }
+
+    # 保留的耗时样本数
+    METRIC_WINDOW = 1000
+
+    def __init__(self, page, session=None, wait_ack=False):
+        """
+        初始化拦截引擎（添加处理函数后才开始暂停请求）
+
+        Args:
+            page: DrissionPage 的页面对象
+            session: 可选，共享的 CDPSession；None 时自行创建
+            wait_ack: 回复后是否等待浏览器确认（调试用，会增加每个请求的耗时）
+        """
+        self.page = page
+        self.session = session or CDPSession(page)
+        self.wait_ack = wait_ack
+        self.extra_headers = {}
+
+        self._handlers = []
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._worker = None
+        self._subscribed = False
+        self._fetch_patterns = None
+        self.reset_metrics()
+
+    # ========== 处理函数 ==========
+
+    def add_handler(self, handler, url_pattern='*', resource_types=None):
+        """
+        添加处理函数（按添加顺序调用，第一个返回 fail / fulfill 的结果生效，continue 的修改依次合并）
+
+        Args:
+            handler: 处理函数，参数为 Fetch.requestPaused 的参数字典
+            url_pattern: 暂停的 URL 模式（支持 * 和 ? 通配符）
+            resource_types: 只暂停这些资源类型（CDP ResourceType，字符串或列表），None 表示全部
+
+        Returns:
+            是否成功
+        """
+        if isinstance(resource_types, str):
+            resource_types = [resource_types]
+        entry = {
+            'handler': handler,
+            'url_pattern': url_pattern or '*',
+            'resource_types': frozenset(resource_types) if resource_types else None,
+        }
+        with self._lock:
+            self._handlers.append(entry)
+        return self._sync()
+
+    def remove_handler(self, handler):
+        """
+        移除处理函数（没有处理函数后停止暂停请求）
+
+        Args:
+            handler: add_handler() 添加的处理函数
+
+        Returns:
+            是否成功
+        """
+        with self._lock:
+            self._handlers = [entry for entry in self._handlers if entry['handler'] != handler]
+        return self._sync()
+
+    def _patterns(self):
+        """根据处理函数生成 Fetch.enable 的暂停模式（调用方需持有锁）"""
+        patterns = []
+        for entry in self._handlers:
+            for resource_type in sorted(entry['resource_types'] or [None]):
+                pattern = {'urlPattern': entry['url_pattern'], 'requestStage': 'Request'}
+                if resource_type:
+                    pattern['resourceType'] = resource_type
+                if pattern not in patterns:
+                    patterns.append(pattern)
+        return patterns
+
+    def _sync(self):
+        """让 Fetch 的暂停模式与当前处理函数一致"""
+        with self._lock:
+            patterns = self._patterns()
+        if patterns == self._fetch_patterns:
+            return True
+        try:
+            if patterns:
+                if not self.session.start():
+                    return False
+                if not self._subscribed:
+                    self.session.on('Fetch.requestPaused', self._on_request_paused)
+                    self._subscribed = True
+                self._start_worker()
+                # 重复调用 Fetch.enable 会直接替换暂停模式
+                self.session.run('Fetch.enable', patterns=patterns)
+            elif self.session.is_running:
+                self.session.run('Fetch.disable')
+            self._fetch_patterns = patterns
+            return True
+        except Exception as e:
+            logger.error(f"❌ 更新请求拦截模式失败: {e}")
+            return False
+
+    # ========== 固定请求头 ==========
+
+    def set_extra_headers(self, headers):
+        """
+        为之后的所有请求设置额外请求头（浏览器直接添加，不暂停请求）
+
+        Args:
+            headers: 请求头字典，空字典表示清除
+
+        Returns:
+            是否成功
+        """
+        if not self.session.start():
+            return False
+        try:
+            headers = {name: str(value) for name, value in (headers or {}).items()}
+            self.session.enable('Network')
+            self.session.run('Network.setExtraHTTPHeaders', headers=headers)
+            self.extra_headers = headers
+            return True
+        except Exception as e:
+            logger.error(f"❌ 设置额外请求头失败: {e}")
+            return False
+
+    # ========== 请求处理 ==========
+
+    def _start_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._worker = threading.Thread(target=self._work, name='request-interceptor', daemon=True)
+        self._worker.start()
+
+    def _on_request_paused(self, params):
+        # 运行在 CDP 会话的事件线程中，只入队
+        self._queue.put((params, monotonic()))
+        pending = self._queue.qsize()
+        if pending > self._stats['queue_peak']:
+            self._stats['queue_peak'] = pending
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            params, received = item
+            self._handle(params, received)
+
+    def _handle(self, params, received):
+        request_id = params['requestId']
+        started = monotonic()
+        try:
+            decision = self._decide(params)
+        except Exception as e:
+            logger.debug(f"请求处理函数出错，按原样放行 {params['request'].get('url')}: {e}")
+            self._count('errors')
+            decision = {'action': 'continue'}
+        handled = monotonic()
+
+        try:
+            method, kwargs = self._command(params, decision)
+            self._send(method, requestId=request_id, **kwargs)
+        except Exception as e:
+            logger.debug(f"回复被暂停的请求失败 {params['request'].get('url')}: {e}")
+            self._count('errors')
+            try:
+                self._send('Fetch.continueRequest', requestId=request_id)
+            except Exception:
+                pass
+            method = 'Fetch.continueRequest'
+
+        done = monotonic()
+        with self._lock:
+            self._stats['paused'] += 1
+            self._stats[self._COUNTERS[method]] += 1
+            if method == 'Fetch.continueRequest' and len(decision) > 1:
+                self._stats['modified'] += 1
+            self._overhead.append(done - received)
+            self._handler_time.append(handled - started)
+
+    def _send(self, method, **kwargs):
+        if not self.wait_ack:
+            kwargs['_timeout'] = 0
+        self.session.run(method, **kwargs)
+
+    def _decide(self, params):
+        """依次调用匹配的处理函数，返回合并后的决定"""
+        url = params['request']['url']
+        resource_type = params.get('resourceType')
+        with self._lock:
+            handlers = list(self._handlers)
+
+        merged = {'action': 'continue'}
+        for entry in handlers:
+            if entry['resource_types'] is not None and resource_type not in entry['resource_types']:
+                continue
+            if not fnmatchcase(url, entry['url_pattern']):
+                continue
+            decision = self._normalize(entry['handler'](params))
+            if decision['action'] != 'continue':
+                return decision
+            if 'headers' in decision:
+                merged['headers'] = {**merged.get('headers', {}), **decision.pop('headers')}
+            merged.update({key: value for key, value in decision.items() if key != 'action'})
+        return merged
+
+    def _normalize(self, decision):
+        if decision is None:
+            return {'action': 'continue'}
+        if isinstance(decision, str):
+            decision = {'action': decision}
+        decision = dict(decision)
+        decision.setdefault('action', 'continue')
+        if decision['action'] not in self.ACTIONS:
+            raise ValueError(f"不支持的拦截操作: {decision['action']}，可选: {', '.join(self.ACTIONS)}")
+        return decision
+
+    @staticmethod
+    def _header_list(headers):
+        # CDP 的 Network 事件把同名响应头（如多个 Set-Cookie）用换行合并为一个值，这里拆回多项
+        return [{'name': name, 'value': line} for name, value in headers.items() if value is not None
+                for line in str(value).split('\n')]
+
+    @staticmethod
+    def _encode(data):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        return base64.b64encode(data).decode('ascii')
+
+    def _command(self, params, decision):
+        """把决定转换为 Fetch 命令 (方法名, 参数)"""
+        action = decision['action']
+        if action == 'fail':
+            return 'Fetch.failRequest', {'errorReason': decision.get('reason', 'BlockedByClient')}
+        if action == 'fulfill':
+            kwargs = {
+                'responseCode': int(decision.get('status', 200)),
+                'responseHeaders': self._header_list(decision.get('headers', {})),
+            }
+            if decision.get('body') is not None:
+                kwargs['body'] = self._encode(decision['body'])
+            return 'Fetch.fulfillRequest', kwargs
+
+        kwargs = {}
+        if decision.get('headers'):
+            # 请求头名称不区分大小写，修改时替换原有的同名请求头
+            overrides = {name.lower(): (name, value) for name, value in decision['headers'].items()}
+            headers = {name: value for name, value in params['request'].get('headers', {}).items()
+                       if name.lower() not in overrides}
+            headers.update({name: value for name, value in overrides.values()})
+            kwargs['headers'] = self._header_list(headers)
+        if decision.get('url'):
+            kwargs['url'] = decision['url']
+        if decision.get('method'):
+            kwargs['method'] = decision['method']
+        if decision.get('post_data') is not None:
+            kwargs['postData'] = self._encode(decision['post_data'])
+        return 'Fetch.continueRequest', kwargs
+
+    # ========== 耗时统计 ==========
+
+    def reset_metrics(self):
+        """清空统计"""
+        with self._lock:
+            self._stats = {'paused': 0, 'continued': 0, 'modified': 0, 'failed': 0, 'fulfilled': 0,
+                           'errors': 0, 'queue_peak': 0}
+            self._overhead = deque(maxlen=self.METRIC_WINDOW)
+            self._handler_time = deque(maxlen=self.METRIC_WINDOW)
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    @staticmethod
+    def _summary(samples):
+        """耗时样本（秒）的统计，单位毫秒"""
+        if not samples:
+            return {'count': 0, 'mean': None, 'p50': None, 'p95': None, 'max': None}
+        samples = sorted(samples)
+        return {
+            'count': len(samples),
+            'mean': round(sum(samples) / len(samples) * 1000, 2),
+            'p50': round(percentile(samples, 50) * 1000, 2),
+            'p95': round(percentile(samples, 95) * 1000, 2),
+            'max': round(samples[-1] * 1000, 2),
+        }
+
+    def metrics(self):
+        """
+        拦截统计和耗时
+
+        Returns:
+            {'paused', 'continued', 'modified', 'failed', 'fulfilled', 'errors', 'pending', 'queue_peak',
+             'overhead_ms': 从收到事件到回复浏览器的耗时 {'count', 'mean', 'p50', 'p95', 'max'},
+             'handler_ms': 其中处理函数的耗时（格式同上）}
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            overhead, handler_time = list(self._overhead), list(self._handler_time)
+        stats['pending'] = self._queue.qsize()
+        stats['overhead_ms'] = self._summary(overhead)
+        stats['handler_ms'] = self._summary(handler_time)
+        return stats
+
+    @staticmethod
+    def format_metrics(metrics):
+        """
+        统计信息的简短描述
+
+        Args:
+            metrics: metrics() 的返回值
+
+        Returns:
+            描述字符串
+        """
+        if not metrics or not metrics['paused']:
+            return "没有被暂停的请求"
+        overhead = metrics['overhead_ms']
+        return (f"已处理 {metrics['paused']} 个请求（放行 {metrics['continued']} / 拦截 {metrics['failed']} / "
+                f"直接响应 {metrics['fulfilled']}），拦截耗时 p50 {overhead['p50']} ms / "
+                f"p95 {overhead['p95']} ms / 最大 {overhead['max']} ms")
+
+    # ========== 关闭 ==========
+
+    def close(self):
+        """移除所有处理函数、清除额外请求头并停止处理线程（会话由创建者关闭）"""
+        with self._lock:
+            self._handlers = []
+        if self.session.is_running:
+            self._sync()
+            if self.extra_headers:
+                self.set_extra_headers({})
+        if self._subscribed:
+            self.session.off('Fetch.requestPaused', self._on_request_paused)
+            self._subscribed = False
+        self._fetch_patterns = None
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join(timeout=1)
+        self._worker = None
@@ -0,0 +1,317 @@
+import threading
+from urllib.parse import urlparse
+from ..utils.logging import logger
+from .cdp_session import CDPSession
+from .request_interceptor import RequestInterceptor
+
+
+
+class ResourcePolicy:
+    """
+    资源加载策略 - 在页面加载时拦截不需要的资源（图片、字体、视频、第三方追踪器等）
+
+    - 按 URL 模式拦截：Network.setBlockedURLs，由浏览器直接拦截，没有额外往返
+    - 按资源类型 / 第三方拦截：通过 RequestInterceptor 只暂停匹配的请求，逐个决定放行或拦截
+
+    同时统计每次导航的请求数、下载字节数和被拦截的请求数。被拦截的请求没有实际下载，
+    节省的字节数按资源类型的典型大小估算。
+
+    使用示例:
+        policy = ResourcePolicy('no-media')
+        policy = ResourcePolicy(['no-media', 'no-trackers'], block_patterns=['*.gif'])
+        operator = WebOperator(resource_policy='text-only')
+    """
+
+    # 常见统计 / 广告追踪器
+    TRACKER_PATTERNS = (
+        '*google-analytics.com/*', '*googletagmanager.com/*', '*doubleclick.net/*',
+        '*googlesyndication.com/*', '*adservice.google.com/*', '*connect.facebook.net/*',
+        '*hotjar.com/*', '*segment.io/*', '*mixpanel.com/*', '*scorecardresearch.com/*',
+        '*hm.baidu.com/*', '*cnzz.com/*',
+    )
+
+    # 预设
+    PRESETS = {
+        # 只保留文档和脚本（不加载样式表时页面布局会变化，元素可见性判断可能不准确）
+        'text-only': {'block_types': ('Image', 'Media', 'Font', 'Stylesheet')},
+        'no-media': {'block_types': ('Image', 'Media', 'Font')},
+        'first-party-only': {'first_party_only': True},
+        'no-trackers': {'block_patterns': TRACKER_PATTERNS},
+    }
+
+    # 各类资源的典型传输大小（字节），用于估算被拦截请求节省的流量
+    ESTIMATED_SIZES = {
+        'Image': 20_000,
+        'Media': 300_000,
+        'Font': 30_000,
+        'Stylesheet': 15_000,
+        'Script': 25_000,
+        'Document': 30_000,
+        'XHR': 5_000,
+        'Fetch': 5_000,
+    }
+    DEFAULT_ESTIMATED_SIZE = 5_000
+
+    # 常见的二级公共后缀（没有完整公共后缀列表时近似判断站点）
+    SECOND_LEVEL_SUFFIXES = ('co', 'com', 'net', 'org', 'gov', 'edu', 'ac')
+
+    def __init__(self, preset=None, block_types=(), block_patterns=(), first_party_only=False, allow_patterns=()):
+        """
+        初始化资源策略
+
+        Args:
+            preset: 预设名称或名称列表：'text-only' | 'no-media' | 'first-party-only' | 'no-trackers'
+            block_types: 额外拦截的资源类型（CDP ResourceType，如 'Image'、'Media'、'Font'）
+            block_patterns: 额外拦截的 URL 模式（支持 * 通配符）
+            first_party_only: 是否拦截第三方站点的请求
+            allow_patterns: 始终放行的 URL 子串（优先于资源类型和第三方拦截）
+        """
+        presets = [preset] if isinstance(preset, str) else list(preset or [])
+        types, patterns = set(block_types), list(block_patterns)
+        for name in presets:
+            if name not in self.PRESETS:
+                raise ValueError(f"未知的资源策略预设: {name}，可选: {', '.join(self.PRESETS)}")
+            config = self.PRESETS[name]
+            types.update(config.get('block_types', ()))
+            patterns.extend(config.get('block_patterns', ()))
+            first_party_only = first_party_only or config.get('first_party_only', False)
+
+        self.presets = presets
+        self.block_types = frozenset(types)
+        self.block_patterns = list(dict.fromkeys(patterns))
+        self.first_party_only = first_party_only
+        self.allow_patterns = tuple(allow_patterns)
+
+        self.page = None
+        self.session = None
+        self.interceptor = None
+        self._main_frame = None
+        self._first_party = None
+        self._request_types = {}
+        self._lock = threading.Lock()
+        self._current = None
+        self.history = []
+        self.totals = self._new_stats(None)
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        从配置创建策略
+
+        Args:
+            config: None / 预设名称 / 预设名称列表 / 参数字典 / ResourcePolicy 实例
+
+        Returns:
+            ResourcePolicy 实例，config 为空时返回 None
+        """
+        if not config:
+            return None
+        if isinstance(config, cls):
+            return config
+        if isinstance(config, dict):
+            return cls(**config)
+        return cls(preset=config)
+
+    def clone(self):
+        """
+        复制策略配置（不含页面状态和统计），用于其他标签页
+
+        Returns:
+            新的 ResourcePolicy 实例
+        """
+        policy = ResourcePolicy(block_types=self.block_types, block_patterns=self.block_patterns,
+                                first_party_only=self.first_party_only, allow_patterns=self.allow_patterns)
+        policy.presets = list(self.presets)
+        return policy
+
+    @property
+    def needs_interception(self):
+        """是否需要 Fetch 拦截（按资源类型或第三方判断）"""
+        return bool(self.block_types) or self.first_party_only
+
+    def __repr__(self):
+        return (f"ResourcePolicy(presets={self.presets}, block_types={sorted(self.block_types)}, "
+                f"patterns={len(self.block_patterns)}, first_party_only={self.first_party_only})")
+
+    # ========== 挂载 ==========
+
+    def attach(self, page, session=None, interceptor=None):
+        """
+        把策略应用到页面
+
+        Args:
+            page: DrissionPage 的页面对象
+            session: 可选，共享的 CDPSession；None 时自行创建
+            interceptor: 可选，共享的 RequestInterceptor；None 时按需自行创建
+
+        Returns:
+            是否成功
+        """
+        self.page = page
+        self.session = session or CDPSession(page)
+        if not self.session.start():
+            return False
+        try:
+            self._main_frame = page._target_id
+            self.session.on('Network.requestWillBeSent', self._on_request)
+            self.session.on('Network.loadingFinished', self._on_finished)
+            self.session.on('Network.loadingFailed', self._on_failed)
+            self.session.enable('Network')
+            if self.block_patterns:
+                self.session.run('Network.setBlockedURLs', urls=self.block_patterns)
+            if self.needs_interception:
+                self.interceptor = interceptor or RequestInterceptor(page, self.session)
+                # 第三方模式下需要判断全部请求，否则只暂停被拦截的资源类型
+                resource_types = None if self.first_party_only else sorted(self.block_types)
+                if not self.interceptor.add_handler(self._on_request_paused, resource_types=resource_types):
+                    return False
+            logger.success(f"✅ 资源策略已启用: {', '.join(self.presets) or '自定义'}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ 资源策略启用失败: {e}")
+            return False
+
+    def detach(self):
+        """取消策略（恢复正常加载）"""
+        if self.session is None or not self.session.is_running:
+            return
+        try:
+            if self.block_patterns:
+                self.session.run('Network.setBlockedURLs', urls=[])
+            if self.interceptor is not None:
+                self.interceptor.remove_handler(self._on_request_paused)
+                self.interceptor = None
+            self.session.off('Network.requestWillBeSent', self._on_request)
+            self.session.off('Network.loadingFinished', self._on_finished)
+            self.session.off('Network.loadingFailed', self._on_failed)
+        except Exception as e:
+            logger.warning(f"⚠️  取消资源策略失败: {e}")
+
+    # ========== 拦截判断 ==========
+
+    @classmethod
+    def site_of(cls, url):
+        """
+        URL 所属站点（近似的可注册域名，如 www.ncbi.nlm.nih.gov -> nih.gov）
+
+        Args:
+            url: URL
+
+        Returns:
+            站点字符串，无法解析时返回空字符串
+        """
+        host = (urlparse(url).hostname or '').lower()
+        labels = host.split('.')
+        if len(labels) <= 2 or host.replace('.', '').isdigit():
+            return host
+        if labels[-2] in cls.SECOND_LEVEL_SUFFIXES and len(labels[-1]) == 2:
+            return '.'.join(labels[-3:])
+        return '.'.join(labels[-2:])
+
+    def should_block(self, url, resource_type, is_main_document=False):
+        """
+        判断请求是否应该被拦截（只处理资源类型和第三方规则，URL 模式由浏览器处理）
+
+        Args:
+            url: 请求 URL
+            resource_type: CDP ResourceType
+            is_main_document: 是否为主框架文档请求
+
+        Returns:
+            是否拦截
+        """
+        if is_main_document or url.startswith('data:'):
+            return False
+        if any(pattern in url for pattern in self.allow_patterns):
+            return False
+        if resource_type in self.block_types:
+            return True
+        if self.first_party_only and self._first_party:
+            return self.site_of(url) != self._first_party
+        return False
+
+    def _on_request_paused(self, params):
+        """RequestInterceptor 处理函数：需要拦截时返回 'fail'，否则原样放行"""
+        url = params['request']['url']
+        resource_type = params.get('resourceType', 'Other')
+        is_main_document = resource_type == 'Document' and params.get('frameId') == self._main_frame
+        if is_main_document:
+            self._first_party = self.site_of(url)
+        if self.should_block(url, resource_type, is_main_document):
+            self._count_blocked(resource_type)
+            return 'fail'
+        return None
+
+    # ========== 统计 ==========
+
+    @staticmethod
+    def _new_stats(url):
+        return {'url': url, 'requests': 0, 'bytes': 0, 'blocked_requests': 0,
+                'blocked_bytes_estimate': 0, 'blocked_by_type': {}}
+
+    def _on_request(self, params):
+        resource_type = params.get('type', 'Other')
+        with self._lock:
+            # 主框架的文档请求代表一次新的导航（重定向沿用同一个 requestId，不重复计数）
+            if (resource_type == 'Document' and params.get('frameId') == self._main_frame
+                    and params.get('requestId') == params.get('loaderId') and 'redirectResponse' not in params):
+                if self._current is not None:
+                    self.history.append(self._current)
+                    del self.history[:-20]
+                self._current = self._new_stats(params['request']['url'])
+                self._request_types = {}
+            self._request_types[params['requestId']] = resource_type
+
+    def _on_finished(self, params):
+        with self._lock:
+            size = int(params.get('encodedDataLength', 0))
+            for stats in self._active_stats():
+                stats['requests'] += 1
+                stats['bytes'] += size
+            self._request_types.pop(params.get('requestId'), None)
+
+    def _on_failed(self, params):
+        # Network.setBlockedURLs 拦截的请求 blockedReason 为 'inspector'
+        resource_type = self._request_types.pop(params.get('requestId'), params.get('type', 'Other'))
+        if params.get('blockedReason') == 'inspector':
+            self._count_blocked(resource_type)
+
+    def _count_blocked(self, resource_type):
+        with self._lock:
+            estimate = self.ESTIMATED_SIZES.get(resource_type, self.DEFAULT_ESTIMATED_SIZE)
+            for stats in self._active_stats():
+                stats['blocked_requests'] += 1
+                stats['blocked_bytes_estimate'] += estimate
+                stats['blocked_by_type'][resource_type] = stats['blocked_by_type'].get(resource_type, 0) + 1
+
+    def _active_stats(self):
+        return [self.totals] if self._current is None else [self.totals, self._current]
+
+    def report(self):
+        """
+        当前（最近一次）导航的统计
+
+        Returns:
+            {'url', 'requests', 'bytes', 'blocked_requests', 'blocked_bytes_estimate', 'blocked_by_type'}，
+            还没有导航时返回 None
+        """
+        with self._lock:
+            if self._current is None:
+                return None
+            return dict(self._current, blocked_by_type=dict(self._current['blocked_by_type']))
+
+    @staticmethod
+    def format_report(stats):
+        """
+        统计信息的简短描述
+
+        Args:
+            stats: report() 的返回值
+
+        Returns:
+            描述字符串
+        """
+        if not stats:
+            return ""
+        return (f"{stats['requests']} 个请求 / {stats['bytes'] / 1024:.0f} KB，"
+                f"已拦截 {stats['blocked_requests']} 个请求（约节省 {stats['blocked_bytes_estimate'] / 1024:.0f} KB）")
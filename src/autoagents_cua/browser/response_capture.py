@@ -0,0 +1,349 @@
+import re
+import json
+import queue
+import base64
+import threading
+from fnmatch import fnmatchcase
+from time import monotonic
+from ..utils.logging import logger
+from .cdp_session import CDPSession
+
+
+
+class ResponseCapture:
+    """
+    网络响应捕获 - 按 URL 模式和内容类型捕获页面收到的响应，直接拿到接口返回的结构化数据
+
+    很多页面的数据本来就是通过 XHR / fetch 以 JSON 加载的，捕获这些响应比等待渲染后再从 DOM 中提取更快也更完整：
+    - 基于 CDP Network 事件（页面专用 CDPSession，可与请求拦截、资源策略共用），不暂停请求，不影响页面加载
+    - responseReceived 时按资源类型、内容类型和 URL 过滤，loadingFinished 后由专用线程读取响应体，
+      不阻塞 CDP 事件线程
+    - JSON 响应解析为 Python 对象（'data' 字段），其他响应保留文本 / 字节
+    - 每个响应先交给回调函数（在捕获线程中调用），再放入有界缓冲区；缓冲区满时丢弃最早的响应
+
+    捕获到的响应为字典：
+        {'url', 'status', 'mime_type', 'resource_type', 'headers', 'request_id',
+         'body': str / bytes（超过 max_body_size 时为 None）, 'data': 解析后的 JSON（非 JSON 时为 None）,
+         'elapsed': 从收到响应头到读取完响应体的耗时（秒）}
+
+    使用示例:
+        with operator.capture_responses('*/api/search*') as capture:
+            operator.navigate('https://example.com/search?q=python')
+            response = capture.wait_for(timeout=10)
+            print(response['data'])
+
+        capture = operator.capture_responses(callback=lambda response: save(response['data']))
+        for response in capture.iter(timeout=5):
+            ...
+    """
+
+    # 读取响应体时跳过的大小（字节）
+    DEFAULT_MAX_BODY_SIZE = 10 * 1024 * 1024
+
+    def __init__(self, page, url_pattern=None, content_types=('json',), resource_types=('XHR', 'Fetch'),
+                 callback=None, max_buffer=100, max_body_size=DEFAULT_MAX_BODY_SIZE, session=None):
+        """
+        初始化（调用 start() 后开始捕获）
+
+        Args:
+            page: DrissionPage 的页面对象
+            url_pattern: URL 匹配条件，通配符字符串（如 '*/api/*'）、正则表达式对象、
+                url -> bool 的函数，或它们的列表（任一匹配即可）；None 匹配所有 URL
+            content_types: 内容类型关键字，响应的 MIME 类型包含其中任一即匹配（默认 'json'）；None 不限制
+            resource_types: CDP 资源类型，如 ('XHR', 'Fetch', 'Document')；None 不限制
+            callback: 可选，callback(response) 在捕获线程中对每个响应调用
+            max_buffer: 缓冲区大小，0 表示不缓冲（只调用回调）
+            max_body_size: 响应体超过该大小（字节）时不读取
+            session: 可选，共享的 CDPSession；None 时自行创建
+        """
+        self.page = page
+        self.session = session or CDPSession(page)
+        self._owns_session = session is None
+        self.url_patterns = self._patterns(url_pattern)
+        self.content_types = tuple(content_types) if content_types else None
+        self.resource_types = set(resource_types) if resource_types else None
+        self.callback = callback
+        self.max_body_size = max_body_size
+        self.stats = {'matched': 0, 'captured': 0, 'failed': 0, 'skipped': 0, 'dropped': 0}
+        self._buffer = queue.Queue(maxsize=max_buffer) if max_buffer else None
+        self._pending = {}
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._stopped = False
+        self.running = False
+
+    @staticmethod
+    def _patterns(url_pattern):
+        if url_pattern is None:
+            return None
+        if not isinstance(url_pattern, (list, tuple)):
+            url_pattern = [url_pattern]
+        matchers = []
+        for pattern in url_pattern:
+            if isinstance(pattern, str):
+                matchers.append(lambda url, pattern=pattern: fnmatchcase(url, pattern))
+            elif isinstance(pattern, re.Pattern):
+                matchers.append(lambda url, pattern=pattern: pattern.search(url) is not None)
+            elif callable(pattern):
+                matchers.append(pattern)
+            else:
+                raise ValueError(f"不支持的 URL 匹配条件: {pattern!r}")
+        return matchers
+
+    def matches(self, url, mime_type, resource_type):
+        """
+        响应是否符合捕获条件
+
+        Args:
+            url: 响应 URL
+            mime_type: MIME 类型
+            resource_type: CDP 资源类型
+
+        Returns:
+            是否匹配
+        """
+        if self.resource_types is not None and resource_type not in self.resource_types:
+            return False
+        if self.content_types is not None and not any(t in (mime_type or '') for t in self.content_types):
+            return False
+        if self.url_patterns is not None and not any(match(url) for match in self.url_patterns):
+            return False
+        return True
+
+    # ========== 启停 ==========
+
+    def start(self):
+        """
+        开始捕获（重复调用无副作用）
+
+        Returns:
+            是否成功
+        """
+        if self.running:
+            return True
+        if not self.session.start():
+            return False
+        if self._stopped and self._buffer is not None:
+            # 再次启动时丢弃上次停止的标记
+            self._buffer = queue.Queue(maxsize=self._buffer.maxsize)
+        try:
+            self.session.enable('Network')
+            self.session.on('Network.responseReceived', self._on_response)
+            self.session.on('Network.loadingFinished', self._on_finished)
+            self.session.on('Network.loadingFailed', self._on_failed)
+        except Exception as e:
+            logger.error(f"❌ 启动响应捕获失败: {e}")
+            return False
+        self.running = True
+        self._worker = threading.Thread(target=self._work, name='response-capture', daemon=True)
+        self._worker.start()
+        logger.debug("响应捕获已启动")
+        return True
+
+    def stop(self):
+        """停止捕获（已缓冲的响应仍可读取，迭代器在读完后结束）"""
+        if not self.running:
+            return
+        self.running = False
+        self._stopped = True
+        self.session.off('Network.responseReceived', self._on_response)
+        self.session.off('Network.loadingFinished', self._on_finished)
+        self.session.off('Network.loadingFailed', self._on_failed)
+        self._queue.put(None)
+        if self._worker is not None:
+            self._worker.join(timeout=2)
+            self._worker = None
+        with self._lock:
+            self._pending.clear()
+        if self._buffer is not None:
+            self._offer(None)
+        if self._owns_session:
+            self.session.close()
+        logger.debug(f"响应捕获已停止: {self.stats}")
+
+    # ========== 事件 ==========
+
+    def _on_response(self, params):
+        # 运行在 CDP 会话的事件线程中，只做过滤
+        response = params.get('response', {})
+        if not self.matches(response.get('url', ''), response.get('mimeType'), params.get('type')):
+            return
+        with self._lock:
+            self.stats['matched'] += 1
+            self._pending[params['requestId']] = (params, monotonic())
+
+    def _on_finished(self, params):
+        with self._lock:
+            pending = self._pending.pop(params['requestId'], None)
+        if pending is not None:
+            self._queue.put((pending, params.get('encodedDataLength', 0)))
+
+    def _on_failed(self, params):
+        with self._lock:
+            if self._pending.pop(params['requestId'], None) is not None:
+                self.stats['failed'] += 1
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            (params, received), size = item
+            response = self._read(params, received, size)
+            if response is None:
+                continue
+            if self.callback is not None:
+                try:
+                    self.callback(response)
+                except Exception as e:
+                    logger.warning(f"⚠️  响应回调失败 {response['url']}: {e}")
+            if self._buffer is not None:
+                self._offer(response)
+
+    def _read(self, params, received, size):
+        """读取响应体并解析"""
+        response = params['response']
+        mime_type = response.get('mimeType', '')
+        body = data = None
+        if size > self.max_body_size:
+            with self._lock:
+                self.stats['skipped'] += 1
+            logger.debug(f"响应体过大（{size} 字节），不读取: {response['url']}")
+        else:
+            try:
+                result = self.session.run('Network.getResponseBody', requestId=params['requestId'])
+            except Exception as e:
+                # 页面已跳转或响应已被浏览器回收
+                with self._lock:
+                    self.stats['failed'] += 1
+                logger.debug(f"读取响应体失败 {response['url']}: {e}")
+                return None
+            body = result.get('body', '')
+            if result.get('base64Encoded'):
+                body = base64.b64decode(body)
+            if 'json' in mime_type:
+                try:
+                    data = json.loads(body)
+                except ValueError as e:
+                    logger.debug(f"JSON 解析失败 {response['url']}: {e}")
+        with self._lock:
+            self.stats['captured'] += 1
+        return {
+            'url': response['url'],
+            'status': response.get('status'),
+            'mime_type': mime_type,
+            'resource_type': params.get('type'),
+            'headers': response.get('headers', {}),
+            'request_id': params['requestId'],
+            'body': body,
+            'data': data,
+            'elapsed': round(monotonic() - received, 4),
+        }
+
+    def _offer(self, response):
+        """放入缓冲区，满时丢弃最早的响应"""
+        while True:
+            try:
+                self._buffer.put_nowait(response)
+                return
+            except queue.Full:
+                try:
+                    self._buffer.get_nowait()
+                    with self._lock:
+                        self.stats['dropped'] += 1
+                except queue.Empty:
+                    pass
+
+    # ========== 读取 ==========
+
+    def get(self, timeout=None):
+        """
+        取出下一个捕获的响应
+
+        Args:
+            timeout: 等待时间（秒），None 一直等待
+
+        Returns:
+            响应字典；超时或捕获已停止且缓冲区为空时返回 None
+        """
+        if self._buffer is None:
+            raise RuntimeError("max_buffer=0 时只能通过回调接收响应")
+        try:
+            response = self._buffer.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if response is None:
+            # 停止标记留给其他读取方
+            self._buffer.put(None)
+        return response
+
+    def iter(self, timeout=None):
+        """
+        逐个产出捕获的响应
+
+        Args:
+            timeout: 等待下一个响应的时间（秒），超时后结束；None 一直等待到 stop()
+
+        Yields:
+            响应字典
+        """
+        while True:
+            response = self.get(timeout)
+            if response is None:
+                return
+            yield response
+
+    def __iter__(self):
+        return self.iter()
+
+    def wait_for(self, predicate=None, timeout=10):
+        """
+        等待第一个满足条件的响应（之前不满足条件的响应被取出后丢弃）
+
+        Args:
+            predicate: 可选，predicate(response) -> bool
+            timeout: 总等待时间（秒）
+
+        Returns:
+            响应字典，超时返回 None
+        """
+        deadline = monotonic() + timeout
+        while True:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                return None
+            response = self.get(remaining)
+            if response is None:
+                return None
+            if predicate is None or predicate(response):
+                return response
+
+    def drain(self):
+        """
+        取出当前缓冲区中的全部响应（不等待）
+
+        Returns:
+            响应列表
+        """
+        responses = []
+        while self._buffer is not None:
+            try:
+                response = self._buffer.get_nowait()
+            except queue.Empty:
+                break
+            if response is None:
+                self._buffer.put(None)
+                break
+            responses.append(response)
+        return responses
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def __repr__(self):
+        return f"ResponseCapture(running={self.running}, stats={self.stats})"
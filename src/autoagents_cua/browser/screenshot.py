@@ -0,0 +1,145 @@
+import io
+import os
+import base64
+from ..utils.logging import logger
+
+
+
+class ScreenshotCapture:
+    """
+    内存截图 - 直接调用 Page.captureScreenshot，返回字节 / base64 / PIL 图片，默认不写入磁盘
+
+    - 区域：当前视口（默认）、整页、元素或裁剪矩形（页面坐标，CSS 像素）
+    - 格式：PNG / JPEG / WebP，JPEG 和 WebP 支持质量参数
+    - 缩放：scale 为输出图片相对 CSS 像素的比例（设备像素比），None 保持浏览器当前的设备像素比
+    - base64 输出直接使用 CDP 返回的数据，不经过解码再编码
+
+    使用示例:
+        capture = ScreenshotCapture(page)
+        data = capture.capture(format='jpeg', quality=70, scale=1)
+        b64 = capture.capture(page.ele('#captcha'), output='base64')
+        image = capture.capture(full_page=True, output='image')
+    """
+
+    FORMATS = ('png', 'jpeg', 'webp')
+    OUTPUTS = ('bytes', 'base64', 'image')
+
+    # JPEG / WebP 未指定质量时使用的默认质量
+    DEFAULT_QUALITY = 80
+
+    def __init__(self, page):
+        """
+        初始化截图器
+
+        Args:
+            page: DrissionPage 的页面对象
+        """
+        self.page = page
+
+    @classmethod
+    def normalize_format(cls, format):
+        """
+        规范化图片格式（'jpg' 视为 'jpeg'）
+
+        Args:
+            format: 图片格式
+
+        Returns:
+            'png' | 'jpeg' | 'webp'
+
+        Raises:
+            ValueError: 不支持的格式
+        """
+        format = (format or 'png').lower().lstrip('.')
+        format = 'jpeg' if format == 'jpg' else format
+        if format not in cls.FORMATS:
+            raise ValueError(f"不支持的截图格式: {format}，可选: {', '.join(cls.FORMATS)}")
+        return format
+
+    @classmethod
+    def mime_type(cls, format):
+        """图片格式对应的 MIME 类型"""
+        return f"image/{cls.normalize_format(format)}"
+
+    def capture(self, element=None, clip=None, full_page=False, format='png', quality=None, scale=None,
+                output='bytes', save_path=None):
+        """
+        截图
+
+        Args:
+            element: 可选，只截取该元素（DrissionPage 元素对象，会先滚动到可见位置）
+            clip: 可选，裁剪矩形 {'x', 'y', 'width', 'height'}（页面坐标，CSS 像素）
+            full_page: 是否截取整个页面（element 和 clip 都为空时生效）
+            format: 'png' | 'jpeg' | 'webp'
+            quality: JPEG / WebP 质量（0-100），None 使用默认质量
+            scale: 输出图片相对 CSS 像素的比例，None 保持浏览器当前的设备像素比
+            output: 'bytes' | 'base64' | 'image'（PIL.Image）
+            save_path: 可选，同时把截图写入该文件
+
+        Returns:
+            截图数据，失败时返回 None
+        """
+        try:
+            format = self.normalize_format(format)
+            if output not in self.OUTPUTS:
+                raise ValueError(f"不支持的输出类型: {output}，可选: {', '.join(self.OUTPUTS)}")
+
+            # 元素所在的页面或 iframe 负责截图，坐标也相对于它
+            owner = element.owner if element is not None else self.page
+            params = {'format': format}
+            if format != 'png':
+                params['quality'] = int(self.DEFAULT_QUALITY if quality is None else quality)
+
+            if element is not None:
+                element.scroll.to_see(center=True)
+                (x, y), (width, height) = element.rect.location, element.rect.size
+                clip = {'x': x, 'y': y, 'width': width, 'height': height}
+            elif clip is None and (full_page or scale is not None):
+                clip = self._page_clip(owner, full_page)
+            if clip is not None:
+                clip = {key: float(clip[key]) for key in ('x', 'y', 'width', 'height')}
+                if clip['width'] <= 0 or clip['height'] <= 0:
+                    raise RuntimeError(f"截图区域为空: {clip}")
+                clip['scale'] = self._clip_scale(owner, scale)
+                params['clip'] = clip
+                params['captureBeyondViewport'] = bool(full_page and element is None)
+
+            data = owner.run_cdp('Page.captureScreenshot', **params)['data']
+            raw = None
+            if save_path:
+                raw = base64.b64decode(data)
+                directory = os.path.dirname(os.path.abspath(save_path))
+                os.makedirs(directory, exist_ok=True)
+                with open(save_path, 'wb') as f:
+                    f.write(raw)
+                logger.debug(f"截图已写入: {save_path}")
+
+            if output == 'base64':
+                return data
+            raw = raw if raw is not None else base64.b64decode(data)
+            if output == 'image':
+                from PIL import Image
+                return Image.open(io.BytesIO(raw))
+            return raw
+        except Exception as e:
+            logger.error(f"❌ 截图失败: {e}")
+            return None
+
+    @staticmethod
+    def _page_clip(owner, full_page):
+        """整页或当前视口的裁剪矩形（页面坐标）"""
+        metrics = owner.run_cdp('Page.getLayoutMetrics')
+        if full_page:
+            size = metrics.get('cssContentSize') or metrics['contentSize']
+            return {'x': 0, 'y': 0, 'width': size['width'], 'height': size['height']}
+        viewport = metrics.get('cssVisualViewport') or metrics['visualViewport']
+        return {'x': viewport['pageX'], 'y': viewport['pageY'],
+                'width': viewport['clientWidth'], 'height': viewport['clientHeight']}
+
+    @staticmethod
+    def _clip_scale(owner, scale):
+        """CDP 的 clip.scale 会再乘以设备像素比，换算出需要传入的值"""
+        if scale is None:
+            return 1
+        ratio = owner.run_js('return window.devicePixelRatio') or 1
+        return scale / ratio
@@ -0,0 +1,975 @@
+/**
+ * AutoAgents CUA 页面运行时
+ *
+ * 通过 Page.addScriptToEvaluateOnNewDocument 在每个文档加载前注册一次，
+ * Python 侧只需调用 window.__cua.extract({...}) 等短函数，不再每次发送完整脚本。
+ *
+ * __CUA_VERSION__ 由 Python 侧（PageRuntime）替换为脚本内容的哈希，
+ * 脚本变更后会自动替换页面中的旧版本。
+ */
+(function () {
+    'use strict';
+
+    const VERSION = '__CUA_VERSION__';
+    if (window.__cua && window.__cua.version === VERSION) {
+        return;
+    }
+    if (window.__cua && window.__cua.dispose) {
+        window.__cua.dispose();
+    }
+
+    // 元素索引标记（Python 侧 ElementHandle 通过该标记定位元素）
+    const MARKER = 'data-extractor-index';
+    // Shadow host / iframe 标记（ElementHandle 沿 host 路径逐层进入）
+    const HOST_MARKER = 'data-extractor-host';
+    const HIGHLIGHT_ID = 'eko-highlight-container';
+    // Canvas 高亮层的宿主元素（canvas 位于其封闭的 shadow root 中，页面脚本和提取都看不到 canvas 本身）
+    const OVERLAY_ID = 'cua-highlight-overlay';
+
+    // 可交互元素选择器
+    const SELECTORS = [
+        'a[href]',
+        'button',
+        'input:not([type="hidden"])',
+        'select',
+        'textarea',
+        '[role="button"]',
+        '[onclick]',
+        '[tabindex]'
+    ].join(',');
+
+    // 需要提取的属性列表
+    const ATTRS = ['id', 'class', 'name', 'type', 'href', 'value', 'placeholder', 'title', 'role', 'aria-label', 'tabindex'];
+
+    // 增量模式下会影响可见性或元素描述的属性
+    const OBSERVED_ATTRS = ATTRS.concat(['style', 'hidden', 'disabled', 'onclick', 'open', 'aria-hidden']);
+    const HOST_MARKER_SELECTOR = '[' + HOST_MARKER + ']';
+
+    // 高亮颜色池
+    const COLORS = [
+        '#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8',
+        '#F7DC6F', '#BB8FCE', '#85C1E2', '#F8B739', '#52B788'
+    ];
+
+    const state = {
+        nextIndex: 1,
+        nextHostId: 1,
+        tracked: new Map(),     // index -> element
+        signatures: new Map(),  // index -> 元素描述的 JSON（增量模式用于判断变化）
+        dirty: new Set(),
+        observer: null,
+        frameListeners: new WeakSet(),
+        overlay: null,          // canvas 高亮层 {host, canvas, boxes, views, pending, ...}
+        writes: [],             // 延迟的 DOM 写入 [el, attr, value]
+        pendingHosts: new Map() // 尚未写入的 host 标记 element -> id
+    };
+
+    const OBSERVE_OPTIONS = {
+        childList: true,
+        subtree: true,
+        characterData: true,
+        attributes: true,
+        attributeFilter: OBSERVED_ATTRS
+    };
+
+    // ========== 跨 Shadow DOM / iframe 遍历 ==========
+
+    function isFrame(el) {
+        return el.tagName === 'IFRAME' || el.tagName === 'FRAME';
+    }
+
+    // 同源 iframe 返回其 document，跨域或未加载返回 null
+    function frameDocument(frame) {
+        try {
+            const doc = frame.contentDocument;
+            return doc && doc.documentElement ? doc : null;
+        } catch (e) {
+            return null;
+        }
+    }
+
+    // 进入新的作用域（shadow root / iframe 文档）时，增量模式下同样需要监听它的变化
+    function enterScope(scope, frame) {
+        if (state.observer) {
+            state.observer.observe(scope.nodeType === 9 ? scope.documentElement : scope, OBSERVE_OPTIONS);
+        }
+        if (frame && !state.frameListeners.has(frame)) {
+            // iframe 内部跳转不会在父文档产生 mutation，用 load 事件标记为脏
+            state.frameListeners.add(frame);
+            frame.addEventListener('load', () => state.dirty.add(frame));
+        }
+    }
+
+    /**
+     * 在 scope（document / shadowRoot / 元素）内查找匹配 selector 的元素，
+     * 一次遍历中同时进入开放的 shadow root 和同源 iframe
+     */
+    function deepQuery(scope, selector, out) {
+        out = out || [];
+        if (scope.nodeType === 1 && scope.matches(selector)) {
+            out.push(scope);
+        }
+        scope.querySelectorAll(selector).forEach(el => out.push(el));
+
+        const nested = scope.nodeType === 1 ? [scope] : [];
+        scope.querySelectorAll('*').forEach(el => nested.push(el));
+        nested.forEach(el => {
+            if (el.shadowRoot) {
+                enterScope(el.shadowRoot, null);
+                deepQuery(el.shadowRoot, selector, out);
+            }
+            if (isFrame(el)) {
+                const doc = frameDocument(el);
+                if (doc) {
+                    enterScope(doc, el);
+                    deepQuery(doc, selector, out);
+                }
+            }
+        });
+        return out;
+    }
+
+    function hostId(el) {
+        let id = el.getAttribute(HOST_MARKER) || state.pendingHosts.get(el);
+        if (!id) {
+            id = String(state.nextHostId++);
+            state.pendingHosts.set(el, id);
+            queueWrite(el, HOST_MARKER, id);
+        }
+        return parseInt(id);
+    }
+
+    // 从顶层文档到元素所在作用域的 host 路径：[{type: 'shadow'|'frame', id}]
+    function hostPathOf(el) {
+        const path = [];
+        let current = el;
+        while (current) {
+            const root = current.getRootNode();
+            if (root.nodeType === 11 && root.host) {
+                path.unshift({type: 'shadow', id: hostId(root.host)});
+                current = root.host;
+            } else if (root.nodeType === 9 && root !== document) {
+                const frame = root.defaultView ? root.defaultView.frameElement : null;
+                if (!frame) break;
+                path.unshift({type: 'frame', id: hostId(frame)});
+                current = frame;
+            } else {
+                break;
+            }
+        }
+        return path;
+    }
+
+    // 元素所在 iframe 相对顶层视口的偏移（同一次提取中按文档缓存）
+    function frameOffset(el, cache) {
+        const doc = el.ownerDocument;
+        if (doc === document) {
+            return {x: 0, y: 0};
+        }
+        if (cache && cache.has(doc)) {
+            return cache.get(doc);
+        }
+        let x = 0;
+        let y = 0;
+        let view = doc.defaultView;
+        while (view && view !== window && view.frameElement) {
+            const frame = view.frameElement;
+            const rect = frame.getBoundingClientRect();
+            x += rect.left + frame.clientLeft;
+            y += rect.top + frame.clientTop;
+            view = frame.ownerDocument.defaultView;
+        }
+        const offset = {x: x, y: y};
+        if (cache) {
+            cache.set(doc, offset);
+        }
+        return offset;
+    }
+
+    // ========== 可见性（先批量读取，再统一写入） ==========
+
+    // 计算样式层面是否可见：优先使用 checkVisibility()，不支持时退回 getComputedStyle
+    const CHECK_VISIBILITY_OPTIONS = {visibilityProperty: true, checkVisibilityCSS: true};
+
+    function styleVisible(el) {
+        if (typeof el.checkVisibility === 'function') {
+            return el.checkVisibility(CHECK_VISIBILITY_OPTIONS);
+        }
+        const view = el.ownerDocument.defaultView || window;
+        const style = view.getComputedStyle(el);
+        return style.display !== 'none' && style.visibility !== 'hidden';
+    }
+
+    /**
+     * 批量测量候选元素：只读取布局和样式，期间不写 DOM，
+     * 整个批次最多触发一次样式计算和一次布局
+     *
+     * @param {Element[]} elements 候选元素
+     * @param {Object} options
+     * @param {boolean} options.viewportOnly 只保留与视口相交的元素
+     * @returns {Map<Element, number[]>} 可见元素 -> 顶层视口坐标 [x, y, width, height]
+     */
+    function measure(elements, options) {
+        const viewportOnly = !!(options && options.viewportOnly);
+        const offsets = new Map();
+        const visible = new Map();
+        elements.forEach(el => {
+            const rect = geometry(el, offsets);
+            // 先用几何信息排除，checkVisibility 只对有尺寸的元素调用
+            if (rect[2] <= 0 || rect[3] <= 0) {
+                return;
+            }
+            if (viewportOnly && !inViewport(rect)) {
+                return;
+            }
+            if (styleVisible(el)) {
+                visible.set(el, rect);
+            }
+        });
+        return visible;
+    }
+
+    // 延迟的 DOM 写入（索引标记、host 标记），在所有读取完成后统一执行
+    function queueWrite(el, attr, value) {
+        state.writes.push([el, attr, value]);
+    }
+
+    function flushWrites() {
+        state.writes.forEach(([el, attr, value]) => {
+            if (value === null) {
+                el.removeAttribute(attr);
+            } else {
+                el.setAttribute(attr, value);
+            }
+        });
+        state.writes = [];
+        state.pendingHosts = new Map();
+    }
+
+    // ========== 元素描述 ==========
+
+    function describe(el, index, rect) {
+        const info = {
+            tag: el.tagName.toLowerCase(),
+            text: el.textContent ? el.textContent.substring(0, 50).trim() : '',
+            attrs: {},
+            index: index
+        };
+        ATTRS.forEach(attr => {
+            const value = el.getAttribute(attr);
+            if (value) {
+                info.attrs[attr] = value;
+            }
+        });
+        const hosts = hostPathOf(el);
+        if (hosts.length) {
+            info.hosts = hosts;
+        }
+
+        info.rect = rect || geometry(el);
+        info.inViewport = inViewport(info.rect);
+        return info;
+    }
+
+    // 顶层视口坐标 [x, y, width, height]，供排序和截图标注使用
+    function geometry(el, offsets) {
+        const rect = el.getBoundingClientRect();
+        const offset = frameOffset(el, offsets);
+        return [
+            Math.round(rect.left + offset.x),
+            Math.round(rect.top + offset.y),
+            Math.round(rect.width),
+            Math.round(rect.height)
+        ];
+    }
+
+    function inViewport(rect) {
+        return rect[0] < window.innerWidth && rect[1] < window.innerHeight &&
+            rect[0] + rect[2] > 0 && rect[1] + rect[3] > 0;
+    }
+
+    // 用于增量模式判断元素是否变化（不含位置信息，滚动不算变化）
+    function signature(info) {
+        return JSON.stringify([info.tag, info.text, info.attrs, info.hosts || null]);
+    }
+
+    function viewport() {
+        return {width: window.innerWidth, height: window.innerHeight, scrollX: window.scrollX, scrollY: window.scrollY};
+    }
+
+    // ========== 索引登记 ==========
+
+    // 登记元素并排队写入索引标记（调用方负责在读取结束后 flushWrites）
+    function track(el, rect) {
+        const index = state.nextIndex++;
+        const info = describe(el, index, rect);
+        queueWrite(el, MARKER, String(index));
+        state.tracked.set(index, el);
+        state.signatures.set(index, signature(info));
+        return info;
+    }
+
+    function untrack(index) {
+        const el = state.tracked.get(index);
+        if (el && el.isConnected) {
+            queueWrite(el, MARKER, null);
+        }
+        state.tracked.delete(index);
+        state.signatures.delete(index);
+    }
+
+    function reset() {
+        if (state.observer) {
+            state.observer.disconnect();
+            state.observer = null;
+        }
+        state.tracked.forEach(el => el.removeAttribute(MARKER));
+        document.querySelectorAll('[' + MARKER + ']').forEach(el => el.removeAttribute(MARKER));
+        state.nextIndex = 1;
+        state.tracked.clear();
+        state.signatures.clear();
+        state.dirty.clear();
+        state.writes = [];
+        state.pendingHosts = new Map();
+    }
+
+    // ========== 增量模式（MutationObserver） ==========
+
+    // 高亮层由运行时自己创建，它的变化不算页面变化
+    function isOwnNode(node) {
+        return node.nodeType === 1 &&
+            (node.id === HIGHLIGHT_ID || node.id === OVERLAY_ID ||
+                !!(node.closest && node.closest('#' + HIGHLIGHT_ID)));
+    }
+
+    // 把 MutationRecord 归并为需要重新检查的脏节点
+    function collect(records) {
+        records.forEach(record => {
+            if (record.type === 'childList') {
+                if (isOwnNode(record.target)) {
+                    return;
+                }
+                record.addedNodes.forEach(node => {
+                    if (node.nodeType === 1 && !isOwnNode(node)) {
+                        state.dirty.add(node);
+                    }
+                });
+                if (Array.from(record.removedNodes).some(node => !isOwnNode(node))) {
+                    state.dirty.add(record.target);
+                }
+            } else if (record.type === 'characterData') {
+                if (record.target.parentElement) {
+                    state.dirty.add(record.target.parentElement);
+                }
+            } else if (!isOwnNode(record.target)) {
+                state.dirty.add(record.target);
+            }
+        });
+    }
+
+    function observe() {
+        state.observer = new MutationObserver(collect);
+        state.observer.observe(document.documentElement, OBSERVE_OPTIONS);
+        // 重新遍历一次以监听所有已知的 shadow root 和同源 iframe
+        deepQuery(document, HOST_MARKER_SELECTOR);
+    }
+
+    function delta() {
+        // 处理 observer 中尚未派发的记录
+        collect(state.observer.takeRecords());
+
+        const added = [];
+        const changed = [];
+        const removed = [];
+
+        // 1. 已经从文档中移除的元素（iframe 跳转后旧文档的 defaultView 为 null）
+        state.tracked.forEach((el, index) => {
+            if (!el.isConnected || !el.ownerDocument.defaultView) {
+                untrack(index);
+                removed.push(index);
+            }
+        });
+
+        // 2. 只保留最外层的脏节点，避免重复扫描同一子树
+        //    （按组合树向上查找：shadow root 跳到 host，iframe 文档跳到 iframe 元素）
+        const roots = Array.from(state.dirty).filter(node => node && node.isConnected && node.nodeType === 1);
+        state.dirty.clear();
+        const rootSet = new Set(roots);
+        const composedParent = node => {
+            if (node.parentElement) return node.parentElement;
+            const root = node.getRootNode();
+            if (root.nodeType === 11 && root.host) return root.host;
+            if (root.nodeType === 9 && root.defaultView) return root.defaultView.frameElement;
+            return null;
+        };
+        const outerRoots = roots.filter(node => {
+            for (let p = composedParent(node); p; p = composedParent(p)) {
+                if (rootSet.has(p)) return false;
+            }
+            return true;
+        });
+
+        // 3. 收集脏子树中的候选元素，已追踪但不再满足选择器的元素直接移除
+        const candidates = [];
+        outerRoots.forEach(root => {
+            const matched = new Set(deepQuery(root, SELECTORS));
+            deepQuery(root, '[' + MARKER + ']').forEach(el => {
+                const index = parseInt(el.getAttribute(MARKER));
+                if (state.tracked.get(index) === el && !matched.has(el)) {
+                    untrack(index);
+                    removed.push(index);
+                }
+            });
+            matched.forEach(el => candidates.push(el));
+        });
+
+        // 4. 批量测量后再比较（读取期间不写 DOM）
+        const visible = measure(candidates);
+        candidates.forEach(el => {
+            const index = parseInt(el.getAttribute(MARKER));
+            const isTracked = state.tracked.get(index) === el;
+            const rect = visible.get(el);
+
+            if (isTracked && !rect) {
+                untrack(index);
+                removed.push(index);
+            } else if (isTracked) {
+                const info = describe(el, index, rect);
+                const sig = signature(info);
+                if (sig !== state.signatures.get(index)) {
+                    state.signatures.set(index, sig);
+                    changed.push(info);
+                }
+            } else if (rect) {
+                added.push(track(el, rect));
+            }
+        });
+
+        // 5. 未变化元素只回传位置（滚动后排序仍然准确）：[index, x, y, width, height, inViewport]
+        const offsets = new Map();
+        const positions = [];
+        state.tracked.forEach((el, index) => {
+            const rect = visible.get(el) || geometry(el, offsets);
+            positions.push([index].concat(rect, inViewport(rect) ? 1 : 0));
+        });
+
+        // 6. 所有读取结束后统一写入标记
+        flushWrites();
+
+        return {
+            mode: 'delta', added: added, changed: changed, removed: removed,
+            positions: positions, viewport: viewport()
+        };
+    }
+
+    // ========== 公共 API ==========
+
+    /**
+     * 提取可交互元素
+     *
+     * @param {Object} options
+     * @param {boolean} options.incremental 是否增量提取（首次调用全量扫描并安装 MutationObserver）
+     * @param {boolean} options.viewportOnly 只提取与视口相交的元素（总是全量提取）
+     * @returns {{mode: string, added: Array, changed: Array, removed: Array}}
+     */
+    function extract(options) {
+        options = options || {};
+        // 视口外的元素滚动后不会产生 mutation，视口模式无法增量维护
+        const incremental = options.incremental && !options.viewportOnly;
+        if (incremental && state.observer) {
+            return delta();
+        }
+
+        reset();
+        const candidates = deepQuery(document, SELECTORS);
+        const visible = measure(candidates, options);
+        const added = [];
+        candidates.forEach(el => {
+            const rect = visible.get(el);
+            if (rect) {
+                added.push(track(el, rect));
+            }
+        });
+        flushWrites();
+        if (incremental) {
+            observe();
+        }
+        return {mode: 'full', added: added, changed: [], removed: [], viewport: viewport()};
+    }
+
+    function get(index) {
+        return state.tracked.get(index) || null;
+    }
+
+    // 已追踪元素的当前位置 [[index, x, y, width, height], ...]（只读取，不写 DOM）
+    function trackedBoxes() {
+        const offsets = new Map();
+        return Array.from(state.tracked.entries())
+            .sort((a, b) => a[0] - b[0])
+            .map(([index, el]) => [index].concat(geometry(el, offsets)));
+    }
+
+    /**
+     * 高亮元素
+     *
+     * @param {Array} [boxes] 可选，[[index, x, y, width, height], ...]（顶层视口坐标），
+     *     用于没有在页面中标记元素的提取引擎；省略时高亮已追踪的元素
+     * @param {string} [mode] 'dom'（默认，每个元素两个 div）或 'canvas'（单个 canvas 绘制，滚动时按缓存位置重绘）
+     * @returns {number} 高亮的元素数量
+     */
+    function highlight(boxes, mode) {
+        clearHighlight(false);
+
+        const count = boxes ? boxes.length : state.tracked.size;
+        if (count === 0) {
+            console.warn('没有找到已标记的元素，请先调用 extract_elements()');
+            return 0;
+        }
+
+        if (mode === 'canvas') {
+            highlightCanvas(boxes || null);
+        } else {
+            highlightDom(boxes || trackedBoxes());
+        }
+        return count;
+    }
+
+    // ========== Canvas 高亮层 ==========
+
+    // 页面滚动停止多久后重新测量一次（毫秒）
+    const OVERLAY_SETTLE_DELAY = 150;
+
+    // target 是否在 node 的祖先链上（跨 shadow root 和同源 iframe 向上查找）
+    function composedWithin(node, target) {
+        while (node) {
+            if (node === target) {
+                return true;
+            }
+            if (node.parentNode) {
+                node = node.parentNode;
+            } else if (node.host) {
+                node = node.host;
+            } else if (node.nodeType === 9 && node.defaultView && node.defaultView !== window) {
+                node = node.defaultView.frameElement;
+            } else {
+                return false;
+            }
+        }
+        return false;
+    }
+
+    // 已追踪元素所在的同源 iframe 窗口（含中间层级），iframe 内的滚动事件不会传到顶层窗口
+    function trackedViews() {
+        const views = new Set();
+        state.tracked.forEach(el => {
+            let view = el.ownerDocument.defaultView;
+            while (view && view !== window && !views.has(view)) {
+                views.add(view);
+                view = view.frameElement ? view.frameElement.ownerDocument.defaultView : null;
+            }
+        });
+        return Array.from(views);
+    }
+
+    /**
+     * 测量已追踪元素，按顶层文档坐标缓存到 overlay.boxes
+     *
+     * @param {Object} overlay 高亮层
+     * @param {Array} [targets] 只测量位于这些滚动容器 / iframe 文档中的元素，省略时全部测量
+     */
+    function measureOverlay(overlay, targets) {
+        const offsets = new Map();
+        const scrollX = window.scrollX;
+        const scrollY = window.scrollY;
+        state.tracked.forEach((el, index) => {
+            if (targets && !targets.some(target => composedWithin(el, target))) {
+                return;
+            }
+            if (!el.isConnected) {
+                overlay.boxes.delete(index);
+                return;
+            }
+            const [x, y, w, h] = geometry(el, offsets);
+            overlay.boxes.set(index, [x + scrollX, y + scrollY, w, h]);
+        });
+    }
+
+    function highlightCanvas(boxes) {
+        const host = document.createElement('div');
+        host.id = OVERLAY_ID;
+        host.style.cssText = `
+            position: fixed;
+            top: 0;
+            left: 0;
+            width: 0;
+            height: 0;
+            pointer-events: none;
+            z-index: 2147483647;
+        `;
+        const canvas = document.createElement('canvas');
+        canvas.style.cssText = 'position: fixed; top: 0; left: 0; pointer-events: none;';
+        host.attachShadow({mode: 'closed'}).appendChild(canvas);
+        // 页面中只多出这一个宿主节点（挂在 <html> 下，不影响 <body> 布局），clearHighlight 时移除；
+        // 完全不接触页面 DOM 的标注使用 Python 侧的截图标注
+        document.documentElement.appendChild(host);
+
+        const overlay = {
+            host: host,
+            canvas: canvas,
+            // index -> [x, y, w, h]（顶层文档坐标）：页面滚动时只按滚动位置平移，不重新读取布局
+            boxes: new Map(),
+            // 快照类引擎给出的是固定坐标，没有对应的页面元素，不能重新测量
+            measurable: !boxes,
+            views: [window].concat(boxes ? [] : trackedViews()),
+            pending: new Set(),   // 内部滚动过的容器 / iframe 文档，下一帧只重新测量其中的元素
+            full: false,          // 下一帧重新测量全部元素
+            frame: 0,
+            settle: 0,
+            onScroll: null,
+            onResize: null
+        };
+        if (boxes) {
+            boxes.forEach(([index, x, y, w, h]) => overlay.boxes.set(index, [x + window.scrollX, y + window.scrollY, w, h]));
+        } else {
+            measureOverlay(overlay);
+        }
+
+        const schedule = () => {
+            if (!overlay.frame) {
+                overlay.frame = requestAnimationFrame(() => {
+                    overlay.frame = 0;
+                    if (overlay.full) {
+                        measureOverlay(overlay);
+                    } else if (overlay.pending.size) {
+                        measureOverlay(overlay, Array.from(overlay.pending));
+                    }
+                    overlay.full = false;
+                    overlay.pending.clear();
+                    drawOverlay(overlay);
+                });
+            }
+        };
+        // 捕获阶段监听顶层和各同源 iframe 窗口的滚动（页面内部滚动容器也会触发）
+        overlay.onScroll = event => {
+            if (overlay.measurable) {
+                if (event.target !== document) {
+                    overlay.pending.add(event.target);
+                }
+                // fixed / sticky 元素不随页面滚动，平移后会偏，滚动停止后整体校正一次
+                clearTimeout(overlay.settle);
+                overlay.settle = setTimeout(() => {
+                    overlay.full = true;
+                    schedule();
+                }, OVERLAY_SETTLE_DELAY);
+            }
+            schedule();
+        };
+        overlay.onResize = () => {
+            overlay.full = overlay.measurable;
+            schedule();
+        };
+        overlay.views.forEach(view => view.addEventListener('scroll', overlay.onScroll, {capture: true, passive: true}));
+        window.addEventListener('resize', overlay.onResize, {passive: true});
+        state.overlay = overlay;
+        drawOverlay(overlay);
+    }
+
+    function drawOverlay(overlay) {
+        const width = window.innerWidth;
+        const height = window.innerHeight;
+        const ratio = window.devicePixelRatio || 1;
+        const canvas = overlay.canvas;
+        if (canvas.width !== Math.round(width * ratio) || canvas.height !== Math.round(height * ratio)) {
+            canvas.width = Math.round(width * ratio);
+            canvas.height = Math.round(height * ratio);
+            canvas.style.width = width + 'px';
+            canvas.style.height = height + 'px';
+        }
+
+        const scrollX = window.scrollX;
+        const scrollY = window.scrollY;
+        const ctx = canvas.getContext('2d');
+        ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+        ctx.clearRect(0, 0, width, height);
+        ctx.lineWidth = 2;
+        ctx.font = 'bold 12px monospace';
+        ctx.textBaseline = 'middle';
+
+        overlay.boxes.forEach(([left, top, w, h], index) => {
+            const x = left - scrollX;
+            const y = top - scrollY;
+            // 跳过不可见或完全在视口外的元素
+            if (w <= 0 || h <= 0 || x > width || y > height || x + w < 0 || y + h < 0) {
+                return;
+            }
+            const color = COLORS[index % COLORS.length];
+            ctx.strokeStyle = color;
+            ctx.strokeRect(x + 1, y + 1, w - 2, h - 2);
+
+            // 标签位于框的右上方，与 DOM 模式一致
+            const label = `[${index}]`;
+            const labelWidth = ctx.measureText(label).width + 12;
+            const labelX = x + w + 2 - labelWidth;
+            const labelY = Math.max(y - 20, 0);
+            ctx.fillStyle = color;
+            ctx.fillRect(labelX, labelY, labelWidth, 18);
+            ctx.fillStyle = 'white';
+            ctx.fillText(label, labelX + 6, labelY + 9);
+        });
+    }
+
+    function removeOverlay() {
+        const overlay = state.overlay;
+        if (!overlay) {
+            return;
+        }
+        overlay.views.forEach(view => {
+            try {
+                view.removeEventListener('scroll', overlay.onScroll, {capture: true});
+            } catch (e) {
+                // iframe 已被移除
+            }
+        });
+        window.removeEventListener('resize', overlay.onResize);
+        if (overlay.frame) {
+            cancelAnimationFrame(overlay.frame);
+        }
+        clearTimeout(overlay.settle);
+        overlay.host.remove();
+        state.overlay = null;
+    }
+
+    // ========== DOM 高亮层 ==========
+
+    function highlightDom(boxes) {
+        const container = document.createElement('div');
+        container.id = HIGHLIGHT_ID;
+        container.style.cssText = `
+            position: absolute;
+            top: 0;
+            left: 0;
+            width: 100%;
+            height: 100%;
+            pointer-events: none;
+            z-index: 999999;
+        `;
+        document.body.appendChild(container);
+
+        boxes.forEach(([index, left, top, width, height]) => {
+            const color = COLORS[index % COLORS.length];
+
+            if (width > 0 && height > 0) {
+                const x = left + window.scrollX;
+                const y = top + window.scrollY;
+
+                const highlightBox = document.createElement('div');
+                highlightBox.style.cssText = `
+                    position: absolute;
+                    left: ${x}px;
+                    top: ${y}px;
+                    width: ${width}px;
+                    height: ${height}px;
+                    border: 2px solid ${color};
+                    box-sizing: border-box;
+                    pointer-events: none;
+                    border-radius: 4px;
+                `;
+
+                const label = document.createElement('div');
+                label.textContent = `[${index}]`;
+                label.style.cssText = `
+                    position: absolute;
+                    right: -2px;
+                    top: -20px;
+                    background: ${color};
+                    color: white;
+                    padding: 2px 6px;
+                    font-size: 12px;
+                    font-weight: bold;
+                    border-radius: 3px;
+                    font-family: monospace;
+                    box-shadow: 0 2px 4px rgba(0,0,0,0.3);
+                `;
+
+                highlightBox.appendChild(label);
+                container.appendChild(highlightBox);
+            }
+        });
+    }
+
+    function clearHighlight(removeMarkers) {
+        removeOverlay();
+        const container = document.getElementById(HIGHLIGHT_ID);
+        if (container) {
+            container.remove();
+        }
+        if (removeMarkers) {
+            reset();
+        }
+    }
+
+    // ========== 批量操作 ==========
+
+    // 批量操作的目标：{index} 为已追踪元素，{selector} 为 CSS 选择器（可穿透开放 Shadow DOM / 同源 iframe）
+    function resolveTarget(action) {
+        if (action.index !== undefined && action.index !== null) {
+            const el = state.tracked.get(action.index);
+            if (!el || !el.isConnected) {
+                throw new Error('未找到索引为 ' + action.index + ' 的元素');
+            }
+            return el;
+        }
+        if (action.selector) {
+            const found = deepQuery(document, action.selector);
+            if (!found.length) {
+                throw new Error('未找到元素: ' + action.selector);
+            }
+            return found[0];
+        }
+        throw new Error('缺少 index 或 selector');
+    }
+
+    // 事件和原型取自元素所在的窗口（iframe 中的元素属于另一个 realm）
+    function dispatch(el, type) {
+        const view = el.ownerDocument.defaultView || window;
+        el.dispatchEvent(new view.Event(type, {bubbles: true}));
+    }
+
+    // 通过原型上的 value setter 赋值，React 等框架才能感知到变化
+    function setNativeValue(el, value) {
+        const view = el.ownerDocument.defaultView || window;
+        const ctor = el.tagName === 'TEXTAREA' ? view.HTMLTextAreaElement
+            : el.tagName === 'SELECT' ? view.HTMLSelectElement : view.HTMLInputElement;
+        const descriptor = Object.getOwnPropertyDescriptor(ctor.prototype, 'value');
+        if (descriptor && descriptor.set) {
+            descriptor.set.call(el, value);
+        } else {
+            el.value = value;
+        }
+    }
+
+    function fill(el, text, clear) {
+        el.focus();
+        if (el.isContentEditable) {
+            el.textContent = (clear ? '' : el.textContent) + text;
+        } else {
+            setNativeValue(el, (clear ? '' : el.value || '') + text);
+        }
+        dispatch(el, 'input');
+        dispatch(el, 'change');
+    }
+
+    // 按 value 或显示文本选择选项，返回选中的 value
+    function selectOption(el, value) {
+        const options = Array.from(el.options || []);
+        const option = options.find(o => o.value === value) || options.find(o => o.text.trim() === value);
+        if (!option) {
+            throw new Error('下拉框中没有选项: ' + value);
+        }
+        el.focus();
+        setNativeValue(el, option.value);
+        dispatch(el, 'input');
+        dispatch(el, 'change');
+        return option.value;
+    }
+
+    // 等待选择器匹配到（可见的）元素
+    function waitFor(selector, timeout, visible) {
+        const deadline = performance.now() + timeout * 1000;
+        return new Promise((resolve, reject) => {
+            (function poll() {
+                const found = deepQuery(document, selector).find(el => {
+                    if (!visible) {
+                        return true;
+                    }
+                    const rect = el.getBoundingClientRect();
+                    return rect.width > 0 && rect.height > 0 && styleVisible(el);
+                });
+                if (found) {
+                    resolve();
+                } else if (performance.now() >= deadline) {
+                    reject(new Error('等待元素超时: ' + selector));
+                } else {
+                    setTimeout(poll, 100);
+                }
+            })();
+        });
+    }
+
+    /**
+     * 在一次调用中依次执行多个页面内操作
+     *
+     * @param {Array} actions [{action: 'fill'|'click'|'select'|'scroll'|'wait_for', index?, selector?, ...}, ...]
+     * @param {Object} [options]
+     * @param {boolean} options.stopOnError 某个操作失败后停止执行后续操作
+     * @returns {Promise<Array>} 每个操作的结果 {action, ok, error?, elapsed}（elapsed 单位为毫秒）
+     */
+    async function batch(actions, options) {
+        const stopOnError = !options || options.stopOnError !== false;
+        const results = [];
+        for (const action of actions) {
+            const started = performance.now();
+            const result = {action: action.action, ok: true};
+            try {
+                switch (action.action) {
+                    case 'fill':
+                        fill(resolveTarget(action), String(action.text), action.clear !== false);
+                        break;
+                    case 'click':
+                        resolveTarget(action).click();
+                        break;
+                    case 'select':
+                        result.value = selectOption(resolveTarget(action), String(action.value));
+                        break;
+                    case 'scroll':
+                        if (action.index !== undefined && action.index !== null || action.selector) {
+                            resolveTarget(action).scrollIntoView({block: 'center', inline: 'nearest'});
+                        } else {
+                            window.scrollBy(action.x || 0, action.y || 0);
+                        }
+                        break;
+                    case 'wait_for':
+                        await waitFor(action.selector, action.timeout || 10, action.visible !== false);
+                        break;
+                    default:
+                        throw new Error('不支持的操作: ' + action.action);
+                }
+            } catch (e) {
+                result.ok = false;
+                result.error = String(e && e.message || e);
+            }
+            result.elapsed = Math.round(performance.now() - started);
+            results.push(result);
+            if (!result.ok && stopOnError) {
+                break;
+            }
+        }
+        return results;
+    }
+
+    function dispose() {
+        clearHighlight(false);
+        if (state.observer) {
+            state.observer.disconnect();
+            state.observer = null;
+        }
+    }
+
+    Object.defineProperty(window, '__cua', {
+        value: Object.freeze({
+            version: VERSION,
+            extract: extract,
+            get: get,
+            highlight: highlight,
+            clearHighlight: clearHighlight,
+            batch: batch,
+            fill: function(el, text, clear) {
+                fill(el, String(text), clear !== false);
+            },
+            dispose: dispose
+        }),
+        configurable: true,
+        enumerable: false,
+        writable: false
+    });
+})();
@@ -0,0 +1,187 @@
+import io
+from PIL import Image, ImageDraw, ImageFont
+from ..utils.logging import logger
+from ..utils.image_converter import encode_image_bytes
+
+
+
+class SetOfMarks:
+    """
+    截图标注（Set-of-Marks）- 在内存中的视口截图上用 Pillow 绘制元素编号框
+
+    截图只在内存中流转：一次视口截图 -> 缩放 -> 绘制编号框 -> 编码为 JPEG / WebP 字节，
+    不修改页面 DOM，也不经过磁盘读写，输出可以直接作为图片附加到大模型消息中。
+    编号和颜色与页面高亮一致。
+    """
+
+    # 与页面运行时高亮一致的颜色池
+    COLORS = [
+        '#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8',
+        '#F7DC6F', '#BB8FCE', '#85C1E2', '#F8B739', '#52B788'
+    ]
+
+    # 支持的输出格式 -> (Pillow 格式名, MIME 类型)
+    FORMATS = {
+        'jpeg': ('JPEG', 'image/jpeg'),
+        'jpg': ('JPEG', 'image/jpeg'),
+        'webp': ('WEBP', 'image/webp'),
+        'png': ('PNG', 'image/png'),
+    }
+
+    def __init__(self, image_format='jpeg', quality=70, max_width=1024, font_size=13, line_width=2):
+        """
+        初始化截图标注器
+
+        Args:
+            image_format: 输出格式，'jpeg' | 'webp' | 'png'
+            quality: JPEG / WebP 质量（1-100）
+            max_width: 输出图片最大宽度（像素），超过时等比缩小；None 表示不缩放
+            font_size: 编号文字大小（输出图片像素）
+            line_width: 边框线宽（输出图片像素）
+        """
+        if image_format not in self.FORMATS:
+            raise ValueError(f"不支持的图片格式: {image_format}，可选: {', '.join(self.FORMATS)}")
+        self.image_format = image_format
+        self.quality = quality
+        self.max_width = max_width
+        self.font_size = font_size
+        self.line_width = line_width
+        self._font = None
+
+    @property
+    def mime_type(self):
+        """输出图片的 MIME 类型"""
+        return self.FORMATS[self.image_format][1]
+
+    @property
+    def font(self):
+        """编号字体（Pillow 内置字体，首次使用时加载）"""
+        if self._font is None:
+            try:
+                self._font = ImageFont.load_default(size=self.font_size)
+            except TypeError:
+                # Pillow < 10.1 的内置字体不支持指定大小
+                self._font = ImageFont.load_default()
+        return self._font
+
+    def capture(self, page):
+        """
+        截取当前视口（PNG 字节，不写入磁盘）
+
+        Args:
+            page: DrissionPage 的页面对象
+
+        Returns:
+            PNG 字节
+        """
+        return page.get_screenshot(as_bytes='png')
+
+    def render(self, screenshot, elements, viewport=None):
+        """
+        在截图上绘制元素编号框
+
+        Args:
+            screenshot: 截图字节（任意 Pillow 支持的格式）
+            elements: 元素记录可迭代对象，需包含 index 和 rect（顶层视口坐标 [x, y, width, height]）
+            viewport: 可选，提取时的视口信息 {'width', 'height'}，用于把 CSS 像素换算为截图像素；
+                省略时按截图尺寸换算（即假定设备像素比为 1）
+
+        Returns:
+            编码后的图片字节
+        """
+        image = Image.open(io.BytesIO(screenshot)).convert('RGB')
+
+        # CSS 像素 -> 截图像素（高分屏截图大于视口）
+        css_width = (viewport or {}).get('width') or image.width
+        scale = image.width / css_width
+
+        # 先缩放再绘制，文字大小不受缩放影响
+        if self.max_width and image.width > self.max_width:
+            ratio = self.max_width / image.width
+            image = image.resize((self.max_width, round(image.height * ratio)), Image.LANCZOS)
+            scale *= ratio
+
+        draw = ImageDraw.Draw(image)
+        drawn = 0
+        for element in elements:
+            rect = element['rect'] if isinstance(element, dict) else getattr(element, 'rect', None)
+            index = element['index'] if isinstance(element, dict) else element.index
+            if not rect:
+                continue
+            if self._draw_mark(draw, image.size, index, [value * scale for value in rect]):
+                drawn += 1
+
+        logger.debug(f"截图标注完成: {drawn} 个元素, 尺寸 {image.width}x{image.height}")
+        return self.encode(image)
+
+    def _draw_mark(self, draw, size, index, rect):
+        """绘制单个编号框，元素不在截图范围内时返回 False"""
+        x, y, width, height = rect
+        image_width, image_height = size
+        if width <= 0 or height <= 0 or x >= image_width or y >= image_height or x + width <= 0 or y + height <= 0:
+            return False
+
+        color = self.COLORS[index % len(self.COLORS)]
+        draw.rectangle([x, y, x + width - 1, y + height - 1], outline=color, width=self.line_width)
+
+        # 编号标签位于框的右上方，超出图片时收回到图片内
+        label = f"[{index}]"
+        left, top, right, bottom = draw.textbbox((0, 0), label, font=self.font)
+        label_width = right - left + 8
+        label_height = bottom - top + 4
+        label_x = min(max(x + width - label_width, 0), image_width - label_width)
+        label_y = y - label_height if y - label_height >= 0 else y
+        draw.rectangle([label_x, label_y, label_x + label_width, label_y + label_height], fill=color)
+        draw.text((label_x + 4 - left, label_y + 2 - top), label, fill='white', font=self.font)
+        return True
+
+    def encode(self, image):
+        """
+        编码图片
+
+        Args:
+            image: Pillow 图片对象
+
+        Returns:
+            图片字节
+        """
+        buffer = io.BytesIO()
+        pil_format = self.FORMATS[self.image_format][0]
+        if pil_format == 'PNG':
+            image.save(buffer, format=pil_format, optimize=True)
+        else:
+            image.save(buffer, format=pil_format, quality=self.quality)
+        return buffer.getvalue()
+
+    def annotate(self, page, elements, viewport=None):
+        """
+        截取视口并绘制编号框
+
+        Args:
+            page: DrissionPage 的页面对象
+            elements: 元素记录可迭代对象
+            viewport: 可选，提取时的视口信息
+
+        Returns:
+            编码后的图片字节，失败时返回 None
+        """
+        try:
+            return self.render(self.capture(page), elements, viewport)
+        except Exception as e:
+            logger.error(f"❌ 截图标注失败: {e}")
+            return None
+
+    def to_message_content(self, data):
+        """
+        转换为大模型消息中的图片内容块（OpenAI / LangChain 格式）
+
+        Args:
+            data: 图片字节
+
+        Returns:
+            {'type': 'image_url', 'image_url': {'url': 'data:image/jpeg;base64,...'}}
+        """
+        return {
+            'type': 'image_url',
+            'image_url': {'url': f"data:{self.mime_type};base64,{encode_image_bytes(data)}"},
+        }
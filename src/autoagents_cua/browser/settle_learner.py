@@ -0,0 +1,212 @@
+import os
+import json
+import threading
+from collections import deque
+from time import monotonic
+from ..utils.logging import logger
+from ..utils.helpers import user_data_dir, domain_of, percentile
+
+
+
+class SettleLearner:
+    """
+    页面稳定时间学习器 - 按域名和操作类型记录页面从操作到稳定的耗时
+
+    每个 (域名, 操作) 保留最近 window 个样本，计算 p50 / p95，并据此给等待接口提供超时时间：
+    慢的站点用更长的超时，而不是所有站点共用一个固定值（超时不低于调用方的默认超时，快的站点本来就会提前就绪）。
+    超时的等待是删失样本：真实耗时只知道大于超时时间，统计时排在所有完成的样本之后，
+    p95 落在删失样本上时在其基础上继续放大，而不是把超时时间当成一次正常的耗时。
+    样本以 JSON 保存在用户目录（默认 ~/.autoagents_cua/settle_times.json），格式为
+    {"example.com": {"navigate": [[0.82, false], [10.0, true], ...], "click": [...]}}（[耗时, 是否超时]）。
+
+    常用操作类型：'navigate'、'click'、'input'、'refresh'、'back'、'captcha_load'、'captcha_submit'
+    """
+
+    # 同一路径共享一个实例，避免多个对象互相覆盖存储文件
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path=None, window=50, min_samples=5, margin=1.5, min_timeout=None,
+                 max_timeout=30.0, save_interval=5.0):
+        """
+        初始化学习器
+
+        Args:
+            path: 存储文件路径；None 使用默认路径，False 表示只在内存中学习
+            window: 每个 (域名, 操作) 保留的样本数
+            min_samples: 样本数达到该值后才使用学习到的超时
+            margin: 学习到的超时 = p95 × margin
+            min_timeout: 学习到的超时下限（秒）；None 时以调用方的默认超时（如就绪检测的超时）为下限，
+                学习到的超时只会延长、不会低于默认值（快的站点本来就会提前就绪，缩短超时没有收益）；
+                需要让快的站点更早放弃等待时设为具体的秒数
+            max_timeout: 学习到的超时上限（秒）
+            save_interval: 自动保存的最小间隔（秒）
+        """
+        if path is None:
+            path = self.default_path()
+        self.path = path or None
+        self.window = window
+        self.min_samples = min_samples
+        self.margin = margin
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.save_interval = save_interval
+
+        self._samples = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = monotonic()
+        self.load()
+
+    @staticmethod
+    def default_path():
+        """默认存储路径（用户目录下，不写入仓库目录）"""
+        return user_data_dir('settle_times.json')
+
+    @classmethod
+    def shared(cls, path=None):
+        """
+        获取共享实例（同一存储路径只创建一次）
+
+        Args:
+            path: 存储文件路径；None 使用默认路径
+
+        Returns:
+            SettleLearner 实例
+        """
+        key = path or cls.default_path()
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(path=key)
+            return cls._instances[key]
+
+    # ========== 记录与统计 ==========
+
+    def record(self, url, action, seconds, timed_out=False):
+        """
+        记录一次稳定耗时
+
+        Args:
+            url: 页面 URL 或域名
+            action: 操作类型
+            seconds: 从操作到页面稳定的耗时（秒）；超时时为超时时间
+            timed_out: 等待是否超时（删失样本，真实耗时大于 seconds）
+        """
+        if seconds is None or seconds < 0:
+            return
+        domain = domain_of(url)
+        with self._lock:
+            actions = self._samples.setdefault(domain, {})
+            samples = actions.get(action)
+            if samples is None:
+                samples = actions[action] = deque(maxlen=self.window)
+            samples.append((round(float(seconds), 3), bool(timed_out)))
+            self._dirty = True
+            due = self.path and monotonic() - self._last_save >= self.save_interval
+        if due:
+            self.save()
+
+    def stats(self, url, action):
+        """
+        获取稳定耗时统计
+
+        Args:
+            url: 页面 URL 或域名
+            action: 操作类型
+
+        Returns:
+            {'count', 'timeouts', 'p50', 'p95', 'p95_timed_out'}，没有样本时 p50 / p95 为 None；
+            超时样本排在所有完成的样本之后，p95_timed_out 为 True 时 p95 只是真实耗时的下限
+        """
+        with self._lock:
+            samples = list(self._samples.get(domain_of(url), {}).get(action, ()))
+        if not samples:
+            return {'count': 0, 'timeouts': 0, 'p50': None, 'p95': None, 'p95_timed_out': False}
+        ordered = sorted(samples, key=lambda sample: (sample[1], sample[0]))
+        p95 = percentile(ordered, 95)
+        return {
+            'count': len(samples),
+            'timeouts': sum(1 for _, timed_out in samples if timed_out),
+            'p50': percentile(ordered, 50)[0],
+            'p95': p95[0],
+            'p95_timed_out': p95[1],
+        }
+
+    def timeout(self, url, action, default):
+        """
+        获取学习到的等待超时
+
+        Args:
+            url: 页面 URL 或域名
+            action: 操作类型
+            default: 默认超时（秒）；样本不足时直接使用，min_timeout 为 None 时也作为下限
+
+        Returns:
+            超时时间（秒）；min_timeout 为 None 时不低于 default，否则不低于 min_timeout
+        """
+        stats = self.stats(url, action)
+        if stats['count'] < self.min_samples:
+            return default
+        floor = default if self.min_timeout is None else self.min_timeout
+        # p95 落在超时样本上时，p95 是上次的超时时间，放大后自然高于它
+        learned = max(stats['p95'] * self.margin, floor)
+        return round(min(learned, max(self.max_timeout, floor)), 3)
+
+    def delay(self, url, action, default):
+        """
+        获取学习到的固定等待时间（用于没有就绪信号、只能 sleep 的场景）
+
+        Args:
+            url: 页面 URL 或域名
+            action: 操作类型
+            default: 样本不足时使用的默认等待时间（秒）
+
+        Returns:
+            等待时间（秒），取 p95 且不超过 default；p95 落在超时样本上时返回 default
+        """
+        stats = self.stats(url, action)
+        if stats['count'] < self.min_samples or stats['p95_timed_out']:
+            return default
+        return min(stats['p95'], default)
+
+    # ========== 持久化 ==========
+
+    def load(self):
+        """从存储文件加载样本（文件不存在时忽略）"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            with self._lock:
+                for domain, actions in data.items():
+                    target = self._samples.setdefault(domain, {})
+                    for action, samples in actions.items():
+                        # 兼容只保存耗时的旧格式
+                        samples = [tuple(sample) if isinstance(sample, list) else (sample, False)
+                                   for sample in samples[-self.window:]]
+                        target[action] = deque(samples, maxlen=self.window)
+            logger.debug(f"已加载页面稳定时间样本: {self.path}")
+        except Exception as e:
+            logger.warning(f"⚠️  加载页面稳定时间样本失败: {e}")
+
+    def save(self):
+        """保存样本到存储文件（没有新样本时跳过）"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {domain: {action: list(samples) for action, samples in actions.items()}
+                    for domain, actions in self._samples.items()}
+            self._dirty = False
+            self._last_save = monotonic()
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # 先写临时文件再替换，避免中途退出留下损坏的 JSON
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"⚠️  保存页面稳定时间样本失败: {e}")
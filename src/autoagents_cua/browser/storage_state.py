@@ -0,0 +1,286 @@
+import os
+import re
+import json
+import time
+from ..utils.logging import logger
+from ..utils.helpers import user_data_dir, domain_of
+
+
+
+class StorageStateStore:
+    """
+    登录状态存储 - 按账号和域名保存 Cookie、localStorage、sessionStorage，下次直接恢复，跳过登录流程
+
+    - save(): 登录成功后保存浏览器的全部 Cookie 和当前页面源的 localStorage / sessionStorage
+    - restore(): 在新的 WebOperator 导航之前写入 Cookie，并在新文档的脚本执行之前写入 Web Storage，
+      然后导航到目标页面，用探测选择器 / 探测 URL 验证会话是否仍然有效，失效时删除该状态
+    状态以 JSON 保存在本地（默认 ~/.autoagents_cua/storage_states/<域名>/<账号>.json），
+    文件包含登录凭据，权限设置为仅当前用户可读写。
+
+    使用示例:
+        store = StorageStateStore()
+        if not store.restore(operator, 'alice', 'https://example.com/home', probe='css:.avatar'):
+            ...  # 正常登录
+            store.save(operator, 'alice')
+    """
+
+    # setCookies 接受的 Cookie 字段
+    COOKIE_FIELDS = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite', 'expires',
+                     'priority', 'sameParty', 'sourceScheme', 'sourcePort', 'partitionKey')
+
+    # 读取当前页面源的 Web Storage
+    CAPTURE_SCRIPT = '''
+        return JSON.stringify({
+            origin: location.origin,
+            localStorage: Object.assign({}, window.localStorage),
+            sessionStorage: Object.assign({}, window.sessionStorage)
+        });
+    '''
+
+    # 在新文档的脚本执行之前写入 Web Storage（按页面源匹配）
+    RESTORE_SCRIPT = '''
+        (function() {
+            const entry = (%s)[location.origin];
+            if (!entry) return;
+            try {
+                for (const [key, value] of Object.entries(entry.localStorage || {})) localStorage.setItem(key, value);
+                for (const [key, value] of Object.entries(entry.sessionStorage || {})) sessionStorage.setItem(key, value);
+            } catch (e) {}
+        })();
+    '''
+
+    # 探测 URL：带 Cookie 请求，不跟随重定向（被重定向到登录页视为失效）
+    PROBE_URL_SCRIPT = '''
+        return fetch(arguments[0], {credentials: 'include', redirect: 'manual'}).then(r => r.status);
+    '''
+
+    def __init__(self, directory=None, max_age=None):
+        """
+        初始化存储
+
+        Args:
+            directory: 存储目录，None 使用默认目录
+            max_age: 状态的最长有效期（秒），超过后视为不存在；None 不限制
+        """
+        self.directory = directory or self.default_directory()
+        self.max_age = max_age
+
+    @staticmethod
+    def default_directory():
+        """默认存储目录（用户目录下，不放在仓库中，避免登录凭据被提交）"""
+        return user_data_dir('storage_states')
+
+    def path_for(self, account, url):
+        """
+        状态文件路径
+
+        Args:
+            account: 账号名
+            url: 页面 URL 或域名
+
+        Returns:
+            文件路径
+        """
+        domain = domain_of(url)
+        account = re.sub(r'[^\w.@-]', '_', str(account))
+        return os.path.join(self.directory, domain, f'{account}.json')
+
+    # ========== 保存 ==========
+
+    def capture(self, operator):
+        """
+        读取浏览器当前的登录状态
+
+        Args:
+            operator: WebOperator 实例
+
+        Returns:
+            状态字典 {'url', 'saved_at', 'cookies', 'origins': {页面源: {'localStorage', 'sessionStorage'}}}
+        """
+        page = operator.page
+        cookies = page.run_cdp('Network.getAllCookies')['cookies']
+        origins = {}
+        try:
+            storage = json.loads(page.run_js(self.CAPTURE_SCRIPT))
+            if storage['origin'] not in (None, 'null'):
+                origins[storage['origin']] = {
+                    'localStorage': storage['localStorage'],
+                    'sessionStorage': storage['sessionStorage'],
+                }
+        except Exception as e:
+            logger.debug(f"读取 Web Storage 失败（只保存 Cookie）: {e}")
+        return {'url': page.url, 'saved_at': time.time(), 'cookies': cookies, 'origins': origins}
+
+    def save(self, operator, account, url=None):
+        """
+        保存登录状态
+
+        Args:
+            operator: WebOperator 实例（已登录）
+            account: 账号名
+            url: 状态所属的页面 URL，None 使用当前页面
+
+        Returns:
+            是否成功
+        """
+        try:
+            state = self.capture(operator)
+            path = self.path_for(account, url or state['url'])
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            # 文件包含会话凭据，只允许当前用户读写
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            logger.success(f"✅ 已保存登录状态: {account} @ {domain_of(url or state['url'])}"
+                           f"（{len(state['cookies'])} 个 Cookie）")
+            return True
+        except Exception as e:
+            logger.error(f"❌ 保存登录状态失败: {e}")
+            return False
+
+    def load(self, account, url):
+        """
+        读取保存的登录状态
+
+        Args:
+            account: 账号名
+            url: 页面 URL 或域名
+
+        Returns:
+            状态字典，不存在或已过期时返回 None
+        """
+        path = self.path_for(account, url)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except Exception as e:
+            logger.warning(f"⚠️  读取登录状态失败: {e}")
+            return None
+        if self.max_age is not None and time.time() - state.get('saved_at', 0) > self.max_age:
+            logger.info(f"登录状态已过期: {account} @ {domain_of(url)}")
+            return None
+        return state
+
+    def delete(self, account, url):
+        """
+        删除保存的登录状态
+
+        Args:
+            account: 账号名
+            url: 页面 URL 或域名
+        """
+        path = self.path_for(account, url)
+        if os.path.exists(path):
+            os.remove(path)
+            logger.info(f"已删除登录状态: {path}")
+
+    # ========== 恢复 ==========
+
+    def _cookie_params(self, cookies):
+        """转换为 Network.setCookies 的参数，跳过已过期的 Cookie"""
+        now = time.time()
+        params = []
+        for cookie in cookies:
+            if not cookie.get('session') and 0 < cookie.get('expires', -1) < now:
+                continue
+            param = {key: cookie[key] for key in self.COOKIE_FIELDS if key in cookie}
+            if cookie.get('session') or param.get('expires', -1) < 0:
+                param.pop('expires', None)
+            params.append(param)
+        return params
+
+    def apply(self, operator, state):
+        """
+        把状态写入浏览器（在导航之前调用）
+
+        Args:
+            operator: WebOperator 实例
+            state: load() / capture() 返回的状态
+
+        Returns:
+            Page.addScriptToEvaluateOnNewDocument 的脚本标识（没有 Web Storage 时为 None），导航后应移除
+        """
+        page = operator.page
+        cookies = self._cookie_params(state.get('cookies', []))
+        if cookies:
+            page.run_cdp('Network.setCookies', cookies=cookies)
+        if not state.get('origins'):
+            return None
+        source = self.RESTORE_SCRIPT % json.dumps(state['origins'], ensure_ascii=False)
+        return page.run_cdp('Page.addScriptToEvaluateOnNewDocument', source=source)['identifier']
+
+    def restore(self, operator, account, url, probe=None, probe_url=None, timeout=5):
+        """
+        恢复登录状态，导航到目标页面并验证会话
+
+        Args:
+            operator: 新的 WebOperator 实例（尚未导航到目标站点）
+            account: 账号名
+            url: 目标页面 URL
+            probe: 可选，登录后才存在的元素定位器，或 probe(operator) -> bool 的验证函数
+                （返回 None 表示无法判断，保留状态）
+            probe_url: 可选，同源的探测 URL，带 Cookie 请求返回 2xx 视为有效
+            timeout: 探测元素的等待时间（秒）
+
+        Returns:
+            会话是否已恢复且有效（没有保存的状态时返回 False）；
+            只有探测明确判定已退出登录时才删除保存的状态，导航失败或异常时保留
+        """
+        state = self.load(account, url)
+        if state is None:
+            return False
+        try:
+            script_id = self.apply(operator, state)
+            navigated = operator.navigate(url)
+            if script_id:
+                # 只在这次导航中恢复 Web Storage，之后的页面使用浏览器自己的状态
+                operator.page.run_cdp('Page.removeScriptToEvaluateOnNewDocument', identifier=script_id)
+            if not navigated:
+                logger.warning(f"⚠️  导航失败，无法验证登录状态: {url}")
+                return False
+            valid = self.validate(operator, probe, probe_url, timeout)
+        except Exception as e:
+            # 网络或浏览器异常不代表会话失效，保留状态下次再试
+            logger.warning(f"⚠️  恢复登录状态失败: {e}")
+            return False
+        if valid is None:
+            logger.warning(f"⚠️  无法判断登录状态是否有效: {account} @ {domain_of(url)}")
+            return False
+        if not valid:
+            logger.info(f"登录状态已失效，需要重新登录: {account} @ {domain_of(url)}")
+            self.delete(account, url)
+            return False
+        logger.success(f"✅ 已恢复登录状态，跳过登录: {account} @ {domain_of(url)}")
+        return True
+
+    def validate(self, operator, probe=None, probe_url=None, timeout=5):
+        """
+        验证当前会话是否有效
+
+        Args:
+            operator: WebOperator 实例
+            probe: 登录后才存在的元素定位器，或 probe(operator) -> bool 的验证函数（返回 None 表示无法判断）
+            probe_url: 同源的探测 URL，带 Cookie 请求返回 2xx 视为有效
+            timeout: 探测元素的等待时间（秒）
+
+        Returns:
+            是否有效；没有任何探测条件时返回 True，探测 URL 请求失败或验证函数返回 None（无法判断）时返回 None
+        """
+        if probe_url:
+            status = operator.page.run_js(self.PROBE_URL_SCRIPT, probe_url)
+            if not isinstance(status, int):
+                logger.debug(f"探测 URL 请求失败: {probe_url}")
+                return None
+            if not 200 <= status < 300:
+                logger.debug(f"探测 URL 返回 {status}: {probe_url}")
+                return False
+        if callable(probe):
+            result = probe(operator)
+            return None if result is None else bool(result)
+        if probe:
+            return bool(operator.page.ele(probe, timeout=timeout))
+        return True
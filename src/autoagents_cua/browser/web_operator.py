@@ -1,8 +1,26 @@
 from ..utils.logging import logger
 from DrissionPage import WebPage, ChromiumOptions
-from typing import Optional, Any, Union, Dict
+from DrissionPage._functions.tools import PortFinder
+from typing import Optional, Any, Union, Dict, List
+import time
+import queue
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from time import sleep
 from .browser_fingerprint import BrowserFingerprint
+from .element_handle import ElementHandle
+from .page_runtime import PageRuntime
+from .cdp_session import CDPSession
+from .page_readiness import PageReadiness
+from .resource_policy import ResourcePolicy
+from .request_interceptor import RequestInterceptor
+from .screenshot import ScreenshotCapture
+from .response_capture import ResponseCapture
+from .network_archive import NetworkArchive, NetworkRecorder
+from .profile_template import ProfileTemplate
+from .cdp_profiler import CDPProfiler
+from .settle_learner import SettleLearner
 
 
 
@@ -12,9 +30,36 @@ class WebOperator:
     
     WebOperator 是 DrissionPage 的唯一封装入口，负责创建和管理浏览器实例。
     所有需要使用 DrissionPage 的类都应该通过 WebOperator 来操作浏览器。
+    
+    导航和点击默认通过 PageReadiness 监听 CDP 生命周期事件，页面稳定后立即返回；
+    显式传入等待秒数时保持原来的固定等待行为。每次等待的耗时按域名和操作类型记录到
+    SettleLearner，之后的等待使用学习到的超时时间。
+    
+    open_tab() 在同一个浏览器进程中打开新标签页并返回绑定到它的 WebOperator，
+    run_in_tabs() 用线程池在多个标签页中并发处理任务，比启动多个浏览器节省大量内存；
+    这种用法应以 multi_tab=True 创建 WebOperator，避免后台标签页被浏览器节流。
     """
     
-    def __init__(self, headless=False, fingerprint_config: Optional[Union[str, Dict[str, Any]]] = None, user_data_dir: Optional[str] = None):
+    # 就绪检测不可用时的兜底等待时间（秒）
+    FALLBACK_WAIT = 1
+    
+    # 后台标签页默认会被限制定时器和渲染，多标签页并发时会拖慢页面加载和就绪检测（multi_tab=True 时使用）
+    BACKGROUND_TAB_ARGUMENTS = (
+        '--disable-background-timer-throttling',
+        '--disable-renderer-backgrounding',
+        '--disable-backgrounding-occluded-windows',
+    )
+    
+    # 文本输入方式：
+    # - standard: element.clear() + element.input()（DrissionPage 默认方式）
+    # - fast: 一次 JS 调用（页面运行时的 __cua.fill）设置原生 value 并派发 input / change 事件，适合长文本和批量填表
+    # - paced: 逐个字符发送键盘事件，字符间隔在 keystroke_delay 范围内随机
+    INPUT_MODES = ('standard', 'fast', 'paced')
+    
+    def __init__(self, headless=False, fingerprint_config: Optional[Union[str, Dict[str, Any]]] = None, user_data_dir: Optional[str] = None,
+                 settle_learner: Optional[Union[SettleLearner, bool]] = None, input_mode: str = 'standard',
+                 keystroke_delay=(0.05, 0.15), resource_policy=None, auto_port: bool = False,
+                 profile_template=None, multi_tab: bool = False):
         """
         初始化网页操作器
         
@@ -24,44 +69,171 @@ class WebOperator:
                 - None: 不使用指纹修改
                 - str: 使用预设指纹名称（如 'windows_chrome', 'mac_chrome'）
                 - Dict: 使用自定义指纹配置
+            settle_learner: 页面稳定时间学习器
+                - None: 使用默认存储路径的共享学习器
+                - SettleLearner: 使用指定的学习器
+                - False: 不学习，使用固定的默认超时
+            input_mode: 默认的文本输入方式，'standard' | 'fast' | 'paced'（见 INPUT_MODES）
+            keystroke_delay: paced 模式下相邻按键的间隔范围（秒），(最小值, 最大值)
+            resource_policy: 资源加载策略（拦截图片、字体、第三方请求等）
+                - None: 不拦截
+                - str / list: 预设名称，如 'no-media'、['text-only', 'no-trackers']
+                - Dict: ResourcePolicy 的参数
+                - ResourcePolicy: 使用指定的策略
+            user_data_dir: 用户数据目录（同一目录不能被多个浏览器同时使用）
+            auto_port: 是否使用独立端口和临时用户目录启动新的浏览器（多实例并存时使用，如 BrowserPool）
+            profile_template: 用户目录模板（ProfileTemplate 或模板目录），每个实例使用自己的克隆，
+                关闭浏览器后按模板配置合并缓存并删除克隆；优先于 user_data_dir
+            multi_tab: 是否用于多标签页并发（open_tab / run_in_tabs），为 True 时关闭后台标签页的
+                定时器和渲染节流（BACKGROUND_TAB_ARGUMENTS），会影响浏览器中的所有页面
         """
+        if input_mode not in self.INPUT_MODES:
+            raise ValueError(f"不支持的输入方式: {input_mode}，可选: {', '.join(self.INPUT_MODES)}")
+        
         # 创建浏览器配置
         co = ChromiumOptions()
         if headless:
             co.headless()
+        if auto_port:
+            co.auto_port()
+        if multi_tab:
+            for argument in self.BACKGROUND_TAB_ARGUMENTS:
+                co.set_argument(argument)
         
         # 处理指纹配置
-        self.fingerprint = None
-        self.injection_script = None
+        fingerprint = None
+        injection_script = None
         
         if fingerprint_config:
             # 如果是字符串，从预设中加载
             if isinstance(fingerprint_config, str):
-                self.fingerprint = BrowserFingerprint.get_preset(fingerprint_config)
-                if not self.fingerprint:
+                fingerprint = BrowserFingerprint.get_preset(fingerprint_config)
+                if not fingerprint:
                     logger.warning(f"未找到指纹预设: {fingerprint_config}，将不使用指纹修改")
             # 如果是字典，直接使用
             elif isinstance(fingerprint_config, dict):
-                self.fingerprint = fingerprint_config
+                fingerprint = fingerprint_config
             
             # 应用指纹配置
-            if self.fingerprint:
+            if fingerprint:
                 # 验证指纹
-                if BrowserFingerprint.validate_fingerprint(self.fingerprint):
+                if BrowserFingerprint.validate_fingerprint(fingerprint):
                     # 应用到 ChromiumOptions
-                    co = BrowserFingerprint.apply_to_chromium_options(co, self.fingerprint)
+                    co = BrowserFingerprint.apply_to_chromium_options(co, fingerprint)
                     # 生成注入脚本
-                    self.injection_script = BrowserFingerprint.get_injection_script(self.fingerprint)
-                    logger.success(f"已加载浏览器指纹: {self.fingerprint.get('name', '自定义')}")
+                    injection_script = BrowserFingerprint.get_injection_script(fingerprint)
+                    logger.success(f"已加载浏览器指纹: {fingerprint.get('name', '自定义')}")
                 else:
                     logger.error("指纹配置验证失败，将不使用指纹修改")
-                    self.fingerprint = None
-                    self.injection_script = None
+                    fingerprint = None
+                    injection_script = None
+        
+        # 用户数据目录：从模板克隆，或使用指定目录
+        profile = None
+        if profile_template is not None:
+            try:
+                if not isinstance(profile_template, ProfileTemplate):
+                    profile_template = ProfileTemplate(profile_template)
+                profile = profile_template.clone()
+                user_data_dir = profile.path
+                logger.info(f"已从模板克隆用户目录: {profile.stats}")
+            except Exception as e:
+                logger.error(f"❌ 克隆用户目录模板失败，使用全新的用户目录: {e}")
+        if user_data_dir:
+            co.set_user_data_path(user_data_dir)
+            if auto_port:
+                # set_user_data_path 会关闭 auto_port，这里单独分配一个空闲端口
+                co.set_local_port(PortFinder().get_port()[0])
         
         # 创建 WebPage 实例（WebOperator 完全拥有和管理）
-        self.page = WebPage(chromium_options=co)
+        page = WebPage(chromium_options=co)
         logger.info("WebOperator 已创建浏览器实例")
         
+        self._init_common(page, None, input_mode, keystroke_delay, fingerprint, injection_script, profile,
+                          settle_learner, resource_policy)
+    
+    @classmethod
+    def _from_tab(cls, parent, page):
+        """
+        创建绑定到已打开标签页的 WebOperator（open_tab() 使用），复用主 WebOperator 的配置
+        
+        Args:
+            parent: 主 WebOperator（拥有浏览器进程）
+            page: 标签页对象
+            
+        Returns:
+            标签页的 WebOperator；初始化失败时关闭已创建的会话和标签页后抛出异常
+        """
+        operator = cls.__new__(cls)
+        policy = parent.resource_policy.clone() if parent.resource_policy is not None else None
+        try:
+            operator._init_common(page, parent, parent.input_mode, parent.keystroke_delay, parent.fingerprint,
+                                  parent.injection_script, None, parent.settle_learner or False, policy)
+            if parent.profiler is not None:
+                operator.profiler = parent.profiler.attach(operator)
+        except Exception:
+            operator.close()
+            raise
+        return operator
+    
+    def _init_common(self, page, parent, input_mode, keystroke_delay, fingerprint, injection_script, profile,
+                     settle_learner, resource_policy):
+        """
+        初始化主 WebOperator 和标签页 WebOperator 共有的状态
+        
+        Args:
+            page: 页面（标签页）对象
+            parent: 主 WebOperator，主 WebOperator 自身为 None
+            input_mode: 默认的文本输入方式
+            keystroke_delay: paced 模式下相邻按键的间隔范围（秒）
+            fingerprint: 已验证的指纹配置
+            injection_script: 指纹注入脚本
+            profile: 用户目录模板的克隆（只属于主 WebOperator）
+            settle_learner: 页面稳定时间学习器（同 __init__）
+            resource_policy: 资源加载策略（同 __init__）
+        """
+        self.page = page
+        self.input_mode = input_mode
+        self.keystroke_delay = keystroke_delay
+        self.fingerprint = fingerprint
+        self.injection_script = injection_script
+        self.profile = profile
+        
+        # 标签页（open_tab 创建的 WebOperator 共用这个浏览器）
+        self._parent = parent
+        self._tabs = []
+        self._tabs_lock = threading.Lock()
+        
+        self._setup_page(settle_learner, resource_policy)
+    
+    def _setup_page(self, settle_learner, resource_policy):
+        """
+        初始化与页面（标签页）绑定的状态，并应用资源策略、指纹脚本和 Client Hints
+        
+        这些 CDP 设置只对调用时的 target 生效，每个标签页都需要各自应用一次
+        """
+        # 页面专用 CDP 会话（就绪检测、请求拦截和资源策略共用，首次使用时创建）
+        self._session = None
+        self._interceptor = None
+        self._captures = []
+        self._recorders = []
+        
+        # 页面就绪检测（首次等待时创建），以及最近一次等待的结果
+        self._readiness = None
+        self.last_readiness = None
+        self.settle_learner = SettleLearner.shared() if settle_learner is None else (settle_learner or None)
+        
+        # 页面运行时（批量操作时创建）
+        self._runtime = None
+        
+        # CDP 往返分析器（enable_profiling() 启用）
+        self.profiler = None
+        
+        # 资源加载策略（需要在第一次导航前生效）
+        self.resource_policy = None
+        if resource_policy:
+            self.set_resource_policy(resource_policy)
+        
         # 如果有指纹脚本，使用 CDP 在页面加载前注入（关键！）
         if self.injection_script:
             self._inject_fingerprint_script_on_new_document()
@@ -73,13 +245,164 @@ class WebOperator:
             logger.success("Client Hints 请求头拦截已配置")
     
     def close(self):
-        """关闭浏览器"""
+        """关闭浏览器（标签页的 WebOperator 只关闭自己的标签页）"""
+        with self._tabs_lock:
+            tabs, self._tabs = self._tabs, []
+        for tab in tabs:
+            tab.close()
+        if self.profiler is not None:
+            self.profiler.detach(self)
+        for capture in self._captures:
+            capture.stop()
+        self._captures = []
+        for recorder in self._recorders:
+            recorder.stop()
+        self._recorders = []
+        if self._interceptor is not None:
+            self._interceptor.close()
+            self._interceptor = None
+        if self._readiness is not None:
+            self._readiness.close()
+            self._readiness = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        if self._parent is not None:
+            self._close_tab()
+            return
+        if self.settle_learner is not None:
+            self.settle_learner.save()
         if self.page:
             try:
                 self.page.quit()
                 logger.info("浏览器已关闭")
             except Exception as e:
                 logger.error(f"关闭浏览器失败: {e}")
+        if self.profile is not None:
+            self.profile.release()
+    
+    # ========== 多标签页 ==========
+    
+    @property
+    def is_tab(self):
+        """是否为 open_tab() 创建的标签页 WebOperator"""
+        return self._parent is not None
+    
+    @property
+    def tabs(self):
+        """当前打开的标签页 WebOperator 列表"""
+        with self._tabs_lock:
+            return list(self._tabs)
+    
+    def open_tab(self, url=None, wait_time=None):
+        """
+        在同一个浏览器进程中打开新标签页，返回绑定到该标签页的 WebOperator
+        
+        新标签页复用已解析的指纹配置和注入脚本，并各自应用指纹注入、Client Hints 和资源策略。
+        每个标签页有独立的 CDP 连接，不同标签页的 WebOperator 可以在不同线程中并发使用
+        （同一个 WebOperator 不要在多个线程中同时使用）。
+        
+        Args:
+            url: 可选，打开后导航到该地址
+            wait_time: 导航后的固定等待时间（秒），None 表示等待页面就绪
+            
+        Returns:
+            标签页的 WebOperator，失败时返回 None
+        """
+        root = self._parent or self
+        try:
+            page = root.page.new_tab(background=True)
+        except Exception as e:
+            logger.error(f"❌ 打开标签页失败: {e}")
+            return None
+        try:
+            operator = type(self)._from_tab(root, page)
+        except Exception as e:
+            # _from_tab 已关闭标签页
+            logger.error(f"❌ 初始化标签页失败: {e}")
+            return None
+        with root._tabs_lock:
+            root._tabs.append(operator)
+        logger.info(f"已打开标签页 {page.tab_id}（共 {len(root._tabs)} 个）")
+        if url:
+            operator.navigate(url, wait_time)
+        return operator
+    
+    def _close_tab(self):
+        with self._parent._tabs_lock:
+            if self in self._parent._tabs:
+                self._parent._tabs.remove(self)
+        try:
+            self.page.close()
+            logger.debug(f"标签页已关闭: {self.page.tab_id}")
+        except Exception as e:
+            logger.warning(f"⚠️  关闭标签页失败: {e}")
+    
+    def run_in_tabs(self, func, items, max_tabs=4, return_exceptions=True):
+        """
+        在同一个浏览器的多个标签页中并发处理任务
+        
+        打开 min(max_tabs, len(items)) 个标签页，线程池中每个任务独占一个标签页的 WebOperator，
+        完成后把标签页交给下一个任务，全部结束后关闭这些标签页。需要提取元素时，在 func 中为
+        标签页创建独立的 PageExtractor：
+        
+            def fetch(operator, url):
+                operator.navigate(url)
+                return PageExtractor(operator.page).extract_elements()
+            
+            results = operator.run_in_tabs(fetch, urls, max_tabs=4)
+        
+        Args:
+            func: 任务函数 func(operator, item)，operator 为标签页的 WebOperator
+            items: 任务参数列表
+            max_tabs: 最多同时打开的标签页数
+            return_exceptions: 任务出错时是否把异常作为结果返回；False 时抛出第一个异常
+            
+        Returns:
+            与 items 顺序一致的结果列表
+        """
+        items = list(items)
+        if not items:
+            return []
+        
+        idle = queue.Queue()
+        opened = []
+        for _ in range(min(max_tabs, len(items))):
+            tab = self.open_tab()
+            if tab is None:
+                break
+            opened.append(tab)
+            idle.put(tab)
+        if not opened:
+            raise RuntimeError("无法打开标签页")
+        
+        def run(item):
+            operator = idle.get()
+            try:
+                return func(operator, item)
+            finally:
+                idle.put(operator)
+        
+        start = time.perf_counter()
+        results = []
+        try:
+            with ThreadPoolExecutor(max_workers=len(opened)) as executor:
+                futures = [executor.submit(run, item) for item in items]
+                for item, future in zip(items, futures):
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        if not return_exceptions:
+                            for pending in futures:
+                                pending.cancel()
+                            raise
+                        logger.warning(f"⚠️  标签页任务失败 [{item}]: {e}")
+                        results.append(e)
+        finally:
+            for tab in opened:
+                tab.close()
+        logger.success(f"✅ {len(items)} 个任务已在 {len(opened)} 个标签页中完成，耗时 {time.perf_counter() - start:.2f}s")
+        return results
     
     def _inject_fingerprint_script_on_new_document(self):
         """
@@ -139,82 +462,365 @@ class WebOperator:
             logger.error(f"❌ 指纹验证失败: {e}")
             return {}
     
+    # ========== 资源加载策略 ==========
+    
+    def _get_session(self):
+        """获取页面专用 CDP 会话（首次调用时创建）"""
+        if self._session is None:
+            self._session = CDPSession(self.page)
+        return self._session
+    
+    def get_request_interceptor(self):
+        """
+        获取页面的请求拦截引擎（首次调用时创建，资源策略等共用同一个实例）
+        
+        Returns:
+            RequestInterceptor 实例
+        """
+        if self._interceptor is None:
+            self._interceptor = RequestInterceptor(self.page, session=self._get_session())
+        return self._interceptor
+    
+    def interception_metrics(self):
+        """
+        请求拦截的统计和耗时（被暂停的请求数、放行 / 拦截数、从暂停到回复的耗时分布）
+        
+        Returns:
+            RequestInterceptor.metrics() 的返回值，还没有使用拦截时返回 None
+        """
+        if self._interceptor is None:
+            return None
+        return self._interceptor.metrics()
+    
+    def capture_responses(self, url_pattern=None, content_types=('json',), resource_types=('XHR', 'Fetch'),
+                          callback=None, max_buffer=100):
+        """
+        开始捕获页面收到的网络响应（如接口返回的 JSON），不需要等待渲染和元素提取
+        
+        需要在触发请求的导航 / 点击之前调用；用完后调用 stop()（或使用 with 语句），
+        WebOperator 关闭时会停止所有捕获。
+        
+            with operator.capture_responses('*/api/search*') as capture:
+                operator.navigate(url)
+                results = capture.wait_for(timeout=10)['data']
+        
+        Args:
+            url_pattern: URL 匹配条件（通配符字符串、正则表达式、函数或它们的列表），None 匹配所有
+            content_types: 内容类型关键字，默认只捕获 JSON；None 不限制
+            resource_types: CDP 资源类型，默认 XHR 和 fetch 请求；None 不限制
+            callback: 可选，每个响应到达时在捕获线程中调用 callback(response)
+            max_buffer: 缓冲区大小，满时丢弃最早的响应；0 表示只调用回调
+            
+        Returns:
+            已启动的 ResponseCapture，失败时返回 None
+        """
+        self._captures = [capture for capture in self._captures if capture.running]
+        capture = ResponseCapture(self.page, url_pattern=url_pattern, content_types=content_types,
+                                  resource_types=resource_types, callback=callback, max_buffer=max_buffer,
+                                  session=self._get_session())
+        if not capture.start():
+            return None
+        self._captures.append(capture)
+        return capture
+    
+    def record_network(self, archive, ignore_params=()):
+        """
+        开始录制页面收到的全部响应（URL、响应头、响应体）到本地存档
+        
+        Args:
+            archive: NetworkArchive 实例或存档目录
+            ignore_params: 存档目录时生效，生成请求键时忽略的查询参数名（如时间戳类缓存破坏参数）
+            
+        Returns:
+            已启动的 NetworkRecorder（stop() 或 WebOperator 关闭时保存存档），失败时返回 None
+        """
+        return self._start_recorder(archive, 'record', 'fail', ignore_params)
+    
+    def replay_network(self, archive, fallback='fail', ignore_params=()):
+        """
+        按存档回放响应（Fetch 拦截后直接返回录制的响应，不访问网络）
+        
+        需要在导航之前调用；回放让 Agent / 提取器的基准测试可重复，开发时也不再等待网络。
+        
+        Args:
+            archive: NetworkArchive 实例或存档目录
+            fallback: 存档中没有的请求，'fail'（默认，以断网失败）或 'network'（正常访问网络）
+            ignore_params: 存档目录时生效，生成请求键时忽略的查询参数名
+            
+        Returns:
+            已启动的 NetworkRecorder，失败时返回 None
+        """
+        return self._start_recorder(archive, 'replay', fallback, ignore_params)
+    
+    def _start_recorder(self, archive, mode, fallback, ignore_params):
+        if not isinstance(archive, NetworkArchive):
+            archive = NetworkArchive(archive, ignore_params)
+        self._recorders = [recorder for recorder in self._recorders if recorder.running]
+        recorder = NetworkRecorder(self.page, archive, mode=mode, fallback=fallback, session=self._get_session(),
+                                   interceptor=self.get_request_interceptor())
+        if not recorder.start():
+            return None
+        self._recorders.append(recorder)
+        return recorder
+    
+    # ========== CDP 往返分析 ==========
+    
+    def enable_profiling(self, profiler=None):
+        """
+        启用 CDP 往返分析（之后打开的标签页使用同一个分析器）
+        
+        Args:
+            profiler: 可选，CDPProfiler 实例；None 时创建新的分析器（已启用时返回当前分析器）
+            
+        Returns:
+            CDPProfiler 实例
+        """
+        if self.profiler is not None and profiler in (None, self.profiler):
+            return self.profiler
+        self.disable_profiling()
+        self.profiler = (profiler or CDPProfiler()).attach(self)
+        for tab in self.tabs:
+            tab.profiler = self.profiler.attach(tab)
+        logger.info("CDP 往返分析已启用")
+        return self.profiler
+    
+    def disable_profiling(self):
+        """
+        停用 CDP 往返分析（分析器中的记录保留，可继续生成报告）
+        
+        Returns:
+            停用的 CDPProfiler，未启用时返回 None
+        """
+        profiler = self.profiler
+        if profiler is None:
+            return None
+        for tab in self.tabs:
+            profiler.detach(tab)
+            tab.profiler = None
+        profiler.detach(self)
+        self.profiler = None
+        return profiler
+    
+    def set_resource_policy(self, policy):
+        """
+        设置资源加载策略（替换已有策略）
+        
+        Args:
+            policy: 预设名称 / 预设名称列表 / 参数字典 / ResourcePolicy 实例，None 表示取消拦截
+            
+        Returns:
+            是否成功
+        """
+        if self.resource_policy is not None:
+            self.resource_policy.detach()
+            self.resource_policy = None
+        policy = ResourcePolicy.from_config(policy)
+        if policy is None:
+            return True
+        if not policy.attach(self.page, self._get_session(), self.get_request_interceptor()):
+            return False
+        self.resource_policy = policy
+        return True
+    
+    def resource_report(self):
+        """
+        最近一次导航的资源统计（请求数、下载字节数、被拦截的请求数和估算节省的字节数）
+        
+        Returns:
+            统计字典，没有资源策略或还没有导航时返回 None
+        """
+        if self.resource_policy is None:
+            return None
+        return self.resource_policy.report()
+    
+    # ========== 页面就绪等待 ==========
+    
+    def _get_readiness(self):
+        """
+        获取页面就绪检测器（首次调用时创建并启动）
+        
+        Returns:
+            PageReadiness 实例，不可用时返回 None
+        """
+        if self._readiness is None:
+            self._readiness = PageReadiness(self.page, session=self._get_session())
+        if self._readiness.start():
+            return self._readiness
+        return None
+    
+    def wait_until_ready(self, until='settled', since=None, expect_navigation=False, timeout=None):
+        """
+        等待页面就绪（基于 CDP 生命周期事件）
+        
+        Args:
+            until: 等待条件，'settled' | 'domcontentloaded' | 'load' | 'network_idle' | 'dom_quiet'
+            since: PageReadiness.mark() 的返回值，None 表示从现在开始
+            expect_navigation: 是否必须等到一次新的导航
+            timeout: 超时时间（秒），None 使用默认值
+            
+        Returns:
+            等待结果字典 {'condition', 'elapsed', 'navigated', 'timed_out'}，就绪检测不可用时返回 None
+        """
+        readiness = self._get_readiness()
+        if readiness is None:
+            return None
+        result = readiness.wait(until, since=since, expect_navigation=expect_navigation, timeout=timeout)
+        self.last_readiness = result
+        if result['timed_out']:
+            logger.warning(f"⚠️  等待页面就绪超时（{result['elapsed']}s）")
+        else:
+            logger.debug(f"页面就绪: {result['condition']} ({result['elapsed']}s)")
+        return result
+    
+    def _settle(self, readiness, since, url, action_type, until, timeout, expect_navigation=False):
+        """
+        等待操作后的页面就绪，并把耗时记录到学习器
+        
+        Args:
+            readiness: PageReadiness 实例
+            since: 操作前 readiness.mark() 的返回值
+            url: 用于归类的页面 URL（操作前的页面，导航时为目标 URL）
+            action_type: 操作类型，如 'navigate'、'click'
+            until: 就绪条件
+            timeout: 超时时间（秒），None 时使用学习到的超时
+            expect_navigation: 是否必须等到一次新的导航
+        """
+        if timeout is None and self.settle_learner is not None:
+            timeout = self.settle_learner.timeout(url, action_type, readiness.timeout)
+        result = self.wait_until_ready(until, since=since, expect_navigation=expect_navigation, timeout=timeout)
+        if result and self.settle_learner is not None:
+            self.settle_learner.record(url, action_type, result['elapsed'], timed_out=result['timed_out'])
+        return result
+    
+    def _run_and_wait(self, action, action_type, wait_time, until, timeout, expect_navigation=False):
+        """
+        执行操作并等待页面就绪
+        
+        Args:
+            action: 触发导航 / 页面变化的无参函数
+            action_type: 操作类型（用于学习稳定时间）
+            wait_time: 固定等待时间（秒）；不为 None 时不使用就绪检测
+            until: 就绪条件
+            timeout: 就绪等待超时时间（秒），None 时使用学习到的超时
+            expect_navigation: 操作是否一定会触发导航
+        """
+        readiness = self._get_readiness() if wait_time is None else None
+        if readiness is None:
+            self.last_readiness = None
+            action()
+            wait_time = self.FALLBACK_WAIT if wait_time is None else wait_time
+            if wait_time > 0:
+                sleep(wait_time)
+            return
+        
+        url = self.page.url
+        since = readiness.mark()
+        action()
+        self._settle(readiness, since, url, action_type, until, timeout, expect_navigation)
+    
+    def _get_without_waiting(self, url):
+        """以 none 加载模式打开 URL（不等待页面加载，由就绪检测接管等待）"""
+        load_mode = self.page.load_mode
+        self.page.set.load_mode('none')
+        try:
+            self.page.get(url)
+        finally:
+            self.page.set.load_mode(load_mode)
+    
     # ========== 页面导航方法 ==========
     
-    def navigate(self, url, wait_time=3):
+    def navigate(self, url, wait_time=None, until='settled', timeout=None):
         """
         导航到指定URL并等待页面加载
         
         Args:
             url: 目标URL
-            wait_time: 页面加载后等待时间（秒）
+            wait_time: 页面加载后的固定等待时间（秒）；None 表示等待页面就绪后立即返回
+            until: 就绪条件（见 wait_until_ready）
+            timeout: 就绪等待超时时间（秒），None 时使用学习到的超时
             
         Returns:
             是否成功导航
         """
         try:
             logger.info(f"正在加载页面: {url}")
-            self.page.get(url)
             
             # 注意：指纹脚本已经通过 CDP 在页面加载前自动注入了
             # 不需要在这里手动注入
             
-            if wait_time > 0:
-                sleep(wait_time)
+            readiness = self._get_readiness() if wait_time is None else None
+            if readiness is None:
+                # 固定等待（或就绪检测不可用）：由 DrissionPage 等待页面加载完成
+                self.last_readiness = None
+                self.page.get(url)
+                if wait_time:
+                    sleep(wait_time)
+            else:
+                since = readiness.mark()
+                self._get_without_waiting(url)
+                self._settle(readiness, since, url, 'navigate', until, timeout, expect_navigation=True)
             
-            logger.success("页面加载完成！")
+            logger.success(f"页面加载完成！{self._readiness_summary()}")
+            if self.resource_policy is not None:
+                logger.info(f"资源统计: {ResourcePolicy.format_report(self.resource_policy.report())}")
             return True
         except Exception as e:
             logger.error(f"页面加载失败: {e}")
             print(f"   URL: {url}")
             return False
     
-    def refresh_page(self, wait_time=3):
+    def refresh_page(self, wait_time=None, until='settled', timeout=None):
         """
         刷新当前页面
         
         Args:
-            wait_time: 刷新后等待时间（秒）
+            wait_time: 刷新后的固定等待时间（秒）；None 表示等待页面就绪后立即返回
+            until: 就绪条件（见 wait_until_ready）
+            timeout: 就绪等待超时时间（秒），None 时使用学习到的超时
             
         Returns:
             是否成功刷新
         """
         try:
             logger.info("正在刷新页面...")
-            self.page.refresh()
+            self._run_and_wait(self.page.refresh, 'refresh', wait_time, until, timeout, expect_navigation=True)
             
-            if wait_time > 0:
-                sleep(wait_time)
-            
-            logger.success("页面刷新完成！")
+            logger.success(f"页面刷新完成！{self._readiness_summary()}")
             return True
         except Exception as e:
             logger.error(f"页面刷新失败: {e}")
             return False
     
-    def go_back(self, wait_time=2):
+    def go_back(self, wait_time=None, until='settled', timeout=None):
         """
         返回上一页
         
         Args:
-            wait_time: 返回后等待时间（秒）
+            wait_time: 返回后的固定等待时间（秒）；None 表示等待页面就绪后立即返回
+            until: 就绪条件（见 wait_until_ready）
+            timeout: 就绪等待超时时间（秒），None 时使用学习到的超时
             
         Returns:
             是否成功返回
         """
         try:
             logger.info("返回上一页...")
-            self.page.back()
-            
-            if wait_time > 0:
-                sleep(wait_time)
+            # 没有历史记录时不会发生导航，因此不强制等待导航
+            self._run_and_wait(self.page.back, 'back', wait_time, until, timeout)
             
-            logger.success("已返回上一页")
+            logger.success(f"已返回上一页{self._readiness_summary()}")
             return True
         except Exception as e:
             logger.error(f"返回上一页失败: {e}")
             return False
     
+    def _readiness_summary(self):
+        """最近一次就绪等待的简短描述，用于日志和工具返回值"""
+        result = self.last_readiness
+        if not result:
+            return ""
+        return f"（{result['condition']}, {result['elapsed']}s）"
+    
     def get_current_url(self):
         """
         获取当前页面URL
@@ -232,7 +838,22 @@ class WebOperator:
     
     # ========== 元素操作方法 ==========
     
-    def input_text(self, selector, text, clear=True):
+    def _find_element(self, selector, timeout=None):
+        """
+        查找元素，支持定位字符串、DrissionPage 元素对象和 ElementHandle 惰性句柄
+        
+        Args:
+            selector: 元素定位器 / 元素对象 / ElementHandle
+            timeout: 超时时间（秒），None 使用页面默认值
+            
+        Returns:
+            元素对象，未找到时返回假值
+        """
+        if isinstance(selector, ElementHandle):
+            return selector.resolve() if timeout is None else selector.resolve(timeout=timeout)
+        return self.page.ele(selector, timeout=timeout)
+    
+    def input_text(self, selector, text, clear=True, until=None, timeout=None, mode=None, keystroke_delay=None):
         """
         在输入框中输入文本
         
@@ -240,54 +861,86 @@ class WebOperator:
             selector: 元素定位器
             text: 要输入的文本
             clear: 是否先清空输入框
+            until: 输入后等待的就绪条件（如 'dom_quiet'，用于等待联想下拉框），None 表示不等待
+            timeout: 就绪等待超时时间（秒），None 时使用学习到的超时
+            mode: 输入方式，'standard' | 'fast' | 'paced'，None 使用初始化时的 input_mode
+            keystroke_delay: paced 模式的按键间隔范围（秒），None 使用初始化时的设置
             
         Returns:
             元素对象，如果失败返回 None
         """
         try:
-            element = self.page.ele(selector)
+            mode = mode or self.input_mode
+            if mode not in self.INPUT_MODES:
+                logger.error(f" 不支持的输入方式: {mode}")
+                return None
+            
+            element = self._find_element(selector)
             if not element:
                 logger.error(f" 未找到元素: [{selector}]")
                 return None
             
-            if clear:
-                element.clear()
-            element.input(text)
-            logger.success(f" 已在元素 [{selector}] 中输入: {text}")
+            def type_text():
+                self._type_into(element, str(text), clear, mode, keystroke_delay or self.keystroke_delay)
+            
+            if until is None:
+                type_text()
+            else:
+                self._run_and_wait(type_text, 'input', None, until, timeout)
+            logger.success(f" 已在元素 [{selector}] 中输入（{mode}）: {text}")
             return element
         except Exception as e:
             logger.error(f" 输入文本失败: {e}")
             print(f"   定位器: [{selector}]")
             return None
     
-    def click_element(self, selector, wait_before=1, wait_after=1):
+    def _type_into(self, element, text, clear, mode, keystroke_delay):
+        """按指定输入方式向元素输入文本"""
+        if mode == 'fast':
+            self._get_runtime().call_on(element, 'fill', text, bool(clear))
+            return
+        if clear:
+            element.clear()
+        if mode == 'standard':
+            element.input(text)
+            return
+        
+        # paced：聚焦后逐个字符发送键盘事件
+        element.focus()
+        low, high = keystroke_delay
+        for i, char in enumerate(text):
+            self.page.actions.type(char)
+            if i < len(text) - 1:
+                sleep(random.uniform(low, high))
+    
+    def click_element(self, selector, wait_before=None, wait_after=None, until='settled', timeout=None):
         """
         点击元素
         
         Args:
             selector: 元素定位器
-            wait_before: 点击前等待时间（秒）
-            wait_after: 点击后等待时间（秒）
+            wait_before: 点击前的固定等待时间（秒），None 表示不等待
+            wait_after: 点击后的固定等待时间（秒）；None 表示等待页面就绪后立即返回
+                （点击触发导航时会先等到新页面 DOMContentLoaded）
+            until: 就绪条件（见 wait_until_ready）
+            timeout: 就绪等待超时时间（秒），None 时使用学习到的超时
             
         Returns:
             元素对象，如果失败返回 None
         """
         try:
-            element = self.page.ele(selector)
+            element = self._find_element(selector)
             if not element:
                 logger.error(f" 未找到元素: [{selector}]")
                 return None
             
             # 点击前等待
-            if wait_before > 0:
+            if wait_before:
                 sleep(wait_before)
             
-            element.click()
-            logger.success(f" 已点击元素: [{selector}]")
-            
-            # 点击后等待
-            if wait_after > 0:
-                sleep(wait_after)
+            # 点击后等待页面就绪（或固定等待）
+            self._run_and_wait(element.click, 'click', wait_after, until, timeout)
+            logger.success(f" 已点击元素: [{selector}]{self._readiness_summary()}")
             
             return element
         except Exception as e:
@@ -307,7 +960,7 @@ class WebOperator:
             元素对象，如果失败返回 None
         """
         try:
-            element = self.page.ele(selector)
+            element = self._find_element(selector)
             if not element:
                 logger.error(f" 未找到下拉框: [{selector}]")
                 return None
@@ -331,7 +984,7 @@ class WebOperator:
             元素文本，如果失败返回 None
         """
         try:
-            element = self.page.ele(selector)
+            element = self._find_element(selector)
             if not element:
                 logger.error(f" 未找到元素: [{selector}]")
                 return None
@@ -352,7 +1005,7 @@ class WebOperator:
             元素的 value 属性值，如果失败返回 None
         """
         try:
-            element = self.page.ele(selector)
+            element = self._find_element(selector)
             if not element:
                 logger.error(f" 未找到元素: [{selector}]")
                 return None
@@ -374,7 +1027,7 @@ class WebOperator:
             属性值，如果失败返回 None
         """
         try:
-            element = self.page.ele(selector)
+            element = self._find_element(selector)
             if not element:
                 logger.error(f" 未找到元素: [{selector}]")
                 return None
@@ -416,7 +1069,7 @@ class WebOperator:
             元素是否可见
         """
         try:
-            element = self.page.ele(selector, timeout=timeout)
+            element = self._find_element(selector, timeout=timeout)
             return element is not None
         except Exception:
             return False
@@ -432,7 +1085,7 @@ class WebOperator:
             是否成功滚动
         """
         try:
-            element = self.page.ele(selector)
+            element = self._find_element(selector)
             if not element:
                 logger.error(f" 未找到元素: [{selector}]")
                 return False
@@ -446,6 +1099,208 @@ class WebOperator:
             return False
 
 
+    # ========== 批量操作 ==========
+    
+    # 批量操作支持的动作
+    BATCH_ACTIONS = ('fill', 'click', 'select', 'scroll', 'wait_for')
+    
+    # 可以直接作为 CSS 选择器在页面内使用的定位器前缀
+    CSS_PREFIXES = ('css:', 'c:')
+    
+    def run_batch(self, actions: List[Dict[str, Any]], extractor=None, stop_on_error=True, native_clicks=True):
+        """
+        批量执行操作，连续的页面内操作合并为一次脚本调用
+        
+        填写、选择、滚动和等待元素在页面运行时中依次执行（一次 CDP 往返），
+        点击默认通过 DrissionPage 发送真实鼠标事件并等待页面就绪，会打断页面内批次；
+        无法在页面内定位的目标（非 CSS 定位器、快照引擎提取的元素等）逐个通过对应方法执行。
+        
+        Args:
+            actions: 操作列表，每项为字典，例如：
+                - {'action': 'fill', 'index': 3, 'text': 'hello', 'clear': True, 'mode': 'fast'}
+                - {'action': 'click', 'index': 5}
+                - {'action': 'select', 'selector': 'css:select[name=city]', 'value': '北京'}
+                - {'action': 'scroll', 'index': 8} 或 {'action': 'scroll', 'y': 600}
+                - {'action': 'wait_for', 'selector': 'css:.result', 'timeout': 5}
+                - {'action': 'wait_for', 'until': 'settled'}（等待页面就绪）
+                目标用 index（提取结果中的索引）或 selector（定位器 / 元素对象）指定；
+                fill 未指定 mode 时，input_mode 为 'standard' 则使用 fast 方式，否则使用 input_mode
+            extractor: 可选，PageExtractor；提供时索引按提取结果解析（支持快照引擎提取的元素）
+            stop_on_error: 某个操作失败后是否跳过剩余操作
+            native_clicks: 点击是否使用真实鼠标事件；False 时在页面内调用 element.click()
+            
+        Returns:
+            与 actions 一一对应的结果列表 [{'action', 'ok', 'elapsed', 'error'?, 'skipped'?}, ...]
+        """
+        results = []
+        pending = []  # 连续的页面内操作 [(位置, 页面内操作), ...]
+        
+        def flush():
+            if pending:
+                results.extend(self._run_in_page([spec for _, spec in pending], extractor, stop_on_error))
+                pending.clear()
+        
+        def failed():
+            return stop_on_error and any(not result['ok'] for result in results)
+        
+        for action in actions:
+            spec = self._in_page_action(action, extractor, native_clicks)
+            if spec is not None:
+                pending.append((action, spec))
+                continue
+            flush()
+            if failed():
+                break
+            results.append(self._run_native_action(action, extractor))
+            if failed():
+                break
+        flush()
+        
+        for action in actions[len(results):]:
+            results.append({'action': action.get('action'), 'ok': False, 'skipped': True,
+                            'elapsed': 0, 'error': '前面的操作失败，已跳过'})
+        
+        succeeded = sum(1 for result in results if result['ok'])
+        logger.info(f"批量操作完成: {succeeded}/{len(results)} 成功")
+        return results
+    
+    def _get_runtime(self, extractor=None):
+        """获取页面运行时（优先复用提取器的运行时）"""
+        runtime = getattr(extractor, 'runtime', None)
+        if runtime is not None:
+            return runtime
+        if self._runtime is None:
+            self._runtime = PageRuntime(self.page)
+        return self._runtime
+    
+    def _in_page_action(self, action, extractor, native_clicks):
+        """
+        转换为页面运行时可以执行的操作
+        
+        Returns:
+            可 JSON 序列化的操作字典，需要在 Python 侧执行时返回 None
+        """
+        name = action.get('action')
+        if name not in self.BATCH_ACTIONS or (name == 'click' and native_clicks):
+            return None
+        spec = {'action': name}
+        if name == 'fill':
+            # 只有 fast 方式可以在页面内执行，逐键输入需要 Python 侧发送键盘事件
+            if self._batch_input_mode(action) != 'fast':
+                return None
+            spec['text'] = str(action.get('text', action.get('value', '')))
+            spec['clear'] = action.get('clear', True)
+        elif name == 'select':
+            spec['value'] = str(action.get('value', ''))
+        elif name == 'scroll':
+            spec['x'] = action.get('x', 0)
+            spec['y'] = action.get('y', 0)
+        elif name == 'wait_for':
+            if action.get('until'):
+                return None
+            spec['timeout'] = action.get('timeout', 10)
+            spec['visible'] = action.get('visible', True)
+        
+        index = action.get('index')
+        selector = action.get('selector')
+        if index is not None:
+            # 快照类引擎提取的元素没有页面内标记，只能通过 backendNodeId 在 Python 侧操作
+            record = extractor.get_element(index) if extractor is not None else None
+            if record is not None and record.backend_id is not None:
+                return None
+            spec['index'] = index
+        elif isinstance(selector, ElementHandle):
+            if selector.backend_id is not None:
+                return None
+            spec['index'] = selector.index
+        elif isinstance(selector, str):
+            if not selector.startswith(self.CSS_PREFIXES):
+                return None
+            spec['selector'] = selector.split(':', 1)[1]
+        elif selector is not None or name != 'scroll':
+            return None
+        if name == 'wait_for' and 'selector' not in spec:
+            return None
+        return spec
+    
+    def _batch_input_mode(self, action):
+        """批量操作中 fill 使用的输入方式"""
+        return action.get('mode') or ('fast' if self.input_mode == 'standard' else self.input_mode)
+    
+    def _run_in_page(self, specs, extractor, stop_on_error):
+        """在页面运行时中执行一批操作"""
+        timeout = 10 + sum(spec.get('timeout', 0) for spec in specs)
+        try:
+            results = self._get_runtime(extractor).call('batch', specs, {'stopOnError': stop_on_error}, timeout=timeout)
+        except Exception as e:
+            logger.error(f" 页面内批量操作失败: {e}")
+            results = [{'action': spec['action'], 'ok': False, 'error': str(e), 'elapsed': 0} for spec in specs]
+        results = list(results)[:len(specs)] if isinstance(results, list) else []
+        for result in results:
+            result['elapsed'] = round(result.get('elapsed', 0) / 1000, 3)
+            if not result['ok']:
+                logger.error(f" 批量操作 {result['action']} 失败: {result.get('error')}")
+        # 运行时在失败后停止（或没有返回结果）时补齐，保证结果与 specs 一一对应
+        stopped = any(not result['ok'] for result in results)
+        for spec in specs[len(results):]:
+            if stopped:
+                results.append({'action': spec['action'], 'ok': False, 'skipped': True,
+                                'elapsed': 0, 'error': '前面的操作失败，已跳过'})
+            else:
+                logger.error(f" 批量操作 {spec['action']} 没有返回结果")
+                results.append({'action': spec['action'], 'ok': False, 'elapsed': 0, 'error': '页面运行时没有返回结果'})
+        return results
+    
+    def _batch_target(self, action, extractor):
+        """Python 侧执行时的元素目标（ElementHandle / 定位器 / 元素对象）"""
+        index = action.get('index')
+        if index is None:
+            return action.get('selector')
+        record = extractor.get_element(index) if extractor is not None else None
+        if record is not None:
+            return record.element
+        return ElementHandle(self.page, index)
+    
+    def _run_native_action(self, action, extractor):
+        """通过 WebOperator 的单个操作方法执行"""
+        name = action.get('action')
+        started = time.perf_counter()
+        result = {'action': name, 'ok': False}
+        try:
+            target = self._batch_target(action, extractor)
+            if name not in self.BATCH_ACTIONS:
+                result['error'] = f"不支持的操作: {name}"
+            elif name == 'wait_for' and action.get('until'):
+                readiness = self.wait_until_ready(action['until'], timeout=action.get('timeout'))
+                result['ok'] = bool(readiness) and not readiness['timed_out']
+                result['condition'] = readiness['condition'] if readiness else None
+            elif target is None and name != 'scroll':
+                result['error'] = '缺少 index 或 selector'
+            elif name == 'fill':
+                text = str(action.get('text', action.get('value', '')))
+                result['ok'] = self.input_text(target, text, clear=action.get('clear', True),
+                                               mode=self._batch_input_mode(action)) is not None
+            elif name == 'click':
+                result['ok'] = self.click_element(target) is not None
+                if self.last_readiness:
+                    result['condition'] = self.last_readiness['condition']
+            elif name == 'select':
+                result['ok'] = self.select_option(target, action.get('value')) is not None
+            elif name == 'scroll':
+                if target is None:
+                    self.page.run_js(f"window.scrollBy({int(action.get('x', 0))}, {int(action.get('y', 0))});")
+                    result['ok'] = True
+                else:
+                    result['ok'] = self.scroll_to_element(target)
+            elif name == 'wait_for':
+                result['ok'] = self.wait_for_element(target, timeout=action.get('timeout', 10))
+            if not result['ok'] and 'error' not in result:
+                result['error'] = f"{name} 执行失败"
+        except Exception as e:
+            result['error'] = str(e)
+        result['elapsed'] = round(time.perf_counter() - started, 3)
+        return result
+
     def refresh(self):
         """
         刷新当前页面
@@ -454,43 +1309,61 @@ class WebOperator:
         logger.success("页面刷新完成！")
         return True
     
-    def take_screenshot(self, file_path=None):
+    def capture_screenshot(self, selector=None, clip=None, full_page=False, format='png', quality=None,
+                           scale=None, output='bytes', save_path=None):
         """
-        截取当前页面截图
+        在内存中截图（不写入磁盘，除非指定 save_path）
         
         Args:
-            file_path: 截图保存路径，如果不提供则自动生成带时间戳的文件名
+            selector: 可选，只截取该元素（元素定位器 / 元素对象 / ElementHandle）
+            clip: 可选，裁剪矩形 {'x', 'y', 'width', 'height'}（页面坐标，CSS 像素）
+            full_page: 是否截取整个页面，默认只截取当前视口
+            format: 'png' | 'jpeg' | 'webp'
+            quality: JPEG / WebP 质量（0-100）
+            scale: 输出图片相对 CSS 像素的比例，None 保持浏览器当前的设备像素比
+            output: 'bytes' | 'base64' | 'image'（PIL.Image）
+            save_path: 可选，同时把截图写入该文件
             
         Returns:
-            截图文件路径，如果失败返回 None
+            截图数据，失败时返回 None
         """
-        try:
-            if file_path is None:
-                import os
-                from datetime import datetime
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                # 获取项目根目录
-                project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..'))
-                # 确保 media 文件夹存在
-                media_dir = os.path.join(project_root, 'playground', 'outputs','imgs')
-                os.makedirs(media_dir, exist_ok=True)
-                file_path = os.path.join(media_dir, f'screenshot_{timestamp}.png')
-            
-            # 使用 DrissionPage 的截图功能
-            # 尝试使用 full_page 参数
-            try:
-                self.page.get_screenshot(path=file_path, full_page=True)
-            except TypeError:
-                # 如果不支持 full_page 参数，则使用基础截图
-                self.page.get_screenshot(path=file_path)
+        element = None
+        if selector is not None:
+            element = self._find_element(selector)
+            if not element:
+                logger.error(f"截图失败，未找到元素: {selector}")
+                return None
+        return ScreenshotCapture(self.page).capture(element=element, clip=clip, full_page=full_page, format=format,
+                                                    quality=quality, scale=scale, output=output,
+                                                    save_path=save_path)
+    
+    def take_screenshot(self, file_path=None, full_page=True, quality=None):
+        """
+        截取当前页面截图并保存到文件（只需要图片数据时使用 capture_screenshot）
+        
+        Args:
+            file_path: 截图保存路径，如果不提供则自动生成带时间戳的文件名；扩展名决定格式（.png / .jpg / .webp）
+            full_page: 是否截取整个页面
+            quality: JPEG / WebP 质量（0-100）
             
-            logger.success(f"截图已保存: {file_path}")
-            return file_path
-        except Exception as e:
-            logger.error(f"截图失败: {e}")
-            import traceback
-            traceback.print_exc()
+        Returns:
+            截图文件路径，如果失败返回 None
+        """
+        import os
+        if file_path is None:
+            from datetime import datetime
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # 获取项目根目录
+            project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..'))
+            media_dir = os.path.join(project_root, 'playground', 'outputs', 'imgs')
+            file_path = os.path.join(media_dir, f'screenshot_{timestamp}.png')
+        
+        extension = os.path.splitext(file_path)[1] or 'png'
+        data = self.capture_screenshot(full_page=full_page, format=extension, quality=quality, save_path=file_path)
+        if data is None:
             return None
+        logger.success(f"截图已保存: {file_path}")
+        return file_path
     
     def _setup_client_hints_interception(self):
         """
@@ -569,46 +1442,10 @@ class WebOperator:
             except Exception as e:
                 logger.warning(f"⚠️  Emulation.setUserAgentOverride 失败: {e}")
             
-            # 方法3: 设置请求拦截器
-            try:
-                # 启用请求拦截
-                self.page.run_cdp('Fetch.enable', {
-                    'patterns': [{'urlPattern': '*'}]
-                })
-                
-                # 注册请求处理器
-                def handle_request_paused(params):
-                    try:
-                        request_id = params['requestId']
-                        request = params['request']
-                        
-                        # 修改请求头
-                        headers = request.get('headers', {})
-                        
-                        # 添加 Client Hints 头部
-                        for hint_name, hint_value in client_hints.items():
-                            headers[hint_name] = hint_value
-                        
-                        # 继续请求
-                        self.page.run_cdp('Fetch.continueRequest', {
-                            'requestId': request_id,
-                            'headers': [{'name': k, 'value': v} for k, v in headers.items()]
-                        })
-                        
-                    except Exception as e:
-                        logger.debug(f"请求拦截处理失败: {e}")
-                        # 如果处理失败，继续原始请求
-                        try:
-                            self.page.run_cdp('Fetch.continueRequest', {'requestId': request_id})
-                        except:
-                            pass
-                
-                # 这里我们不能直接设置事件监听器，因为 DrissionPage 可能不支持
-                # 但我们已经启用了 Fetch domain
-                logger.info("✅ Fetch domain 已启用")
-                
-            except Exception as e:
-                logger.debug(f"启用 Fetch 拦截失败: {e}")
+            # 方法3: 通过 Network.setExtraHTTPHeaders 为所有请求附加 Client Hints 请求头
+            # 请求头是固定的，不需要逐个暂停请求（Fetch 拦截会给每个请求增加一次往返）
+            if self.get_request_interceptor().set_extra_headers(client_hints):
+                logger.success("✅ Client Hints 请求头已通过 Network.setExtraHTTPHeaders 设置")
             
             # 方法4: 强化的JavaScript注入
             enhanced_script = f"""
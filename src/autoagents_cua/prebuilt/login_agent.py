@@ -4,6 +4,7 @@ Login Agent -
 
 """
 
+from urllib.parse import urlparse
 from ..utils.logging import logger, set_stage
 from ..models import Stage
 from ..browser import PageExtractor, ShadowDOMParser, WebOperator
@@ -12,7 +13,8 @@ from ..browser import PageExtractor, ShadowDOMParser, WebOperator
 class LoginAgent:
     """ - """
     
-    def __init__(self, url, captcha_agent, headless=False, wait_time=3):
+    def __init__(self, url, captcha_agent, headless=False, wait_time=None, web_operator=None,
+                 storage_store=None, session_probe=None, session_probe_url=None):
         """
         
         
@@ -21,12 +23,24 @@ class LoginAgent:
             captcha_agent: CaptchaAgent 
             headless: 
             wait_time: 
+            web_operator: 可选，复用已有的 WebOperator（如 BrowserPool 借出的实例），
+                关闭时不会关闭它；None 时自行创建浏览器
+            storage_store: 可选，StorageStateStore；登录成功后按账号保存登录状态，
+                下次登录前先恢复，会话有效时跳过整个登录和验证码流程
+            session_probe: 可选，登录后才存在的元素定位器，或 probe(operator) -> bool / None，用于验证会话；
+                与 session_probe_url 都为 None 时只以是否被重定向离开登录页判断，仍停留在登录页时
+                视为无法判断（保留已保存的状态，重新登录，登录后也不保存）
+            session_probe_url: 可选，同源的探测 URL，带 Cookie 请求返回 2xx 视为会话有效
         """
         self.url = url
         self.wait_time = wait_time
+        self.storage_store = storage_store
+        self.session_probe = session_probe
+        self.session_probe_url = session_probe_url
         
         # WebOperator DrissionPage
-        self.web_operator = WebOperator(headless=headless)
+        self._owns_operator = web_operator is None
+        self.web_operator = web_operator or WebOperator(headless=headless)
         
         # WebOperator page 
         self.page = self.web_operator.page
@@ -44,9 +58,45 @@ class LoginAgent:
         """ WebOperator"""
         return self.web_operator.navigate(self.url, self.wait_time)
     
+    def _left_login_page(self, operator):
+        """
+        没有配置探测条件时的默认判断：打开登录页后被重定向到其他页面视为已登录
+
+        Returns:
+            离开登录页时返回 True；仍在登录页时返回 None（很多站点对已登录用户同样显示登录页，
+            或在首页弹窗登录，不能据此判定会话失效）
+        """
+        current, login = urlparse(operator.page.url), urlparse(self.url)
+        if (current.netloc, current.path.rstrip('/')) != (login.netloc, login.path.rstrip('/')):
+            return True
+        return None
+
+    def _session_probe(self):
+        """验证会话使用的探测条件"""
+        return self.session_probe or self._left_login_page
+
+    def restore_session(self, username):
+        """
+        恢复保存的登录状态并验证
+
+        Args:
+            username: 账号
+
+        Returns:
+            会话是否有效（未配置 storage_store 或没有保存的状态时返回 False）
+        """
+        if self.storage_store is None:
+            return False
+        return self.storage_store.restore(
+            self.web_operator, username, self.url,
+            probe=self._session_probe(),
+            probe_url=self.session_probe_url,
+        )
+
     def close(self):
-        """ WebOperator"""
-        self.web_operator.close()
+        """ WebOperator（复用外部传入的 WebOperator 时不关闭）"""
+        if self._owns_operator:
+            self.web_operator.close()
 
     def login(
         self, 
@@ -61,6 +111,10 @@ class LoginAgent:
         try:
             log.info("")
             
+            # 已保存的登录状态仍然有效时直接跳过登录和验证码
+            if self.restore_session(username):
+                return True
+            
             page_log = set_stage(Stage.PAGE_LOAD)
             success = self.web_operator.navigate(self.url, self.wait_time)
             if not success:
@@ -84,9 +138,9 @@ class LoginAgent:
                     element_log.warning("")
                     return False
                 
-                username_selector = username_selector or input_elements[0]['selector']
-                password_selector = password_selector or input_elements[1]['selector']
-                button_selector = button_selector or button_elements[0]['selector']
+                username_selector = username_selector or input_elements[0]['element']
+                password_selector = password_selector or input_elements[1]['element']
+                button_selector = button_selector or button_elements[0]['element']
                 
                 element_log.success(f": {username_selector}")
                 element_log.success(f": {password_selector}")
@@ -108,10 +162,16 @@ class LoginAgent:
             log.success("")
             
             # CaptchaAgent
-            if auto_handle_captcha:
-                captcha_success = self.captcha_agent.solve_captcha(self.page)
-                return captcha_success
+            if auto_handle_captcha and not self.captcha_agent.solve_captcha(self.page):
+                return False
             
+            if self.storage_store is not None:
+                # 提交成功不代表登录成功（密码错误、错误提示），只保存验证通过的会话
+                valid = self.storage_store.validate(self.web_operator, self._session_probe(), self.session_probe_url)
+                if valid is True:
+                    self.storage_store.save(self.web_operator, username, self.url)
+                else:
+                    log.warning(f"⚠️  无法确认已登录（{valid}），不保存登录状态")
             return True
         
         except Exception as e:
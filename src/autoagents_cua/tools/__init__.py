@@ -8,8 +8,10 @@ from .web_tool import (
     # 工具函数
     open_website,
     extract_page_elements,
+    more_page_elements,
     click_element,
     input_text_to_element,
+    fill_form,
     get_current_url,
     go_back,
     refresh_page,
@@ -30,8 +32,10 @@ __all__ = [
     # 工具函数
     'open_website',
     'extract_page_elements',
+    'more_page_elements',
     'click_element',
     'input_text_to_element',
+    'fill_form',
     'get_current_url',
     'go_back',
     'refresh_page',
@@ -4,7 +4,7 @@ Web Tools for AutoBrowser Agent
 每个工具都是独立的函数，可以自由组合使用
 """
 
-from typing import Callable, Optional, Any
+from typing import Callable, Optional, Any, List, Dict
 from functools import partial
 from langchain_core.tools import tool
 from ..utils.logging import logger
@@ -64,6 +64,11 @@ def create_tool_with_context(func: Callable, operator: Any, extractor: Any, time
         kwargs['operator'] = operator
         kwargs['extractor'] = extractor
         kwargs['time_tracker_ref'] = time_tracker_ref
+        # 启用了 CDP 往返分析时，每次工具调用记为一个步骤
+        profiler = getattr(operator, 'profiler', None)
+        if profiler is not None:
+            with profiler.step(tool_name):
+                return original_func(*args, **kwargs)
         # 调用原始函数
         return original_func(*args, **kwargs)
     
@@ -102,6 +107,17 @@ def _end_timing(time_tracker_ref, category="tool_call"):
             logger.debug(f"⏱️  {category}耗时: {elapsed:.2f}s")
 
 
+def _readiness_note(operator):
+    """最近一次页面就绪等待的说明（触发条件和耗时），没有等待记录时返回空字符串"""
+    result = getattr(operator, 'last_readiness', None)
+    if not result:
+        return ""
+    if result.get('timed_out'):
+        return f"（等待页面就绪超时 {result['elapsed']}s，页面可能仍在加载）"
+    navigated = "，已跳转到新页面" if result.get('navigated') else ""
+    return f"（页面就绪: {result['condition']}, {result['elapsed']}s{navigated}）"
+
+
 # ============================================================================
 # Web 工具函数定义
 # ============================================================================
@@ -144,19 +160,25 @@ def open_website(url: str, operator=None, extractor=None, time_tracker_ref=None)
         url = 'https://' + url
     
     _start_timing(time_tracker_ref, "tool_call")
-    success = operator.navigate(url, wait_time=0.4)
+    # 页面就绪（DOMContentLoaded 后网络空闲或 DOM 静默）后立即返回
+    success = operator.navigate(url)
     _end_timing(time_tracker_ref, "tool_call")
     
     if success:
-        return f"✅ 成功打开网站: {url}"
+        return f"✅ 成功打开网站: {url}{_readiness_note(operator)}"
     else:
         return f"❌ 打开网站失败: {url}"
 
 
 @tool
-def extract_page_elements(operator=None, extractor=None, time_tracker_ref=None) -> str:
+def extract_page_elements(query: str = "", operator=None, extractor=None, time_tracker_ref=None) -> str:
     """
-    提取当前页面的所有可交互元素（链接、按钮、输入框等）
+    提取当前页面的可交互元素（链接、按钮、输入框等），按与任务的相关度排序，
+    每行格式为 index|tag|text|attrs；元素较多时只返回最相关的一部分，
+    可以用 more_page_elements 查看其余元素
+    
+    Args:
+        query: 可选，当前要找的元素或任务关注点（例如 "搜索框"、"登录按钮"），为空时使用用户指令排序
     
     Returns:
         提取到的元素列表描述
@@ -170,31 +192,64 @@ def extract_page_elements(operator=None, extractor=None, time_tracker_ref=None)
     if not elements:
         return "❌ 未找到可交互元素"
     
-    # 生成简洁的元素描述
-    element_desc = f"✅ 找到 {len(elements)} 个可交互元素：\n\n"
-    
-    # 按类型分组
-    by_type = {}
-    for elem in elements:
-        tag = elem['tag']
-        if tag not in by_type:
-            by_type[tag] = []
-        by_type[tag].append(elem)
-    
-    # 生成描述
-    for tag, items in by_type.items():
-        element_desc += f"【{tag.upper()}】 {len(items)} 个\n"
-        for item in items:  
-            text = item['text'][:30] if item['text'] else ''
-            attrs_str = ''
-            if 'id' in item['attrs']:
-                attrs_str += f" id={item['attrs']['id']}"
-            if 'name' in item['attrs']:
-                attrs_str += f" name={item['attrs']['name']}"
-            
-            element_desc += f"  [{item['index']}] {text}{attrs_str}\n"
-        
-        
+    # 增量模式：只描述相对上一次提取的变化，未变化元素的索引保持不变
+    delta = getattr(extractor, 'last_delta', None)
+    if delta and delta.get('mode') == 'delta':
+        return _describe_element_delta(elements, delta)
+    
+    # 按相关度排序，在 token 预算内生成紧凑表格
+    if not query and time_tracker_ref is not None:
+        query = getattr(time_tracker_ref, 'current_instruction', None) or ""
+    element_desc, _ = extractor.describe_elements(query=query or None)
+    
+    return f"✅ 找到 {len(elements)} 个可交互元素：\n{element_desc}"
+
+
+@tool
+def more_page_elements(cursor: int, operator=None, extractor=None, time_tracker_ref=None) -> str:
+    """
+    查看上一次 extract_page_elements 未显示的其余元素（不重新提取页面）
+    
+    Args:
+        cursor: 上一次结果末尾提示的游标值
+    
+    Returns:
+        下一页元素列表描述
+    """
+    logger.info(f"📄 查看更多页面元素 (cursor={cursor})...")
+    
+    if not extractor.get_elements():
+        return "❌ 请先调用 extract_page_elements 提取页面元素"
+    
+    element_desc, _ = extractor.describe_more(cursor)
+    return element_desc
+
+
+def _describe_element_delta(elements, delta):
+    """生成增量提取结果的描述（只包含新增、变化和移除的元素）"""
+    added = delta.get('added', [])
+    changed = delta.get('changed', [])
+    removed = delta.get('removed', [])
+    
+    if not (added or changed or removed):
+        return f"✅ 页面元素无变化，共 {len(elements)} 个可交互元素，之前的索引仍然有效"
+    
+    def _line(item):
+        text = item['text'][:30] if item['text'] else ''
+        attrs_str = ''
+        if 'id' in item['attrs']:
+            attrs_str += f" id={item['attrs']['id']}"
+        if 'name' in item['attrs']:
+            attrs_str += f" name={item['attrs']['name']}"
+        return f"  [{item['index']}] <{item['tag']}> {text}{attrs_str}\n"
+    
+    element_desc = f"✅ 页面元素已更新（共 {len(elements)} 个，其余索引不变）：\n\n"
+    if added:
+        element_desc += f"【新增】 {len(added)} 个\n" + ''.join(_line(item) for item in added)
+    if changed:
+        element_desc += f"【变化】 {len(changed)} 个\n" + ''.join(_line(item) for item in changed)
+    if removed:
+        element_desc += f"【移除】 {len(removed)} 个: {', '.join(str(index) for index in removed)}\n"
     
     return element_desc
 
@@ -214,28 +269,24 @@ def click_element(index: int, operator=None, extractor=None, time_tracker_ref=No
     
     _start_timing(time_tracker_ref, "tool_call")
     
-    elements = extractor.get_elements()
-    if not elements:
+    if not extractor.get_elements():
         _end_timing(time_tracker_ref, "tool_call")
         return "❌ 请先调用 extract_page_elements 提取页面元素"
     
-    # 查找对应索引的元素
-    target = None
-    for elem in elements:
-        if elem['index'] == index:
-            target = elem
-            break
+    # 按索引 O(1) 查找对应元素
+    target = extractor.get_element(index)
     
     if not target:
         _end_timing(time_tracker_ref, "tool_call")
         return f"❌ 未找到索引为 {index} 的元素"
     
     # 点击元素
-    success = operator.click_element(target['selector'], wait_before=0.25, wait_after=0.25)
+    # 通过惰性句柄（data-extractor-index 标记）定位，避免定位字符串歧义
+    success = operator.click_element(target['element'])
     _end_timing(time_tracker_ref, "tool_call")
     
     if success:
-        return f"✅ 成功点击元素 [{index}]: {target['text'][:30]}"
+        return f"✅ 成功点击元素 [{index}]: {target['text'][:30]}{_readiness_note(operator)}"
     else:
         return f"❌ 点击元素失败 [{index}]"
 
@@ -256,24 +307,19 @@ def input_text_to_element(index: int, text: str, operator=None, extractor=None,
     
     _start_timing(time_tracker_ref, "tool_call")
     
-    elements = extractor.get_elements()
-    if not elements:
+    if not extractor.get_elements():
         _end_timing(time_tracker_ref, "tool_call")
         return "❌ 请先调用 extract_page_elements 提取页面元素"
     
-    # 查找对应索引的元素
-    target = None
-    for elem in elements:
-        if elem['index'] == index:
-            target = elem
-            break
+    # 按索引 O(1) 查找对应元素
+    target = extractor.get_element(index)
     
     if not target:
         _end_timing(time_tracker_ref, "tool_call")
         return f"❌ 未找到索引为 {index} 的元素"
     
     # 输入文本
-    success = operator.input_text(target['selector'], text, clear=True)
+    success = operator.input_text(target['element'], text, clear=True)
     _end_timing(time_tracker_ref, "tool_call")
     
     if success:
@@ -282,6 +328,57 @@ def input_text_to_element(index: int, text: str, operator=None, extractor=None,
         return f"❌ 输入文本失败 [{index}]"
 
 
+@tool
+def fill_form(fields: List[Dict[str, Any]], submit_index: Optional[int] = None, operator=None, extractor=None, time_tracker_ref=None) -> str:
+    """
+    一次调用填写表单中的多个字段（输入框、文本域、下拉框），可选在最后点击提交按钮，
+    适合登录、注册、搜索等需要连续填写多个字段的场景
+    
+    Args:
+        fields: 要填写的字段列表，每项为 {"index": 元素索引, "value": 要填写的值}，
+            下拉框的 value 可以是选项的值或显示文本
+        submit_index: 可选，填写完成后要点击的按钮索引（例如登录 / 搜索按钮）
+    
+    Returns:
+        每个字段的填写结果
+    """
+    logger.info(f"📝 批量填写表单: {len(fields)} 个字段")
+    
+    _start_timing(time_tracker_ref, "tool_call")
+    
+    if not extractor.get_elements():
+        _end_timing(time_tracker_ref, "tool_call")
+        return "❌ 请先调用 extract_page_elements 提取页面元素"
+    
+    actions = []
+    for field in fields:
+        index = field.get('index')
+        target = extractor.get_element(index)
+        action = 'select' if target is not None and target['tag'] == 'select' else 'fill'
+        actions.append({'action': action, 'index': index, 'value': str(field.get('value', '')), 'text': str(field.get('value', ''))})
+    if submit_index is not None:
+        actions.append({'action': 'click', 'index': submit_index})
+    
+    # 填写在页面内一次完成，提交按钮使用真实点击并等待页面就绪
+    results = operator.run_batch(actions, extractor=extractor)
+    _end_timing(time_tracker_ref, "tool_call")
+    
+    lines = []
+    for action, result in zip(actions, results):
+        verb = {'fill': '填写', 'select': '选择', 'click': '点击'}[action['action']]
+        if result['ok']:
+            lines.append(f"  [{action['index']}] ✅ 已{verb}")
+        elif result.get('skipped'):
+            lines.append(f"  [{action['index']}] ⏭️ 未执行（前面的操作失败）")
+        else:
+            lines.append(f"  [{action['index']}] ❌ {verb}失败: {result.get('error', '')}")
+    
+    succeeded = sum(1 for result in results if result['ok'])
+    status = "✅" if succeeded == len(results) else "❌"
+    note = _readiness_note(operator) if submit_index is not None and results[-1]['ok'] else ""
+    return f"{status} 表单操作完成 {succeeded}/{len(results)}{note}：\n" + "\n".join(lines)
+
+
 @tool
 def get_current_url(operator=None, extractor=None, time_tracker_ref=None) -> str:
     """
@@ -305,11 +402,11 @@ def go_back(operator=None, extractor=None, time_tracker_ref=None) -> str:
     logger.info("⬅️  返回上一页...")
     
     _start_timing(time_tracker_ref, "tool_call")
-    success = operator.go_back(wait_time=2)
+    success = operator.go_back()
     _end_timing(time_tracker_ref, "tool_call")
     
     if success:
-        return "✅ 已返回上一页"
+        return f"✅ 已返回上一页{_readiness_note(operator)}"
     else:
         return "❌ 返回失败"
 
@@ -325,11 +422,11 @@ def refresh_page(operator=None, extractor=None, time_tracker_ref=None) -> str:
     logger.info("🔄 刷新页面...")
     
     _start_timing(time_tracker_ref, "tool_call")
-    success = operator.refresh_page(wait_time=3)
+    success = operator.refresh_page()
     _end_timing(time_tracker_ref, "tool_call")
     
     if success:
-        return "✅ 页面已刷新"
+        return f"✅ 页面已刷新{_readiness_note(operator)}"
     else:
         return "❌ 页面刷新失败"
 
@@ -366,8 +463,10 @@ def take_screenshot(operator=None, extractor=None, time_tracker_ref=None) -> str
 BASIC_WEB_TOOLS = [
     open_website,
     extract_page_elements,
+    more_page_elements,
     click_element,
     input_text_to_element,
+    fill_form,
     get_current_url,
 ]
 
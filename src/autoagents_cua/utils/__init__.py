@@ -1,10 +1,15 @@
-from .image_converter import encode_image
+from .image_converter import encode_image, encode_image_bytes
 from .logging import logger, get_logger, set_stage, Logger
+from .helpers import user_data_dir, domain_of, percentile
 
 __all__ = [
     'encode_image', 
+    'encode_image_bytes',
     'logger', 
     'get_logger', 
     'set_stage', 
     'Logger',
+    'user_data_dir',
+    'domain_of',
+    'percentile',
 ]
\ No newline at end of file
@@ -0,0 +1,22 @@
+import os
+from urllib.parse import urlparse
+
+# 用户级数据目录（登录状态、学习数据等不应写入仓库目录），可用环境变量 AUTOAGENTS_CUA_HOME 覆盖
+def user_data_dir(*parts):
+    root = os.environ.get('AUTOAGENTS_CUA_HOME') or os.path.join(os.path.expanduser('~'), '.autoagents_cua')
+    return os.path.join(root, *parts)
+
+# 提取 URL 的域名（去掉 www. 前缀和端口），无法解析时返回 '*'
+def domain_of(url):
+    if not url:
+        return '*'
+    netloc = urlparse(url).netloc if '://' in url else url.split('/')[0]
+    netloc = netloc.lower().split('@')[-1].split(':')[0]
+    if netloc.startswith('www.'):
+        netloc = netloc[4:]
+    return netloc or '*'
+
+# 最近秩法百分位（values 需已排序且非空）
+def percentile(values, percent):
+    rank = max(1, -(-len(values) * percent // 100))
+    return values[int(rank) - 1]
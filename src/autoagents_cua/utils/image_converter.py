@@ -3,4 +3,8 @@ import base64
 # 读取并编码图片
 def encode_image(image_path):
     with open(image_path, 'rb') as img_file:
-        return base64.b64encode(img_file.read()).decode('utf-8')
\ No newline at end of file
+        return encode_image_bytes(img_file.read())
+
+# 编码内存中的图片字节（截图不落盘时使用）
+def encode_image_bytes(data):
+    return base64.b64encode(data).decode('utf-8')
\ No newline at end of file